@@ -0,0 +1,137 @@
+"""
+Arrow tables, Parquet files and Arrow IPC streams of search results
+"""
+
+import json
+import logging
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple, Union
+from models import Property
+from utils import PROPERTY_DTYPES, ordered_properties, property_row
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only the arrow return type and parquet output need it
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+ARROW_STREAM_MIMETYPE = "application/vnd.apache.arrow.stream"
+
+
+def _columns(*dtypes: str) -> frozenset:
+    return frozenset(column for column, dtype in PROPERTY_DTYPES.items() if dtype in dtypes)
+
+
+# Column types follow utils.PROPERTY_DTYPES, with every integer and float widened to 64 bits
+INT_COLUMNS = _columns("Int32", "Int64")
+FLOAT_COLUMNS = _columns("Float32", "Float64")
+BOOL_COLUMNS = _columns("boolean")
+DATE_COLUMNS = _columns("datetime64[s]")
+#: Nested values (tax history, phone lists) are written as JSON text
+JSON_COLUMNS = _columns("object")
+#: Low-cardinality strings, dictionary-encoded
+DICTIONARY_COLUMNS = _columns("category")
+
+_EMPTY_TEXT = ("", "None")
+
+
+def require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for arrow and parquet output: pip install pyarrow")
+
+
+def _arrow_type(column: str):
+    if column in INT_COLUMNS:
+        return pa.int64()
+    if column in FLOAT_COLUMNS:
+        return pa.float64()
+    if column in BOOL_COLUMNS:
+        return pa.bool_()
+    if column in DATE_COLUMNS:
+        return pa.date32()
+    if column in DICTIONARY_COLUMNS:
+        return pa.dictionary(pa.int32(), pa.string())
+    return pa.string()
+
+
+@lru_cache(maxsize=None)
+def _schema(columns: Tuple[str, ...]):
+    return pa.schema([pa.field(column, _arrow_type(column)) for column in columns])
+
+
+def property_schema(columns: Sequence[str] = ordered_properties):
+    """The fixed Arrow schema of the given output columns, whatever the results hold"""
+    require_pyarrow()
+    return _schema(tuple(columns))
+
+
+def _to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def _fits(column: str, value) -> bool:
+    if column in BOOL_COLUMNS:
+        return isinstance(value, bool)
+    if isinstance(value, bool):
+        return False
+    if column in INT_COLUMNS:
+        return isinstance(value, int)
+    return isinstance(value, (int, float))
+
+
+def _column_values(column: str, values: List[object]) -> List[object]:
+    """Values of one column as the Python types its Arrow type takes; ones that do not fit become null"""
+    values = [None if value is None or (type(value) is str and value in _EMPTY_TEXT) else value
+              for value in values]
+    if column in DATE_COLUMNS:
+        return [None if value is None else _to_date(value) for value in values]
+    if column in JSON_COLUMNS:
+        return [None if value is None else json.dumps(value, default=str) for value in values]
+    if column in INT_COLUMNS or column in FLOAT_COLUMNS or column in BOOL_COLUMNS:
+        fitting = [value if value is None or _fits(column, value) else None for value in values]
+        dropped = sum(1 for value, kept in zip(values, fitting) if value is not None and kept is None)
+        if dropped:
+            logger.warning(f"Dropped {dropped} {column} values that are not {_arrow_type(column)}")
+        return fitting
+    return [value if value is None or type(value) is str else str(value) for value in values]
+
+
+def property_table(results: List[Union[Property, Dict[str, object]]],
+                   columns: Sequence[str] = ordered_properties) -> "pa.Table":
+    """Arrow table of Properties (or their property_row rows) with the fixed property_schema"""
+    schema = property_schema(columns)
+    rows = [result if isinstance(result, dict) else property_row(result) for result in results]
+    arrays = []
+    for field in schema:
+        values = _column_values(field.name, [row.get(field.name) for row in rows])
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def write_parquet(table: "pa.Table", path, compression: str = "zstd"):
+    require_pyarrow()
+    pq.write_table(table, path, compression=compression)
+
+
+def arrow_stream(table: "pa.Table", compression: str = "zstd") -> bytes:
+    """``table`` as an Arrow IPC stream (application/vnd.apache.arrow.stream)"""
+    require_pyarrow()
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
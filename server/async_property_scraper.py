@@ -0,0 +1,596 @@
+"""
+Asyncio property scraper sharing one aiohttp connection pool per instance
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional, Any, Union, Tuple, AsyncIterator, Callable, Awaitable
+import aiohttp
+from models import Property, ListingType
+from dreamery_property_scraper import DreameryPropertyScraper
+from sessions import DEFAULT_HEADERS
+from location_cache import LocationCache, get_location_cache
+from response_cache import ResponseCache, get_response_cache
+from model_builder import ModelBuilder, get_model_builder
+from parse_pool import ParsePool, get_parse_pool
+from parsers import normalize_dates
+from rate_limiter import rate_limiters, THROTTLE_STATUS_CODES
+from transport import standin_url
+from exceptions import RateLimitError
+from search_shards import MAX_RESULT_WINDOW, SearchShard
+from queries import SEARCH_HOMES_DATA, build_search_selection, needs_property_details
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDreameryPropertyScraper(DreameryPropertyScraper):
+    """Async twin of DreameryPropertyScraper built on aiohttp.
+
+    Query building, parsing and processing are inherited unchanged; only the
+    network-facing methods are coroutines. Location, page and detail requests
+    all go through one ClientSession, so hundreds of in-flight requests share a
+    bounded connection pool on the event loop thread.
+
+    Usage::
+
+        async with AsyncDreameryPropertyScraper() as scraper:
+            properties = await scraper.search_properties("Dallas, TX")
+    """
+
+    MAX_CONNECTIONS = 100
+    MAX_THROTTLE_RETRIES = 3
+
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None,
+                 max_connections: int = MAX_CONNECTIONS,
+                 location_cache: Optional[LocationCache] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 model_builder: Optional[ModelBuilder] = None,
+                 parse_pool: Optional[ParsePool] = None):
+        self.session = session
+        self._owns_session = session is None
+        self.max_connections = max_connections
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self.base_url = "https://www.realtor.com"
+        self.api_base = "https://www.realtor.com/api/v1"
+        self.access_token = None
+        self.location_cache = location_cache or get_location_cache()
+        self.response_cache = response_cache or get_response_cache()
+        self.model_builder = model_builder or get_model_builder()
+        self.parse_pool = parse_pool or get_parse_pool()
+
+    async def __aenter__(self) -> 'AsyncDreameryPropertyScraper':
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Create the shared ClientSession lazily on the running loop"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers=DEFAULT_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=60),
+            )
+            self._owns_session = True
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_connections)
+        return self.session
+
+    async def close(self) -> None:
+        """Close the underlying session if this scraper created it"""
+        if self.session is not None and self._owns_session and not self.session.closed:
+            await self.session.close()
+
+    async def _get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        return await self._request_json("GET", url, params=params)
+
+    async def _post_json(self, url: str, payload: Dict[str, Any]) -> Any:
+        return await self._request_json("POST", url, json=payload)
+
+    async def _request_json(self, method: str, url: str, **kwargs) -> Any:
+        """Send a request under the shared per-host rate limiter, retrying throttled responses.
+
+        Raises RateLimitError, built while the last response is still open,
+        once every retry has been throttled.
+        """
+        session = await self._get_session()
+        limiter = rate_limiters.for_url(url)
+        url = standin_url(url)
+        async with self._semaphore:
+            for attempt in range(self.MAX_THROTTLE_RETRIES + 1):
+                await limiter.acquire_async()
+                async with session.request(method, url, **kwargs) as response:
+                    if response.status not in THROTTLE_STATUS_CODES:
+                        limiter.on_success()
+                        return await response.json(content_type=None)
+                    limiter.on_throttle()
+                    if attempt == self.MAX_THROTTLE_RETRIES:
+                        body = await response.text()
+                        raise RateLimitError(
+                            f"{method} {url} still throttled ({response.status}) after {attempt + 1} attempts: "
+                            f"{body[:200]}",
+                            retry_after=response.headers.get("Retry-After"),
+                        )
+
+    async def search_properties(self, location: str = "San Francisco, CA",
+                                listing_type: str = "for_sale",
+                                property_types: Optional[List[str]] = None,
+                                min_price: Optional[int] = None,
+                                max_price: Optional[int] = None,
+                                beds: Optional[int] = None,
+                                baths: Optional[int] = None,
+                                sqft_min: Optional[int] = None,
+                                sqft_max: Optional[int] = None,
+                                radius: Optional[float] = None,
+                                past_days: Optional[int] = None,
+                                limit: int = 50,
+                                date_from: Optional[str] = None,
+                                date_to: Optional[str] = None) -> List[Property]:
+        """Search for properties using Realtor.com API"""
+        try:
+            return await self._search(
+                location, listing_type, property_types, min_price, max_price, beds, baths,
+                sqft_min, sqft_max, radius, past_days, limit, date_from, date_to
+            )
+        except Exception as e:
+            logger.error(f"Property search failed: {e}")
+            return []
+
+    async def search_properties_advanced(self, location: str = "San Francisco, CA",
+                                         listing_type: str = "for_sale",
+                                         property_types: Optional[List[str]] = None,
+                                         min_price: Optional[int] = None,
+                                         max_price: Optional[int] = None,
+                                         beds: Optional[int] = None,
+                                         baths: Optional[int] = None,
+                                         sqft_min: Optional[int] = None,
+                                         sqft_max: Optional[int] = None,
+                                         radius: Optional[float] = None,
+                                         past_days: Optional[int] = None,
+                                         limit: int = 50,
+                                         mls_only: bool = False,
+                                         extra_property_data: bool = False,
+                                         exclude_pending: bool = False,
+                                         detail_batch_size: Optional[int] = None,
+                                         date_from: Optional[str] = None,
+                                         date_to: Optional[str] = None,
+                                         fields: Union[str, List[str], None] = None) -> List[Property]:
+        """Advanced property search using the processors for comprehensive data extraction"""
+        try:
+            return await self._search_processed(
+                location, listing_type, property_types, min_price, max_price, beds, baths,
+                sqft_min, sqft_max, radius, past_days, limit,
+                mls_only, extra_property_data, exclude_pending, detail_batch_size, date_from, date_to, fields
+            )
+        except Exception as e:
+            logger.error(f"Advanced property search failed: {e}")
+            return []
+
+    async def search_properties_comprehensive(self, location: str = "San Francisco, CA",
+                                              listing_type: str = "for_sale",
+                                              property_types: Optional[List[str]] = None,
+                                              min_price: Optional[int] = None,
+                                              max_price: Optional[int] = None,
+                                              beds: Optional[int] = None,
+                                              baths: Optional[int] = None,
+                                              sqft_min: Optional[int] = None,
+                                              sqft_max: Optional[int] = None,
+                                              radius: Optional[float] = None,
+                                              past_days: Optional[int] = None,
+                                              limit: int = 50,
+                                              mls_only: bool = False,
+                                              extra_property_data: bool = True,
+                                              exclude_pending: bool = False,
+                                              detail_batch_size: Optional[int] = None,
+                                              date_from: Optional[str] = None,
+                                              date_to: Optional[str] = None,
+                                              fields: Union[str, List[str], None] = None) -> List[Property]:
+        """Comprehensive property search using enhanced GraphQL queries"""
+        try:
+            return await self._search_processed(
+                location, listing_type, property_types, min_price, max_price, beds, baths,
+                sqft_min, sqft_max, radius, past_days, limit,
+                mls_only, extra_property_data, exclude_pending, detail_batch_size, date_from, date_to, fields
+            )
+        except Exception as e:
+            logger.error(f"Comprehensive property search failed: {e}")
+            return []
+
+    async def iter_properties(self, location: str = "San Francisco, CA",
+                              listing_type: str = "for_sale",
+                              property_types: Optional[List[str]] = None,
+                              min_price: Optional[int] = None,
+                              max_price: Optional[int] = None,
+                              beds: Optional[int] = None,
+                              baths: Optional[int] = None,
+                              sqft_min: Optional[int] = None,
+                              sqft_max: Optional[int] = None,
+                              radius: Optional[float] = None,
+                              past_days: Optional[int] = None,
+                              limit: int = 50,
+                              mls_only: bool = False,
+                              extra_property_data: bool = False,
+                              exclude_pending: bool = False,
+                              detail_batch_size: Optional[int] = None,
+                              date_from: Optional[str] = None,
+                              date_to: Optional[str] = None,
+                              fields: Union[str, List[str], None] = None) -> AsyncIterator[Property]:
+        """Yield processed properties page by page, fetching the next page while the caller handles the current one"""
+        location_info = await self._handle_location(location)
+        if not location_info:
+            logger.error(f"Could not find location: {location}")
+            return
+
+        search_variables = self._build_search_variables(
+            location_info, listing_type, property_types, min_price, max_price, beds, baths,
+            sqft_min, sqft_max, radius, past_days, limit
+        )
+        search_type = self._determine_search_type(location_info, radius)
+
+        if search_type == "single_property":
+            homes = await self._fetch_raw_properties(location_info, search_variables, search_type, limit)
+            for prop in await self._process_properties(homes, listing_type, mls_only, extra_property_data,
+                                                       exclude_pending):
+                yield prop
+            return
+
+        shard = SearchShard.for_search(listing_type, past_days, date_from, date_to)
+        with_details = extra_property_data and needs_property_details(fields)
+
+        async def process(homes: List[Dict[str, Any]]) -> List[Property]:
+            if with_details:
+                await self._attach_extra_property_details(homes, detail_batch_size)
+            return await self._process_properties(homes, listing_type, mls_only, extra_property_data, exclude_pending)
+
+        async for page in self._iter_search_pages(search_variables, search_type, limit, listing_type, shard,
+                                                  build_search_selection(fields), process):
+            for prop in page:
+                yield prop
+
+    async def _search(self, location: str, listing_type: str, property_types: Optional[List[str]],
+                      min_price: Optional[int], max_price: Optional[int], beds: Optional[int],
+                      baths: Optional[int], sqft_min: Optional[int], sqft_max: Optional[int],
+                      radius: Optional[float], past_days: Optional[int], limit: int,
+                      date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Property]:
+        """Resolve the location and run the matching search"""
+        location_info = await self._handle_location(location)
+        if not location_info:
+            logger.error(f"Could not find location: {location}")
+            return []
+
+        search_variables = self._build_search_variables(
+            location_info, listing_type, property_types, min_price, max_price, beds, baths,
+            sqft_min, sqft_max, radius, past_days, limit
+        )
+        search_type = self._determine_search_type(location_info, radius)
+        shard = SearchShard.for_search(listing_type, past_days, date_from, date_to)
+
+        if search_type == "single_property":
+            return await self._handle_single_property(location_info)
+        return await self._perform_general_search(search_variables, search_type, limit, listing_type, shard)
+
+    async def _search_processed(self, location: str, listing_type: str, property_types: Optional[List[str]],
+                                min_price: Optional[int], max_price: Optional[int], beds: Optional[int],
+                                baths: Optional[int], sqft_min: Optional[int], sqft_max: Optional[int],
+                                radius: Optional[float], past_days: Optional[int], limit: int,
+                                mls_only: bool, extra_property_data: bool, exclude_pending: bool,
+                                detail_batch_size: Optional[int], date_from: Optional[str] = None,
+                                date_to: Optional[str] = None,
+                                fields: Union[str, List[str], None] = None) -> List[Property]:
+        """Resolve the location, fetch raw homes and run them through the processors"""
+        location_info = await self._handle_location(location)
+        if not location_info:
+            logger.error(f"Could not find location: {location}")
+            return []
+
+        search_variables = self._build_search_variables(
+            location_info, listing_type, property_types, min_price, max_price, beds, baths,
+            sqft_min, sqft_max, radius, past_days, limit
+        )
+        search_type = self._determine_search_type(location_info, radius)
+        shard = SearchShard.for_search(listing_type, past_days, date_from, date_to)
+
+        homes = await self._fetch_raw_properties(location_info, search_variables, search_type, limit,
+                                                 listing_type, shard, build_search_selection(fields))
+        if extra_property_data and search_type != "single_property" and needs_property_details(fields):
+            await self._attach_extra_property_details(homes, detail_batch_size)
+
+        return await self._process_properties(homes, listing_type, mls_only, extra_property_data, exclude_pending)
+
+    async def _process_properties(self, homes: List[Dict[str, Any]], listing_type: str, mls_only: bool,
+                            extra_property_data: bool, exclude_pending: bool) -> List[Property]:
+        listing_type_enum = ListingType.__members__.get(listing_type.upper(), ListingType.FOR_SALE)
+        process = self._property_parser(mls_only, extra_property_data, exclude_pending, listing_type_enum)
+        if self.parse_pool is not None:
+            # ParsePool.map blocks until the workers are done; wait on it from a thread so other searches run
+            return await asyncio.get_running_loop().run_in_executor(None, self.parse_pool.map, process, homes)
+        return [prop for prop in map(process, normalize_dates(homes)) if prop]
+
+    async def _handle_location(self, location: str) -> Optional[Dict[str, Any]]:
+        """Handle location lookup using Realtor.com API, served from the location cache when possible"""
+        cached = self.location_cache.get(location)
+        if cached is not None:
+            return cached
+
+        try:
+            response_json = await self._get_json(
+                self.ADDRESS_AUTOCOMPLETE_URL, params=self._build_location_params(location)
+            )
+            result = response_json["autocomplete"]
+            if not result:
+                return None
+            self.location_cache.set(location, result[0])
+            return result[0]
+        except Exception as e:
+            logger.error(f"Location lookup failed: {e}")
+            return None
+
+    async def _handle_single_property(self, location_info: Dict[str, Any]) -> List[Property]:
+        """Handle single property search"""
+        return await self._get_property_details(location_info["mpr_id"])
+
+    async def _get_property_details(self, property_id: str) -> List[Property]:
+        """Get details for a single property using enhanced query template"""
+        try:
+            response_json = await self._post_json(
+                self.SEARCH_GQL_URL, self._build_property_details_payload(property_id)
+            )
+            if "data" in response_json and response_json["data"]["home"]:
+                prop = self._process_property_with_processors(response_json["data"]["home"])
+                return [prop] if prop else []
+            return []
+        except Exception as e:
+            logger.error(f"Failed to get property details: {e}")
+            return []
+
+    async def _fetch_raw_properties(self, location_info: Dict[str, Any], search_variables: Dict[str, Any],
+                                    search_type: str, limit: int,
+                                    listing_type: Union[str, ListingType, None] = None,
+                                    shard: Optional[SearchShard] = None,
+                                    fields: str = SEARCH_HOMES_DATA) -> List[Dict[str, Any]]:
+        """Fetch unformatted homes for a search, as returned by GraphQL"""
+        if search_type == "single_property":
+            payload = self._build_property_details_payload(location_info["mpr_id"])
+            response_json = await self._post_json(self.SEARCH_GQL_URL, payload)
+            home = (response_json.get("data") or {}).get("home")
+            return [home] if home else []
+        return await self._fetch_search_results(search_variables, search_type, limit, listing_type, shard, fields)
+
+    async def _attach_extra_property_details(self, homes: List[Dict[str, Any]],
+                                             batch_size: Optional[int] = None) -> None:
+        """Merge batched detail-level fields into raw homes, running all batches concurrently"""
+        batch_size = batch_size or self.DETAIL_BATCH_SIZE
+        property_ids = [home["property_id"] for home in homes if home.get("property_id")]
+        batches = [property_ids[i:i + batch_size] for i in range(0, len(property_ids), batch_size)]
+
+        results = await asyncio.gather(
+            *(self._fetch_property_details_batch(batch) for batch in batches),
+            return_exceptions=True,
+        )
+
+        details = {}
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Property detail batch failed: {result}")
+                continue
+            details.update(result)
+
+        for home in homes:
+            detail = details.get(home.get("property_id"))
+            if detail:
+                self._merge_property_details(home, detail)
+
+    async def _fetch_property_details_batch(self, property_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch detail fields for one batch of properties in a single aliased query"""
+        payload = self._build_property_details_batch_payload(property_ids)
+        response_json = await self._post_json(self.SEARCH_GQL_URL, payload)
+        return self._extract_property_details_batch(response_json, property_ids)
+
+    async def _perform_general_search(self, search_variables: Dict[str, Any],
+                                      search_type: str, limit: int,
+                                      listing_type: Union[str, ListingType, None] = None,
+                                      shard: Optional[SearchShard] = None) -> List[Property]:
+        """Perform general property search"""
+        try:
+            properties_list = await self._fetch_search_results(search_variables, search_type, limit,
+                                                               listing_type, shard)
+            return [prop for prop in map(self._process_property_with_processors, properties_list) if prop]
+        except Exception as e:
+            logger.error(f"General search failed: {e}")
+            return []
+
+    async def _fetch_search_results(self, search_variables: Dict[str, Any],
+                                    search_type: str, limit: int,
+                                    listing_type: Union[str, ListingType, None] = None,
+                                    shard: Optional[SearchShard] = None,
+                                    fields: str = SEARCH_HOMES_DATA) -> List[Dict[str, Any]]:
+        """Fetch raw search results, gathering the remaining offsets concurrently"""
+        shard = shard or SearchShard.for_listing_type(listing_type)
+        query = self._build_search_query(search_type, shard, listing_type, fields)
+        search_key = "home_search" if "home_search" in query else "property_search"
+
+        first_page, total = await self._fetch_search_page(query, search_variables, search_key, 0, listing_type)
+        if not first_page:
+            return []
+
+        if search_type == "area" and total > MAX_RESULT_WINDOW and limit > MAX_RESULT_WINDOW:
+            return await self._fetch_sharded_results(search_variables, search_type, limit, listing_type, shard,
+                                                     fields)
+
+        return await self._fetch_remaining_pages(query, search_variables, search_key, first_page, total, limit,
+                                                 listing_type)
+
+    async def _iter_search_pages(self, search_variables: Dict[str, Any], search_type: str, limit: int,
+                                 listing_type: Union[str, ListingType, None], shard: SearchShard, fields: str,
+                                 process: Callable[[List[Dict[str, Any]]], Awaitable[List[Any]]]
+                                 ) -> AsyncIterator[List[Any]]:
+        """Yield processed search pages in order, fetching one page ahead of the caller"""
+        query = self._build_search_query(search_type, shard, listing_type, fields)
+        search_key = "home_search" if "home_search" in query else "property_search"
+
+        first_page, total = await self._fetch_search_page(query, search_variables, search_key, 0, listing_type)
+        if search_type == "area" and total > MAX_RESULT_WINDOW and limit > MAX_RESULT_WINDOW:
+            leaves = await self._plan_shards(search_variables, search_type, shard, listing_type, fields)
+            logger.info(f"Split search into {len(leaves)} shards")
+            pages = [
+                (self._build_search_query(search_type, leaf, listing_type, fields), "home_search", offset, None)
+                for leaf, _, leaf_total in leaves
+                for offset in range(0, min(leaf_total, MAX_RESULT_WINDOW), self.DEFAULT_PAGE_SIZE)
+            ]
+            results = []
+        else:
+            end = min(total, limit, MAX_RESULT_WINDOW)
+            pages = [
+                (query, search_key, offset, limit - offset)
+                for offset in range(self.DEFAULT_PAGE_SIZE, end, self.DEFAULT_PAGE_SIZE)
+            ]
+            results = await process(first_page[:limit])
+        del first_page
+
+        async def fetch(page):
+            page_query, page_key, offset, max_results = page
+            try:
+                homes, _ = await self._fetch_search_page(page_query, search_variables, page_key, offset, listing_type)
+                return await process(homes[:max_results])
+            except Exception as e:
+                logger.error(f"Search page at offset {offset} failed: {e}")
+                return []
+
+        seen = set()
+        remaining = limit
+        upcoming = iter(pages)
+        pending = asyncio.ensure_future(fetch(next(upcoming))) if pages else None
+        try:
+            while True:
+                fresh = self._unseen(results, seen)
+                if fresh:
+                    yield fresh[:remaining]
+                    remaining -= len(fresh)
+                if remaining <= 0 or pending is None:
+                    return
+                results = await pending
+                page = next(upcoming, None)
+                pending = asyncio.ensure_future(fetch(page)) if page else None
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def _fetch_remaining_pages(self, query: str, search_variables: Dict[str, Any], search_key: str,
+                                     first_page: List[Dict[str, Any]], total: int, limit: int,
+                                     listing_type: Union[str, ListingType, None] = None) -> List[Dict[str, Any]]:
+        """Gather every page after the first and return the results in offset order"""
+        total = min(total or 0, limit, MAX_RESULT_WINDOW)
+        offsets = list(range(self.DEFAULT_PAGE_SIZE, total, self.DEFAULT_PAGE_SIZE))
+        pages = await asyncio.gather(
+            *(self._fetch_search_page(query, search_variables, search_key, offset, listing_type)
+              for offset in offsets),
+            return_exceptions=True,
+        )
+
+        properties_list = list(first_page)
+        for offset, page in zip(offsets, pages):
+            if isinstance(page, Exception):
+                logger.error(f"Search page at offset {offset} failed: {page}")
+                continue
+            properties_list.extend(page[0])
+
+        return properties_list[:limit]
+
+    async def _fetch_sharded_results(self, search_variables: Dict[str, Any], search_type: str, limit: int,
+                                     listing_type: Union[str, ListingType, None], shard: SearchShard,
+                                     fields: str = SEARCH_HOMES_DATA) -> List[Dict[str, Any]]:
+        """Split an oversized search into shards that each fit a result window and gather them"""
+        shards = await self._plan_shards(search_variables, search_type, shard, listing_type, fields)
+        logger.info(f"Split search into {len(shards)} shards")
+
+        shard_results = await asyncio.gather(*(
+            self._fetch_remaining_pages(self._build_search_query(search_type, shard, listing_type, fields),
+                                        search_variables,
+                                        "home_search", first_page, total, MAX_RESULT_WINDOW, listing_type)
+            for shard, first_page, total in shards
+        ))
+        return self._dedupe_homes(shard_results, limit)
+
+    async def _plan_shards(self, search_variables: Dict[str, Any], search_type: str, shard: SearchShard,
+                           listing_type: Union[str, ListingType, None] = None, fields: str = SEARCH_HOMES_DATA,
+                           probe: Optional[Tuple[List[Dict[str, Any]], int]] = None
+                           ) -> List[Tuple[SearchShard, List[Dict[str, Any]], int]]:
+        """Recursively bisect a shard until each piece fits a result window"""
+        if probe is None:
+            query = self._build_search_query(search_type, shard, listing_type, fields)
+            probe = await self._fetch_search_page(query, search_variables, "home_search", 0, listing_type)
+        first_page, total = probe
+        if not first_page:
+            return []
+        if total <= MAX_RESULT_WINDOW:
+            return [(shard, first_page, total)]
+
+        children = shard.split()
+        if not children:
+            logger.warning(f"Shard {shard} still matches {total} homes; results past {MAX_RESULT_WINDOW} are dropped")
+            return [(shard, first_page, total)]
+
+        probes = await self._probe_shards(search_variables, search_type, children, listing_type, fields)
+        covered = sum(child_total for _, child_total in probes)
+        if covered < total and shard.is_unpriced and shard.split_dates():
+            logger.info(f"{total - covered} homes in {shard} have no {shard.price_field}; splitting by date instead")
+            children = shard.split_dates()
+            probes = await self._probe_shards(search_variables, search_type, children, listing_type, fields)
+            covered = sum(child_total for _, child_total in probes)
+        if covered < total:
+            logger.warning(f"Shards of {shard} cover {covered} of its {total} homes")
+
+        planned = await asyncio.gather(*(
+            self._plan_shards(search_variables, search_type, child, listing_type, fields, child_probe)
+            for child, child_probe in zip(children, probes)
+        ))
+        return [leaf for leaves in planned for leaf in leaves]
+
+    async def _probe_shards(self, search_variables: Dict[str, Any], search_type: str, shards: List[SearchShard],
+                            listing_type: Union[str, ListingType, None], fields: str
+                            ) -> List[Tuple[List[Dict[str, Any]], int]]:
+        """(first page, total) of each shard"""
+        return await asyncio.gather(*(
+            self._fetch_search_page(self._build_search_query(search_type, shard, listing_type, fields),
+                                    search_variables, "home_search", 0, listing_type)
+            for shard in shards
+        ))
+
+    async def _fetch_search_page(self, query: str, search_variables: Dict[str, Any],
+                                 search_key: str, offset: int,
+                                 listing_type: Union[str, ListingType, None] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """Fetch a single page of search results, returning (results, total)"""
+        payload = {"query": query, "variables": {**search_variables, "offset": offset}}
+        return self._extract_search_page(await self._post_search(payload, listing_type), search_key)
+
+    async def _post_search(self, payload: Dict[str, Any],
+                           listing_type: Union[str, ListingType, None] = None) -> Dict[str, Any]:
+        """POST a search payload, going through the response cache when one is configured"""
+        cache = self.response_cache
+        if cache is None:
+            return await self._post_json(self.SEARCH_GQL_URL, payload)
+
+        query, variables = payload["query"], payload.get("variables")
+        cached, is_stale = cache.lookup(query, variables)
+        if cached is not None:
+            if is_stale and (key := cache.claim_refresh(query, variables)) is not None:
+                asyncio.ensure_future(self._revalidate(payload, listing_type, key))
+            return cached
+
+        response_json = await self._post_json(self.SEARCH_GQL_URL, payload)
+        cache.store(query, variables, listing_type, response_json)
+        return response_json
+
+    async def _revalidate(self, payload: Dict[str, Any], listing_type: Union[str, ListingType, None],
+                          key: str) -> None:
+        try:
+            response_json = await self._post_json(self.SEARCH_GQL_URL, payload)
+            self.response_cache.store(payload["query"], payload.get("variables"), listing_type, response_json)
+        except Exception as e:
+            logger.error(f"Background cache refresh failed: {e}")
+        finally:
+            self.response_cache.release_refresh(key)
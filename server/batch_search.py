@@ -0,0 +1,83 @@
+"""
+Fan-out of one search across many locations
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+from dreamery_property_scraper import DreameryPropertyScraper
+
+logger = logging.getLogger(__name__)
+
+# Locations searched at once; each search also pages concurrently, and every
+# request shares the process-wide per-host rate limiter
+NUM_LOCATION_WORKERS = 8
+
+
+@dataclass
+class LocationReport:
+    """Outcome of one location in a batch search"""
+    location: str
+    count: int = 0
+    duplicates: int = 0
+    resolve_seconds: float = 0.0
+    search_seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchSearchResult:
+    """Properties from every location, de-duplicated by property_id, plus per-location reports"""
+    properties: Any = field(default_factory=list)
+    locations: List[LocationReport] = field(default_factory=list)
+
+
+def run_batch_search(scraper: DreameryPropertyScraper, locations: List[str],
+                     search: Callable[[str], List[Any]],
+                     max_workers: int = NUM_LOCATION_WORKERS) -> BatchSearchResult:
+    """Resolve every location concurrently, then run ``search`` for each resolved one.
+
+    Properties are kept in location order; a property_id already returned for
+    an earlier location is counted as a duplicate of the later one.
+    """
+    reports = [LocationReport(location=location) for location in locations]
+    max_workers = max(1, min(max_workers, len(locations)))
+
+    def resolve(report: LocationReport) -> bool:
+        started = time.monotonic()
+        try:
+            if not scraper._lookup_location(report.location):
+                report.error = f"Could not find location: {report.location}"
+        except Exception as e:
+            logger.error(f"Location lookup for {report.location} failed: {e}")
+            report.error = f"Location lookup failed: {e}"
+        report.resolve_seconds = time.monotonic() - started
+        return report.error is None
+
+    def run(report: LocationReport) -> List[Any]:
+        started = time.monotonic()
+        try:
+            return search(report.location)
+        except Exception as e:
+            logger.error(f"Batch search for {report.location} failed: {e}")
+            report.error = str(e)
+            return []
+        finally:
+            report.search_seconds = time.monotonic() - started
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        resolved = list(executor.map(resolve, reports))
+        results = list(executor.map(lambda report, ok: run(report) if ok else [], reports, resolved))
+
+    seen = set()
+    properties = []
+    for report, found in zip(reports, results):
+        fresh = DreameryPropertyScraper._unseen(found, seen)
+        report.count = len(found)
+        report.duplicates = len(found) - len(fresh)
+        properties.extend(fresh)
+
+    return BatchSearchResult(properties=properties, locations=reports)
+
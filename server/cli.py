@@ -7,7 +7,68 @@ import datetime
 import os
 import sys
 from pathlib import Path
-from scraper_api import scrape_property
+from scraper_api import iter_properties, output_columns, scrape_property
+from arrow_output import property_table, write_parquet
+from export_writers import EXPORT_CHUNK_SIZE, EXPORT_WRITERS, stream_export
+from incremental import PropertyChanges, changes_to_records
+
+
+# Streamed exports write the tabular columns, so only the tabular return types apply
+STREAMED_RETURN_TYPES = ("pandas", "arrow")
+
+
+def stream_to_file(args, fields):
+    """Export with the streaming writers, reporting progress and checkpointing csv/ndjson"""
+    if args.incremental:
+        raise ValueError("--stream cannot be combined with --incremental")
+    if args.resume and not args.filename:
+        raise ValueError("--resume needs the --filename of the export to continue")
+    if not args.filename:
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        location_safe = args.location.replace(" ", "_").replace(",", "").replace(" ", "")
+        args.filename = f"DreameryProperties_{location_safe}_{timestamp}"
+
+    writer_cls = EXPORT_WRITERS[args.output]
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_filename = output_dir / f"{args.filename}.{writer_cls.extension}"
+    checkpoint = f"{output_filename}.checkpoint" if writer_cls.resumable else None
+
+    # A resumed export must continue the same search
+    query = {
+        "location": args.location, "listing_type": args.listing_type, "property_type": args.property_type,
+        "radius": args.radius, "mls_only": args.mls_only, "days": args.days, "date_from": args.date_from,
+        "date_to": args.date_to, "extra_data": args.extra_data, "exclude_pending": args.exclude_pending,
+        "limit": args.limit, "fields": fields,
+    }
+    properties = iter_properties(
+        location=args.location,
+        listing_type=args.listing_type,
+        property_type=args.property_type,
+        radius=args.radius,
+        mls_only=args.mls_only,
+        past_days=args.days,
+        proxy=args.proxy,
+        date_from=args.date_from,
+        date_to=args.date_to,
+        extra_property_data=args.extra_data,
+        exclude_pending=args.exclude_pending,
+        limit=args.limit,
+        fields=fields,
+    )
+    stats = stream_export(
+        properties, str(output_filename), args.output, output_columns(fields),
+        checkpoint_path=checkpoint, resume=args.resume, query=query, chunk_size=args.chunk_size,
+        progress=lambda stats: print(f"  {stats.total} rows written ({stats.rows_per_second:,.0f} rows/s)"),
+    )
+
+    if not stats.total:
+        print("No properties found.")
+        return
+    print(f"Wrote {stats.rows} properties to {output_filename} in {stats.seconds:.1f}s "
+          f"({stats.rows_per_second:,.0f} rows/s)")
+    if stats.skipped:
+        print(f"Skipped {stats.skipped} properties already written before the interruption")
 
 
 def main():
@@ -28,7 +89,7 @@ def main():
         "--return_type",
         type=str,
         default="pandas",
-        choices=["pandas", "pydantic", "raw"],
+        choices=["pandas", "pydantic", "arrow", "raw"],
         help="Return type for data",
     )
 
@@ -37,8 +98,8 @@ def main():
         "--output",
         type=str,
         default="excel",
-        choices=["excel", "csv", "json"],
-        help="Output format",
+        choices=["excel", "csv", "json", "parquet", "ndjson"],
+        help="Output format (parquet needs pyarrow; ndjson is always streamed)",
     )
 
     parser.add_argument(
@@ -62,7 +123,7 @@ def main():
         help="Property types to include",
     )
 
-    parser.add_argument("-p", "--proxy", type=str, default=None, help="Proxy to use for scraping")
+    parser.add_argument("-p", "--proxy", type=str, default=None, help="Proxy to use for scraping; pass several comma-separated to spread requests across a pool")
     parser.add_argument(
         "-d",
         "--days",
@@ -109,7 +170,8 @@ def main():
         "--limit",
         type=int,
         default=10000,
-        help="Limit the number of results returned (default: 10000, max: 10000).",
+        help="Limit the number of results returned (default: 10000, max: 100000; "
+             "area searches past 10000 are split into price/date shards).",
     )
 
     parser.add_argument(
@@ -126,6 +188,28 @@ def main():
         help="End date for filtering (format: YYYY-MM-DD).",
     )
 
+    parser.add_argument(
+        "--fields",
+        type=str,
+        nargs="+",
+        default=None,
+        help="Output columns to request (e.g. property_id list_price latitude longitude), or a profile: pins, table, full.",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        type=str,
+        default=None,
+        metavar="STATE_DB",
+        help="Only fetch listings newer than the last run recorded in this SQLite file and output the changes.",
+    )
+
+    parser.add_argument(
+        "--sweep_removals",
+        action="store_true",
+        help="With --incremental, also report known listings that are no longer listed.",
+    )
+
     parser.add_argument(
         "--output_dir",
         type=str,
@@ -133,7 +217,29 @@ def main():
         help="Directory to save output files (default: current directory).",
     )
 
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write rows as pages arrive instead of after the whole search, in constant memory.",
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted csv or ndjson --stream export from its checkpoint (needs --filename).",
+    )
+
+    parser.add_argument(
+        "--chunk_size",
+        type=int,
+        default=EXPORT_CHUNK_SIZE,
+        help=f"Rows per write when streaming (default: {EXPORT_CHUNK_SIZE}).",
+    )
+
     args = parser.parse_args()
+    if (args.stream or args.resume or args.output == "ndjson") and args.return_type not in STREAMED_RETURN_TYPES:
+        parser.error(f"--return_type {args.return_type} cannot be streamed; --stream, --resume and ndjson "
+                     f"exports write the {'/'.join(STREAMED_RETURN_TYPES)} columns")
 
     try:
         print(f"Scraping properties in {args.location}...")
@@ -164,12 +270,29 @@ def main():
         
         if args.date_from or args.date_to:
             print(f"Date range: {args.date_from or 'N/A'} to {args.date_to or 'N/A'}")
+        
+        if args.incremental:
+            print(f"Incremental state: {args.incremental}")
+
+        # A single profile name selects a named field set rather than one column
+        fields = args.fields
+        if fields and len(fields) == 1 and fields[0] in ("pins", "table", "full"):
+            fields = fields[0]
+
+        if args.stream or args.resume or args.output == "ndjson":
+            stream_to_file(args, fields)
+            return
+
+        # Parquet is written straight from the Arrow table rather than through a DataFrame
+        return_type = args.return_type
+        if args.output == "parquet" and return_type == "pandas":
+            return_type = "arrow"
 
         # Call the scraping API
         result = scrape_property(
             location=args.location,
             listing_type=args.listing_type,
-            return_type=args.return_type,
+            return_type=return_type,
             property_type=args.property_type,
             radius=args.radius,
             mls_only=args.mls_only,
@@ -181,11 +304,19 @@ def main():
             extra_property_data=args.extra_data,
             exclude_pending=args.exclude_pending,
             limit=args.limit,
+            incremental_db=args.incremental,
+            sweep_removals=args.sweep_removals,
+            fields=fields,
         )
 
+        if isinstance(result, PropertyChanges):
+            print(f"Changes: {len(result.inserts)} inserts, {len(result.updates)} updates, "
+                  f"{len(result.removals)} removals")
+            result = changes_to_records(result)
+
         # Handle different return types
-        if args.return_type == "pandas":
-            if hasattr(result, 'empty') and result.empty:
+        if return_type in ("pandas", "arrow"):
+            if len(result) == 0:
                 print("No properties found.")
                 return
             
@@ -202,8 +333,15 @@ def main():
             output_dir = Path(args.output_dir)
             output_dir.mkdir(parents=True, exist_ok=True)
             
+            if return_type == "arrow" and args.output != "parquet":
+                result = result.to_pandas()
+
             # Save based on output format
-            if args.output == "excel":
+            if args.output == "parquet":
+                output_filename = output_dir / f"{args.filename}.parquet"
+                write_parquet(result, output_filename)
+                print(f"Parquet file saved as {output_filename}")
+            elif args.output == "excel":
                 output_filename = output_dir / f"{args.filename}.xlsx"
                 result.to_excel(output_filename, index=False)
                 print(f"Excel file saved as {output_filename}")
@@ -213,7 +351,7 @@ def main():
                 print(f"CSV file saved as {output_filename}")
             elif args.output == "json":
                 output_filename = output_dir / f"{args.filename}.json"
-                result.to_json(output_filename, orient='records', indent=2)
+                result.to_json(output_filename, orient='records', indent=2, date_format='iso')
                 print(f"JSON file saved as {output_filename}")
         
         elif args.return_type == "pydantic":
@@ -261,6 +399,10 @@ def main():
                 with open(output_filename, 'w') as f:
                     json.dump(data, f, indent=2, default=str)
                 print(f"JSON file saved as {output_filename}")
+            elif args.output == "parquet":
+                output_filename = output_dir / f"{args.filename}.parquet"
+                write_parquet(property_table(result), output_filename)
+                print(f"Parquet file saved as {output_filename}")
         
         else:  # raw
             if not result:
@@ -1,31 +1,37 @@
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import json
-import uuid
-from typing import Dict, List, Dict, Optional, Union, Any, Union
+from typing import Dict, List, Dict, Optional, Union, Any, Union, Tuple, Set, Callable, Iterable, Iterator
 from dataclasses import dataclass
-from datetime import datetime, timedelta
 import logging
 import re
 import time
 from urllib.parse import urlencode, urljoin
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from itertools import islice
 from json import JSONDecodeError
-from models import PropertyData, Property, Address, Description, PropertyType, ListingType, SearchPropertyType, ReturnType, HomeFlags, PetPolicy, OpenHouse, Unit, HomeMonthlyFee, HomeOneTimeFee, HomeParkingDetails, PropertyDetails, Popularity, TaxRecord, PropertyEstimate, HomeEstimates, Advertisers, Agent, Office, Broker, Builder
-from parsers import (
-    parse_address, parse_description, parse_open_houses, parse_units,
-    parse_tax_record, parse_estimates, parse_neighborhoods, calculate_days_on_mls
-)
-from processors import process_property, process_extra_property_details, get_key
-from queries import HOMES_DATA, SEARCH_HOMES_DATA, GENERAL_RESULTS_QUERY, HOME_FRAGMENT
+from models import PropertyData, Property, PropertyType, ListingType, SearchPropertyType, ReturnType, HomeFlags, PetPolicy, OpenHouse, Unit, HomeMonthlyFee, HomeOneTimeFee, HomeParkingDetails, PropertyDetails, Popularity, TaxRecord, PropertyEstimate, HomeEstimates
+from queries import HOMES_DATA, SEARCH_HOMES_DATA, GENERAL_RESULTS_QUERY, HOME_FRAGMENT, build_search_selection, needs_property_details
 from enhanced_scraper import EnhancedScraper, ScraperInput
-from exceptions import AuthenticationError, ScrapingError, ValidationError, RateLimitError
+from exceptions import ScrapingError, ValidationError, RateLimitError
+from location_cache import LocationCache, get_location_cache
+from token_manager import get_token_manager
+from response_cache import ResponseCache, get_response_cache
+from model_builder import ModelBuilder, get_model_builder
+from parse_pool import ParsePool, PropertyParser, get_parse_pool
+from parsers import normalize_dates
+from sessions import create_proxy_session, create_session
+from proxy_pool import ProxyPool, parse_proxies
+from search_shards import MAX_RESULT_WINDOW, MAX_SEARCH_LIMIT, SearchShard
+from json_stream import SearchResultStream
 
 logger = logging.getLogger(__name__)
 
+PROPERTY_ID_FIELDS = "{ property_id }"
+
+
 @dataclass
 class PropertyAddress:
     street: str
@@ -58,6 +64,7 @@ class PropertyAgent:
     company: str
     license: str
 
+
 class DreameryPropertyScraper:
     SEARCH_GQL_URL = "https://www.realtor.com/api/v1/rdc_search_srp?client_id=rdc-search-new-communities&schema=vesta"
     PROPERTY_URL = "https://www.realtor.com/realestateandhomes-detail/"
@@ -65,37 +72,15 @@ class DreameryPropertyScraper:
     ADDRESS_AUTOCOMPLETE_URL = "https://parser-external.geo.moveaws.com/suggest"
     NUM_PROPERTY_WORKERS = 20
     DEFAULT_PAGE_SIZE = 200
+    DETAIL_BATCH_SIZE = 50
+    NUM_SHARD_WORKERS = 4
 
-    def __init__(self, use_enhanced_session: bool = True):
+    def __init__(self, use_enhanced_session: bool = True, location_cache: Optional[LocationCache] = None,
+                 response_cache: Optional[ResponseCache] = None, model_builder: Optional[ModelBuilder] = None,
+                 parse_pool: Optional[ParsePool] = None):
         if use_enhanced_session:
             # Use enhanced session management
-            self.session = requests.Session()
-            retries = Retry(
-                total=3, 
-                backoff_factor=4, 
-                status_forcelist=[429, 403], 
-                allowed_methods=frozenset(["GET", "POST"])
-            )
-            adapter = HTTPAdapter(max_retries=retries)
-            self.session.mount("http://", adapter)
-            self.session.mount("https://", adapter)
-            self.session.headers.update({
-                "accept": "application/json, text/javascript",
-                "accept-language": "en-US,en;q=0.9",
-                "cache-control": "no-cache",
-                "content-type": "application/json",
-                "origin": "https://www.realtor.com",
-                "pragma": "no-cache",
-                "priority": "u=1, i",
-                "rdc-ab-tests": "commute_travel_time_variation:v1",
-                "sec-ch-ua": '"Not)A;Brand";v="99", "Google Chrome";v="127", "Chromium";v="127"',
-                "sec-ch-ua-mobile": "?0",
-                "sec-ch-ua-platform": '"Windows"',
-                "sec-fetch-dest": "empty",
-                "sec-fetch-mode": "cors",
-                "sec-fetch-site": "same-origin",
-                "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36",
-            })
+            self.session = create_session()
         else:
             # Use legacy session management
             self.session = requests.Session()
@@ -111,43 +96,15 @@ class DreameryPropertyScraper:
         self.base_url = "https://www.realtor.com"
         self.api_base = "https://www.realtor.com/api/v1"
         self.access_token = None
+        self.location_cache = location_cache or get_location_cache()
+        self.response_cache = response_cache or get_response_cache()
+        self.model_builder = model_builder or get_model_builder()
+        self.parse_pool = parse_pool or get_parse_pool()
 
     def get_access_token(self) -> str:
-        """Get access token for Realtor.com API"""
-        if self.access_token:
-            return self.access_token
-            
-        device_id = str(uuid.uuid4()).upper()
-
-        response = requests.post(
-            "https://graph.realtor.com/auth/token",
-            headers={
-                "Host": "graph.realtor.com",
-                "Accept": "*/*",
-                "Content-Type": "Application/json",
-                "X-Client-ID": "rdc_mobile_native,iphone",
-                "X-Visitor-ID": device_id,
-                "X-Client-Version": "24.21.23.679885",
-                "Accept-Language": "en-US,en;q=0.9",
-                "User-Agent": "Realtor.com/24.21.23.679885 CFNetwork/1494.0.7 Darwin/23.4.0",
-            },
-            data=json.dumps({
-                "grant_type": "device_mobile",
-                "device_id": device_id,
-                "client_app_id": "rdc_mobile_native,24.21.23.679885,iphone",
-            }),
-        )
-
-        data = response.json()
-
-        if not (access_token := data.get("access_token")):
-            raise AuthenticationError(
-                "Failed to get access token, use a proxy/vpn or wait a moment and try again.", 
-                response=response
-            )
-
-        self.access_token = access_token
-        return access_token
+        """Get access token for Realtor.com API from the shared token manager"""
+        self.access_token = get_token_manager().get_token()
+        return self.access_token
 
     @classmethod
     def from_scraper_input(cls, scraper_input: ScraperInput) -> 'DreameryPropertyScraper':
@@ -169,11 +126,10 @@ class DreameryPropertyScraper:
         scraper.limit = scraper_input.limit
         scraper.return_type = scraper_input.return_type
         
-        # Set proxy if provided
-        if scraper_input.proxy:
-            proxy_url = scraper_input.proxy
-            proxies = {"http": proxy_url, "https": proxy_url}
-            scraper.session.proxies.update(proxies)
+        # Route requests through a health-scored pool when proxies are provided
+        proxies = parse_proxies(scraper_input.proxy)
+        if proxies:
+            scraper.session = ProxyPool(proxies, session_factory=create_proxy_session)
         
         return scraper
     
@@ -189,7 +145,9 @@ class DreameryPropertyScraper:
                          sqft_max: Optional[int] = None,
                          radius: Optional[float] = None,
                          past_days: Optional[int] = None,
-                         limit: int = 50) -> List[Dict[str, Any]]:
+                         limit: int = 50,
+                         date_from: Optional[str] = None,
+                         date_to: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Search for properties using Realtor.com API
         """
@@ -218,11 +176,14 @@ class DreameryPropertyScraper:
             # Determine search type
             search_type = self._determine_search_type(location_info, radius)
             
+            # Restrict to the requested listed/sold date window
+            shard = SearchShard.for_search(listing_type, past_days, date_from, date_to)
+            
             # Perform search
             if search_type == "single_property":
                 return self._handle_single_property(location_info)
             else:
-                return self._perform_general_search(search_variables, search_type, limit)
+                return self._perform_general_search(search_variables, search_type, limit, listing_type, shard)
                 
         except Exception as e:
             logger.error(f"Property search failed: {e}")
@@ -243,9 +204,16 @@ class DreameryPropertyScraper:
                                  limit: int = 50,
                                  mls_only: bool = False,
                                  extra_property_data: bool = False,
-                                 exclude_pending: bool = False) -> List[Property]:
+                                 exclude_pending: bool = False,
+                                 detail_batch_size: Optional[int] = None,
+                                 date_from: Optional[str] = None,
+                                 date_to: Optional[str] = None,
+                                 fields: Union[str, List[str], None] = None) -> List[Property]:
         """
-        Advanced property search using the new processors for comprehensive data extraction
+        Advanced property search using the new processors for comprehensive data extraction.
+
+        ``fields`` limits the GraphQL selection to a profile ("pins", "table",
+        "full") or a list of output columns / search fields.
         """
         try:
             # Map listing types
@@ -272,26 +240,17 @@ class DreameryPropertyScraper:
             # Determine search type
             search_type = self._determine_search_type(location_info, radius)
             
-            # Perform search
-            if search_type == "single_property":
-                properties = self._handle_single_property(location_info)
-            else:
-                properties = self._perform_general_search(search_variables, search_type, limit)
-            
-            # Process properties using the new processors
-            processed_properties = []
-            for prop in properties:
-                processed_prop = self._process_property_with_processors(
-                    prop,
-                    mls_only=mls_only,
-                    extra_property_data=extra_property_data,
-                    exclude_pending=exclude_pending,
-                    listing_type=listing_type_map.get(listing_type, ListingType.FOR_SALE)
-                )
-                if processed_prop:
-                    processed_properties.append(processed_prop)
+            # Restrict to the requested listed/sold date window
+            shard = SearchShard.for_search(listing_type, past_days, date_from, date_to)
             
-            return processed_properties
+            # Process raw homes as they are decoded so the processors see the GraphQL shape
+            process = self._property_parser(mls_only, extra_property_data, exclude_pending,
+                                            listing_type_map.get(listing_type, ListingType.FOR_SALE))
+            return self._fetch_processed_properties(
+                location_info, search_variables, search_type, limit, listing_type, shard,
+                build_search_selection(fields), process,
+                extra_property_data and needs_property_details(fields), detail_batch_size
+            )
                 
         except Exception as e:
             logger.error(f"Advanced property search failed: {e}")
@@ -312,9 +271,19 @@ class DreameryPropertyScraper:
                                       limit: int = 50,
                                       mls_only: bool = False,
                                       extra_property_data: bool = True,
-                                      exclude_pending: bool = False) -> List[Property]:
+                                      exclude_pending: bool = False,
+                                      detail_batch_size: Optional[int] = None,
+                                      date_from: Optional[str] = None,
+                                      date_to: Optional[str] = None,
+                                      fields: Union[str, List[str], None] = None,
+                                      rows: bool = False) -> List[Property]:
         """
-        Comprehensive property search using enhanced GraphQL queries for maximum data extraction
+        Comprehensive property search using enhanced GraphQL queries for maximum data extraction.
+
+        ``fields`` limits the GraphQL selection to a profile ("pins", "table",
+        "full") or a list of output columns / search fields. ``rows`` returns
+        flat output rows (utils.property_row) instead of Property objects,
+        the cheap form to bring back from parse workers.
         """
         try:
             # Map listing types
@@ -341,48 +310,134 @@ class DreameryPropertyScraper:
             # Determine search type
             search_type = self._determine_search_type(location_info, radius)
             
-            # Perform search with enhanced queries
-            if search_type == "single_property":
-                properties = self._handle_single_property(location_info)
-            else:
-                properties = self._perform_general_search(search_variables, search_type, limit)
-            
-            # Process properties using the new processors with comprehensive data
-            processed_properties = []
-            for prop in properties:
-                processed_prop = self._process_property_with_processors(
-                    prop,
-                    mls_only=mls_only,
-                    extra_property_data=extra_property_data,
-                    exclude_pending=exclude_pending,
-                    listing_type=listing_type_map.get(listing_type, ListingType.FOR_SALE)
-                )
-                if processed_prop:
-                    processed_properties.append(processed_prop)
+            # Restrict to the requested listed/sold date window
+            shard = SearchShard.for_search(listing_type, past_days, date_from, date_to)
             
-            return processed_properties
+            # Process raw homes as they are decoded so the processors see the GraphQL shape with enhanced queries
+            process = self._property_parser(mls_only, extra_property_data, exclude_pending,
+                                            listing_type_map.get(listing_type, ListingType.FOR_SALE), rows)
+            return self._fetch_processed_properties(
+                location_info, search_variables, search_type, limit, listing_type, shard,
+                build_search_selection(fields), process,
+                extra_property_data and needs_property_details(fields), detail_batch_size
+            )
                 
         except Exception as e:
             logger.error(f"Comprehensive property search failed: {e}")
             return []
+
+    def iter_properties(self,
+                        location: str = "San Francisco, CA",
+                        listing_type: str = "for_sale",
+                        property_types: Optional[List[str]] = None,
+                        min_price: Optional[int] = None,
+                        max_price: Optional[int] = None,
+                        beds: Optional[int] = None,
+                        baths: Optional[int] = None,
+                        sqft_min: Optional[int] = None,
+                        sqft_max: Optional[int] = None,
+                        radius: Optional[float] = None,
+                        past_days: Optional[int] = None,
+                        limit: int = 50,
+                        mls_only: bool = False,
+                        extra_property_data: bool = False,
+                        exclude_pending: bool = False,
+                        detail_batch_size: Optional[int] = None,
+                        date_from: Optional[str] = None,
+                        date_to: Optional[str] = None,
+                        fields: Union[str, List[str], None] = None) -> Iterator[Property]:
+        """
+        Yield processed properties page by page, taking the same filters as search_properties_advanced.
+
+        The next page is fetched while the caller handles the current one, so
+        at most two pages of properties are resident however large ``limit`` is.
+        """
+        listing_type_enum = ListingType.__members__.get(listing_type.upper(), ListingType.FOR_SALE)
+
+        location_info = self._handle_location(location)
+        if not location_info:
+            logger.error(f"Could not find location: {location}")
+            return
+
+        search_variables = self._build_search_variables(
+            location_info, listing_type_enum, property_types, min_price, max_price, beds, baths,
+            sqft_min, sqft_max, radius, past_days, limit
+        )
+        search_type = self._determine_search_type(location_info, radius)
+        process = self._property_parser(mls_only, extra_property_data, exclude_pending, listing_type_enum)
+
+        if search_type == "single_property":
+            yield from self._process_homes(
+                self._fetch_raw_properties(location_info, search_variables, search_type, limit), process
+            )
+            return
+
+        shard = SearchShard.for_search(listing_type, past_days, date_from, date_to)
+        with_details = extra_property_data and needs_property_details(fields)
+        consume = lambda homes: self._process_homes(homes, process, with_details, detail_batch_size)
+        for page in self._iter_search_pages(search_variables, search_type, limit, listing_type, shard,
+                                            build_search_selection(fields), consume):
+            yield from page
+
+    def search_property_ids(self, location: str, listing_type: str = "for_sale",
+                            radius: Optional[float] = None, limit: int = MAX_SEARCH_LIMIT) -> Set[str]:
+        """Fetch only the property_ids a search currently matches.
+
+        Used for removal sweeps, so unlike the other searches this raises
+        ScrapingError instead of returning a partial result: a missing page
+        would otherwise look like delisted homes. Searches past one result
+        window are sharded; ones matching more than ``limit`` homes raise.
+        """
+        location_info = self._handle_location(location)
+        if not location_info:
+            raise ScrapingError(f"Could not find location: {location}")
+
+        search_type = self._determine_search_type(location_info, radius)
+        if search_type == "single_property":
+            return {location_info["mpr_id"]}
+
+        search_variables = self._build_search_variables(
+            location_info, listing_type, None, None, None, None, None, None, None, radius, None, limit
+        )
+        homes, total = self._fetch_search_results_and_total(search_variables, search_type, limit, listing_type,
+                                                            fields=PROPERTY_ID_FIELDS)
+        property_ids = {home["property_id"] for home in homes if home.get("property_id")}
+        if total > limit:
+            raise ScrapingError(f"Property id sweep matches {total} homes, more than the limit of {limit}")
+        if len(property_ids) < total:
+            raise ScrapingError(f"Property id sweep returned {len(property_ids)} of {total} homes")
+        return property_ids
     
     def _handle_location(self, location: str) -> Optional[Dict[str, Any]]:
-        """Handle location lookup using Realtor.com API"""
-        params = {
+        """Handle location lookup using Realtor.com API, served from the location cache when possible"""
+        try:
+            return self._lookup_location(location)
+        except Exception as e:
+            logger.error(f"Location lookup failed: {e}")
+            return None
+
+    def _lookup_location(self, location: str) -> Optional[Dict[str, Any]]:
+        """Location lookup that raises request and response errors; None when nothing matches"""
+        cached = self.location_cache.get(location)
+        if cached is not None:
+            return cached
+
+        response = self.session.get(self.ADDRESS_AUTOCOMPLETE_URL, params=self._build_location_params(location))
+        result = response.json()["autocomplete"]
+        if not result:
+            return None
+        self.location_cache.set(location, result[0])
+        return result[0]
+
+    @staticmethod
+    def _build_location_params(location: str) -> Dict[str, str]:
+        """Build autocomplete query parameters for a location string"""
+        return {
             "input": location,
             "client_id": "rdc-search-new-communities",
             "limit": "1",
             "area_types": "city,state,county,postal_code,address,street,neighborhood,school,school_district,university,park",
         }
-
-        try:
-            response = self.session.get(self.ADDRESS_AUTOCOMPLETE_URL, params=params)
-            response_json = response.json()
-            result = response_json["autocomplete"]
-            return result[0] if result else None
-        except Exception as e:
-            logger.error(f"Location lookup failed: {e}")
-            return None
     
     def _build_search_variables(self, location_info: Dict[str, Any], listing_type: str,
                                property_types: Optional[List[str]], min_price: Optional[int],
@@ -434,14 +489,7 @@ class DreameryPropertyScraper:
     
     def _get_property_details(self, property_id: str) -> List[Dict[str, Any]]:
         """Get details for a single property using enhanced query template"""
-        query = f"""
-        query Home($property_id: ID!) {{
-            home(property_id: $property_id) {HOMES_DATA}
-        }}
-        """
-        
-        variables = {"property_id": property_id}
-        payload = {"query": query, "variables": variables}
+        payload = self._build_property_details_payload(property_id)
         
         try:
             response = self.session.post(self.SEARCH_GQL_URL, json=payload)
@@ -449,51 +497,490 @@ class DreameryPropertyScraper:
             
             if "data" in response_json and response_json["data"]["home"]:
                 property_data = response_json["data"]["home"]
-                return [self._format_property_for_dreamery(property_data)]
+                prop = self._process_property_with_processors(property_data)
+                return [prop] if prop else []
             else:
                 return []
         except Exception as e:
             logger.error(f"Failed to get property details: {e}")
             return []
     
+    def _fetch_raw_properties(self, location_info: Dict[str, Any], search_variables: Dict[str, Any],
+                              search_type: str, limit: int,
+                              listing_type: Union[str, ListingType, None] = None,
+                              shard: Optional[SearchShard] = None,
+                              fields: str = SEARCH_HOMES_DATA) -> List[Dict[str, Any]]:
+        """Fetch unformatted homes for a search, as returned by GraphQL"""
+        if search_type == "single_property":
+            payload = self._build_property_details_payload(location_info["mpr_id"])
+            response_json = self.session.post(self.SEARCH_GQL_URL, json=payload).json()
+            home = (response_json.get("data") or {}).get("home")
+            return [home] if home else []
+        return self._fetch_search_results(search_variables, search_type, limit, listing_type, shard, fields)
+
+    def _fetch_processed_properties(self, location_info: Dict[str, Any], search_variables: Dict[str, Any],
+                                    search_type: str, limit: int,
+                                    listing_type: Union[str, ListingType, None],
+                                    shard: Optional[SearchShard], fields: str,
+                                    process: Callable[[Dict[str, Any]], Any],
+                                    extra_property_data: bool = False,
+                                    detail_batch_size: Optional[int] = None) -> List[Any]:
+        """Fetch a search, handing each raw home to ``process`` as soon as it is decoded"""
+        if search_type == "single_property":
+            homes = self._fetch_raw_properties(location_info, search_variables, search_type, limit)
+            return self._process_homes(homes, process)
+
+        consume = lambda homes: self._process_homes(homes, process, extra_property_data, detail_batch_size)
+        return self._fetch_search_results(search_variables, search_type, limit, listing_type, shard, fields, consume)
+
+    def _process_homes(self, homes: Iterable[Dict[str, Any]], process: Callable[[Dict[str, Any]], Any],
+                       extra_property_data: bool = False, detail_batch_size: Optional[int] = None) -> List[Any]:
+        """Process raw homes a batch at a time, dropping each batch once processed.
+
+        Each batch's dates are normalized in one vectorized pass. With
+        ``extra_property_data`` a batch's detail fields are fetched in a single
+        request; batches are submitted to one executor as the page decodes, so
+        a page's detail requests run concurrently, and come back in page order.
+        With a parse pool each batch goes on to the worker processes as soon as
+        it is ready, while the rest of the page is still decoding.
+        """
+        batch_size = detail_batch_size or self.DETAIL_BATCH_SIZE
+        homes = iter(homes)
+
+        def batches() -> Iterator[List[Dict[str, Any]]]:
+            if not extra_property_data:
+                yield from iter(lambda: list(islice(homes, batch_size)), [])
+                return
+            with ThreadPoolExecutor(max_workers=self.NUM_PROPERTY_WORKERS) as executor:
+                pending = deque()
+                for batch in iter(lambda: list(islice(homes, batch_size)), []):
+                    pending.append(executor.submit(self._attach_property_details_batch, batch))
+                    while pending and pending[0].done():
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+
+        if self.parse_pool is not None:
+            return self.parse_pool.map(process, (home for batch in batches() for home in batch))
+
+        processed = []
+        for batch in batches():
+            for home in normalize_dates(batch):
+                prop = process(home)
+                if prop:
+                    processed.append(prop)
+        return processed
+
+    def _attach_property_details_batch(self, homes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Merge one detail request's fields into ``homes``; a failed request leaves them as they are"""
+        property_ids = [home["property_id"] for home in homes if home.get("property_id")]
+        try:
+            details = self._fetch_property_details_batch(property_ids) if property_ids else {}
+        except Exception as e:
+            logger.error(f"Property detail batch failed: {e}")
+            details = {}
+        for home in homes:
+            detail = details.get(home.get("property_id"))
+            if detail:
+                self._merge_property_details(home, detail)
+        return homes
+
+    def _fetch_extra_property_details(self, property_ids: List[str],
+                                      batch_size: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """Fetch detail fields for many properties, packing DETAIL_BATCH_SIZE homes per request"""
+        batch_size = batch_size or self.DETAIL_BATCH_SIZE
+        batches = [property_ids[i:i + batch_size] for i in range(0, len(property_ids), batch_size)]
+        if not batches:
+            return {}
+
+        details = {}
+        with ThreadPoolExecutor(max_workers=min(self.NUM_PROPERTY_WORKERS, len(batches))) as executor:
+            futures = [executor.submit(self._fetch_property_details_batch, batch) for batch in batches]
+            for future in as_completed(futures):
+                try:
+                    details.update(future.result())
+                except Exception as e:
+                    logger.error(f"Property detail batch failed: {e}")
+
+        return details
+
+    def _fetch_property_details_batch(self, property_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch detail fields for one batch of properties in a single aliased query"""
+        payload = self._build_property_details_batch_payload(property_ids)
+        response_json = self.session.post(self.SEARCH_GQL_URL, json=payload).json()
+        return self._extract_property_details_batch(response_json, property_ids)
+
+    @staticmethod
+    def _build_property_details_batch_payload(property_ids: List[str]) -> Dict[str, Any]:
+        """Build one GraphQL document selecting every property under a positional alias"""
+        selections = "\n".join(
+            f"home_{index}: home(property_id: {json.dumps(str(property_id))}) {{ ...HomeData }}"
+            for index, property_id in enumerate(property_ids)
+        )
+        query = f"""{HOME_FRAGMENT}
+        query GetHomes {{
+            {selections}
+        }}
+        """
+        return {"query": query}
+
+    @staticmethod
+    def _extract_property_details_batch(response_json: Optional[Dict[str, Any]],
+                                        property_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        data = (response_json or {}).get("data") or {}
+        return {
+            str(property_id): data[f"home_{index}"]
+            for index, property_id in enumerate(property_ids)
+            if data.get(f"home_{index}")
+        }
+
+    @staticmethod
+    def _merge_property_details(home: Dict[str, Any], detail: Dict[str, Any]) -> None:
+        for key, value in detail.items():
+            if value is None or key == "property_id":
+                continue
+            if key == "location" and isinstance(home.get("location"), dict):
+                home["location"] = {**home["location"], **value}
+            else:
+                home[key] = value
+
+    @staticmethod
+    def _build_property_details_payload(property_id: str) -> Dict[str, Any]:
+        """Build the GraphQL payload for a single property detail lookup"""
+        query = f"""
+        query Home($property_id: ID!) {{
+            home(property_id: $property_id) {HOMES_DATA}
+        }}
+        """
+        return {"query": query, "variables": {"property_id": property_id}}
+    
     def _perform_general_search(self, search_variables: Dict[str, Any], 
-                               search_type: str, limit: int) -> List[Dict[str, Any]]:
+                               search_type: str, limit: int,
+                               listing_type: Union[str, ListingType, None] = None,
+                               shard: Optional[SearchShard] = None) -> List[Dict[str, Any]]:
         """Perform general property search"""
-        query = self._build_search_query(search_type)
-        payload = {"query": query, "variables": search_variables}
-        
         try:
-            response = self.session.post(self.SEARCH_GQL_URL, json=payload)
-            response_json = response.json()
-            
-            search_key = "home_search" if "home_search" in query else "property_search"
-            
-            if (response_json is None or "data" not in response_json or 
-                response_json["data"] is None or search_key not in response_json["data"] or
-                response_json["data"][search_key] is None or 
-                "results" not in response_json["data"][search_key]):
-                return []
-            
-            properties_list = response_json["data"][search_key]["results"]
-            total_properties = response_json["data"][search_key]["total"]
-            
-            # Limit results
-            properties_list = properties_List[:limit]
-            
-            # Format properties for Dreamery
-            formatted_properties = []
-            for prop in properties_list:
-                formatted_prop = self._format_property_for_dreamery(prop)
-                formatted_properties.append(formatted_prop)
-            
-            return formatted_properties
+            # Build properties as each raw home is decoded, skipping any that fail
+            format_page = lambda homes: [prop for prop in map(self._process_property_with_processors, homes) if prop]
+            return self._fetch_search_results(search_variables, search_type, limit, listing_type, shard,
+                                              consume=format_page)
             
         except Exception as e:
             logger.error(f"General search failed: {e}")
             return []
+
+    def _fetch_search_results(self, search_variables: Dict[str, Any],
+                              search_type: str, limit: int,
+                              listing_type: Union[str, ListingType, None] = None,
+                              shard: Optional[SearchShard] = None,
+                              fields: str = SEARCH_HOMES_DATA,
+                              consume: Callable[[Iterable[Dict[str, Any]]], List[Any]] = list) -> List[Any]:
+        """Fetch raw search results, paging through offsets concurrently up to limit.
+
+        ``shard`` restricts the search to a price band / date window. Area
+        searches matching more homes than one result window can page through
+        are transparently split into narrower shards.
+
+        Each page's homes are handed to ``consume`` as they are decoded and
+        its return value stands in for the page, so passing a processor keeps
+        only one raw home in memory per page instead of the whole response.
+        """
+        results, _ = self._fetch_search_results_and_total(search_variables, search_type, limit, listing_type,
+                                                          shard, fields, consume)
+        return results
+
+    def _fetch_search_results_and_total(self, search_variables: Dict[str, Any],
+                                        search_type: str, limit: int,
+                                        listing_type: Union[str, ListingType, None] = None,
+                                        shard: Optional[SearchShard] = None,
+                                        fields: str = SEARCH_HOMES_DATA,
+                                        consume: Callable[[Iterable[Dict[str, Any]]], List[Any]] = list
+                                        ) -> Tuple[List[Any], int]:
+        """``_fetch_search_results`` plus the total the first page reported"""
+        shard = shard or SearchShard.for_listing_type(listing_type)
+        query = self._build_search_query(search_type, shard, listing_type, fields)
+        search_key = "home_search" if "home_search" in query else "property_search"
+
+        first_page = self._open_search_page(query, search_variables, search_key, 0, listing_type)
+        try:
+            total = first_page.read_total()
+            if search_type == "area" and total > MAX_RESULT_WINDOW and limit > MAX_RESULT_WINDOW:
+                first_page.close()
+                return self._fetch_sharded_results(search_variables, search_type, limit, listing_type, shard,
+                                                   fields, consume), total
+            results = consume(islice(first_page, limit))
+        finally:
+            first_page.close()
+        total = first_page.total
+        if not results and not total:
+            return [], 0
+
+        return self._fetch_remaining_pages(query, search_variables, search_key, results, total, limit,
+                                           listing_type, consume), total
+
+    def _iter_search_pages(self, search_variables: Dict[str, Any], search_type: str, limit: int,
+                           listing_type: Union[str, ListingType, None], shard: SearchShard, fields: str,
+                           consume: Callable[[Iterable[Dict[str, Any]]], List[Any]]) -> Iterator[List[Any]]:
+        """Yield consumed search pages in order, fetching one page ahead of the caller.
+
+        Oversized area searches are walked shard by shard; results already
+        yielded by an earlier shard are skipped.
+        """
+        query = self._build_search_query(search_type, shard, listing_type, fields)
+        search_key = "home_search" if "home_search" in query else "property_search"
+
+        first_page = self._open_search_page(query, search_variables, search_key, 0, listing_type)
+        try:
+            total = first_page.read_total()
+            sharded = search_type == "area" and total > MAX_RESULT_WINDOW and limit > MAX_RESULT_WINDOW
+            results = [] if sharded else consume(islice(first_page, limit))
+        finally:
+            first_page.close()
+
+        if sharded:
+            leaves = self._plan_shards(search_variables, search_type, shard, listing_type, fields,
+                                       consume=lambda homes: [])
+            logger.info(f"Split search into {len(leaves)} shards")
+            pages = [
+                (self._build_search_query(search_type, leaf, listing_type, fields), "home_search", offset, None)
+                for leaf, _, leaf_total in leaves
+                for offset in range(0, min(leaf_total, MAX_RESULT_WINDOW), self.DEFAULT_PAGE_SIZE)
+            ]
+        else:
+            end = min(first_page.total, limit, MAX_RESULT_WINDOW)
+            pages = [
+                (query, search_key, offset, limit - offset)
+                for offset in range(self.DEFAULT_PAGE_SIZE, end, self.DEFAULT_PAGE_SIZE)
+            ]
+
+        def fetch(page):
+            page_query, page_key, offset, max_results = page
+            try:
+                return self._fetch_search_page(page_query, search_variables, page_key, offset, listing_type,
+                                               consume, max_results)[0]
+            except Exception as e:
+                logger.error(f"Search page at offset {offset} failed: {e}")
+                return []
+
+        seen = set()
+        remaining = limit
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            upcoming = iter(pages)
+            pending = executor.submit(fetch, next(upcoming)) if pages else None
+            while True:
+                fresh = self._unseen(results, seen)
+                if fresh:
+                    yield fresh[:remaining]
+                    remaining -= len(fresh)
+                if remaining <= 0 or pending is None:
+                    return
+                results = pending.result()
+                page = next(upcoming, None)
+                pending = executor.submit(fetch, page) if page else None
+
+    def _fetch_remaining_pages(self, query: str, search_variables: Dict[str, Any], search_key: str,
+                               first_page: List[Any], total: int, limit: int,
+                               listing_type: Union[str, ListingType, None] = None,
+                               consume: Callable[[Iterable[Dict[str, Any]]], List[Any]] = list) -> List[Any]:
+        """Fetch every page after the first concurrently and return the results in offset order"""
+        total = min(total or 0, limit, MAX_RESULT_WINDOW)
+        offsets = list(range(self.DEFAULT_PAGE_SIZE, total, self.DEFAULT_PAGE_SIZE))
+        if not offsets:
+            return first_page[:limit]
+
+        pages = {0: first_page}
+        with ThreadPoolExecutor(max_workers=min(self.NUM_PROPERTY_WORKERS, len(offsets))) as executor:
+            futures = {
+                executor.submit(self._fetch_search_page, query, search_variables, search_key, offset, listing_type,
+                                consume, limit - offset): offset
+                for offset in offsets
+            }
+            for future in as_completed(futures):
+                offset = futures[future]
+                try:
+                    pages[offset], _ = future.result()
+                except Exception as e:
+                    logger.error(f"Search page at offset {offset} failed: {e}")
+                    pages[offset] = []
+
+        properties_list = []
+        for offset in sorted(pages):
+            properties_list.extend(pages[offset])
+
+        return properties_list[:limit]
+
+    def _fetch_sharded_results(self, search_variables: Dict[str, Any], search_type: str, limit: int,
+                               listing_type: Union[str, ListingType, None], shard: SearchShard,
+                               fields: str = SEARCH_HOMES_DATA,
+                               consume: Callable[[Iterable[Dict[str, Any]]], List[Any]] = list) -> List[Any]:
+        """Split an oversized search into shards that each fit a result window and fetch them concurrently"""
+        shards = self._plan_shards(search_variables, search_type, shard, listing_type, fields, consume)
+        logger.info(f"Split search into {len(shards)} shards")
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.NUM_SHARD_WORKERS, len(shards)))) as executor:
+            shard_results = list(executor.map(
+                lambda planned: self._fetch_remaining_pages(
+                    self._build_search_query(search_type, planned[0], listing_type, fields), search_variables,
+                    "home_search",
+                    planned[1], planned[2], MAX_RESULT_WINDOW, listing_type, consume,
+                ),
+                shards,
+            ))
+
+        return self._dedupe_homes(shard_results, limit)
+
+    def _plan_shards(self, search_variables: Dict[str, Any], search_type: str, shard: SearchShard,
+                     listing_type: Union[str, ListingType, None] = None, fields: str = SEARCH_HOMES_DATA,
+                     consume: Callable[[Iterable[Dict[str, Any]]], List[Any]] = list,
+                     probe: Optional[Tuple[List[Any], int, List[SearchShard]]] = None
+                     ) -> List[Tuple[SearchShard, List[Any], int]]:
+        """Recursively bisect a shard until each piece fits a result window.
+
+        Returns (shard, first_page, total) for every non-empty leaf so the
+        first page fetched while probing is not requested again. Only leaf
+        pages are consumed; oversized ones are dropped once their total is read.
+        """
+        results, total, children = probe or self._probe_shard(search_variables, search_type, shard, listing_type,
+                                                               fields, consume)
+        if not children:
+            return [(shard, results, total)] if results or total else []
+
+        probes = self._probe_shards(search_variables, search_type, children, listing_type, fields, consume)
+        covered = sum(child_total for _, child_total, _ in probes)
+        if covered < total and shard.is_unpriced and shard.split_dates():
+            logger.info(f"{total - covered} homes in {shard} have no {shard.price_field}; splitting by date instead")
+            children = shard.split_dates()
+            probes = self._probe_shards(search_variables, search_type, children, listing_type, fields, consume)
+            covered = sum(child_total for _, child_total, _ in probes)
+        if covered < total:
+            logger.warning(f"Shards of {shard} cover {covered} of its {total} homes")
+
+        with ThreadPoolExecutor(max_workers=len(children)) as executor:
+            planned = executor.map(
+                lambda child, child_probe: self._plan_shards(search_variables, search_type, child, listing_type,
+                                                             fields, consume, child_probe),
+                children, probes
+            )
+            return [leaf for leaves in planned for leaf in leaves]
+
+    def _probe_shard(self, search_variables: Dict[str, Any], search_type: str, shard: SearchShard,
+                     listing_type: Union[str, ListingType, None], fields: str,
+                     consume: Callable[[Iterable[Dict[str, Any]]], List[Any]]
+                     ) -> Tuple[List[Any], int, List[SearchShard]]:
+        """(consumed first page, total, children) of a shard; oversized shards are split, not consumed"""
+        query = self._build_search_query(search_type, shard, listing_type, fields)
+        first_page = self._open_search_page(query, search_variables, "home_search", 0, listing_type)
+        try:
+            total = first_page.read_total()
+            children = shard.split() if total > MAX_RESULT_WINDOW else []
+            if total > MAX_RESULT_WINDOW and not children:
+                logger.warning(f"Shard {shard} still matches {total} homes; results past {MAX_RESULT_WINDOW} are dropped")
+            results = [] if children else consume(first_page)
+        finally:
+            first_page.close()
+        return results, first_page.total, children
+
+    def _probe_shards(self, search_variables: Dict[str, Any], search_type: str, shards: List[SearchShard],
+                      listing_type: Union[str, ListingType, None], fields: str,
+                      consume: Callable[[Iterable[Dict[str, Any]]], List[Any]]
+                      ) -> List[Tuple[List[Any], int, List[SearchShard]]]:
+        with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+            return list(executor.map(
+                lambda shard: self._probe_shard(search_variables, search_type, shard, listing_type, fields, consume),
+                shards
+            ))
+
+    @staticmethod
+    def _dedupe_homes(shard_results: List[List[Any]], limit: int) -> List[Any]:
+        """Concatenate shard results, keeping the first occurrence of each property_id"""
+        seen = set()
+        homes = []
+        for results in shard_results:
+            for home in results:
+                property_id = DreameryPropertyScraper._property_id(home)
+                if property_id is not None:
+                    if property_id in seen:
+                        continue
+                    seen.add(property_id)
+                homes.append(home)
+                if len(homes) >= limit:
+                    return homes
+        return homes
+
+    @staticmethod
+    def _property_id(home: Any) -> Optional[str]:
+        """property_id of a raw home or a processed property"""
+        return home.get("property_id") if isinstance(home, dict) else getattr(home, "property_id", None)
+
+    @classmethod
+    def _unseen(cls, results: Iterable[Any], seen: Set[str]) -> List[Any]:
+        """Drop results whose property_id is already in ``seen``, recording the rest"""
+        fresh = []
+        for home in results:
+            property_id = cls._property_id(home)
+            if property_id is not None:
+                if property_id in seen:
+                    continue
+                seen.add(property_id)
+            fresh.append(home)
+        return fresh
+
+    def _fetch_search_page(self, query: str, search_variables: Dict[str, Any],
+                           search_key: str, offset: int,
+                           listing_type: Union[str, ListingType, None] = None,
+                           consume: Callable[[Iterable[Dict[str, Any]]], List[Any]] = list,
+                           max_results: Optional[int] = None) -> Tuple[List[Any], int]:
+        """Fetch a single page of search results, returning (consume(results), total)"""
+        page = self._open_search_page(query, search_variables, search_key, offset, listing_type)
+        try:
+            page.read_total()
+            results = consume(islice(page, max_results))
+        finally:
+            page.close()
+        return results, page.total
+
+    def _open_search_page(self, query: str, search_variables: Dict[str, Any], search_key: str, offset: int,
+                          listing_type: Union[str, ListingType, None] = None) -> SearchResultStream:
+        """Request a page of search results, decoding it incrementally.
+
+        With a response cache, hits are served from the stored payload and
+        misses stream like uncached pages, their raw body stored once decoded.
+        """
+        payload = {"query": query, "variables": {**search_variables, "offset": offset}}
+        on_complete = None
+        if self.response_cache is not None:
+            cache = self.response_cache
+            cached, is_stale = cache.lookup(query, payload["variables"])
+            if cached is not None:
+                if is_stale:
+                    cache.revalidate_in_background(
+                        query, payload["variables"], listing_type,
+                        lambda: self.session.post(self.SEARCH_GQL_URL, json=payload).json(),
+                    )
+                return SearchResultStream.from_payload(cached, search_key)
+            on_complete = lambda body: cache.store_body(query, payload["variables"], listing_type, body)
+        response = self.session.post(self.SEARCH_GQL_URL, json=payload, stream=True)
+        return SearchResultStream.from_response(response, search_key, on_complete)
+
+    @staticmethod
+    def _extract_search_page(response_json: Optional[Dict[str, Any]],
+                             search_key: str) -> Tuple[List[Dict[str, Any]], int]:
+        """Extract (results, total) from a search response, tolerating empty payloads"""
+        if (response_json is None or "data" not in response_json or 
+            response_json["data"] is None or search_key not in response_json["data"] or
+            response_json["data"][search_key] is None or 
+            "results" not in response_json["data"][search_key]):
+            return [], 0
+
+        search_data = response_json["data"][search_key]
+        return search_data["results"] or [], search_data.get("total") or 0
     
-    def _build_search_query(self, search_type: str) -> str:
+    def _build_search_query(self, search_type: str, shard: Optional[SearchShard] = None,
+                            listing_type: Union[str, ListingType, None] = None,
+                            fields: str = SEARCH_HOMES_DATA) -> str:
         """Build GraphQL query based on search type using enhanced query templates"""
+        status = self._search_status(listing_type)
+        filters = shard.query_filters() if shard else ""
         if search_type == "comps":
             return f"""
             query Property_search($coordinates: [Float]!, $radius: String!, $offset: Int!) {{
@@ -503,13 +990,14 @@ class DreameryPropertyScraper:
                             coordinates: $coordinates
                             radius: $radius
                         }}
-                        status: for_sale
+                        status: {status}
+                        {filters}
                     }}
-                    limit: 200
+                    limit: {self.DEFAULT_PAGE_SIZE}
                     offset: $offset
                 ) {{
                     total
-                    results {SEARCH_HOMES_DATA}
+                    results {fields}
                 }}
             }}
             """
@@ -523,230 +1011,38 @@ class DreameryPropertyScraper:
                         county: $county
                         postal_code: $postal_code
                         state_code: $state_code
-                        status: for_sale
+                        status: {status}
+                        {filters}
                     }}
-                    limit: 200
+                    limit: {self.DEFAULT_PAGE_SIZE}
                     offset: $offset
                 ) {{
                     total
-                    results {SEARCH_HOMES_DATA}
+                    results {fields}
                 }}
             }}
             """
+
+    @staticmethod
+    def _search_status(listing_type: Union[str, ListingType, None]) -> str:
+        """home_search status for a listing type, defaulting to for_sale"""
+        if isinstance(listing_type, ListingType):
+            listing_type = listing_type.value
+        status = (listing_type or "for_sale").lower()
+        return status if status in ("for_sale", "for_rent", "sold", "pending") else "for_sale"
     
+    def _property_parser(self, mls_only: bool = False, extra_property_data: bool = False,
+                         exclude_pending: bool = False, listing_type: ListingType = ListingType.FOR_SALE,
+                         rows: bool = False) -> PropertyParser:
+        """Picklable raw home -> Property step for a search, built with this scraper's model builder"""
+        return PropertyParser(mls_only=mls_only, extra_property_data=extra_property_data,
+                              exclude_pending=exclude_pending, listing_type=listing_type,
+                              builder=self.model_builder, rows=rows)
+
     def _process_property_with_processors(self, prop: Dict[str, Any], 
                                         mls_only: bool = False, 
                                         extra_property_data: bool = False,
                                         exclude_pending: bool = False,
                                         listing_type: ListingType = ListingType.FOR_SALE) -> Union[Property, None]:
-        """Process property using the new processors for comprehensive data extraction"""
-        try:
-            return process_property(
-                prop,
-                mls_only=mls_only,
-                extra_property_data=extra_property_data,
-                exclude_pending=exclude_pending,
-                listing_type=listing_type,
-                get_key_func=get_key,
-                process_extra_property_details_func=process_extra_property_details
-            )
-        except Exception as e:
-            logger.error(f"Error processing property with processors: {e}")
-            return None
-
-    def _format_property_for_dreamery(self, prop: Dict[str, Any]) -> Property:
-        """Format property for Dreamery frontend using new parsers"""
-        try:
-            # Parse address using the new parser
-            address = parse_address(prop, "general_search")
-            
-            # Parse description using the new parser
-            description = parse_description(prop)
-            
-            # Parse other data using parsers
-            open_houses = parse_open_houses(prop.get('open_houses'))
-            units = parse_units(prop.get('units'))
-            tax_record = parse_tax_record(prop.get('tax_record'))
-            estimates = parse_estimates(prop.get('estimates'))
-            neighborhoods = parse_neighborhoods(prop)
-            days_on_mls = calculate_days_on_mls(prop)
-            
-            # Convert dates to ISO strings for JSON serialization
-            last_sold_date = None
-            if prop.get('last_sold_date'):
-                try:
-                    last_sold_date = datetime.strptime(prop['last_sold_date'], "%Y-%m-%d").isoformat()
-                except (ValueError, TypeError):
-                    last_sold_date = None
-            
-            list_date = None
-            if prop.get('list_date'):
-                try:
-                    list_date = datetime.strptime(prop['list_date'], "%Y-%m-%d").isoformat()
-                except (ValueError, TypeError):
-                    list_date = None
-            
-            # Create proper Property model with complex nested structures
-            return Property(
-                property_url=prop.get('href', 'https://realtor.com'),
-                property_id=prop.get('property_id', ''),
-                listing_id=prop.get('listing_id'),
-                permalink=prop.get('permalink'),
-                mls=prop.get('mls'),
-                mls_id=prop.get('mls_id'),
-                status=prop.get('status'),
-                address=address,
-                list_price=prop.get('list_price'),
-                list_price_min=prop.get('list_price_min'),
-                list_price_max=prop.get('list_price_max'),
-                list_date=list_date,
-                pending_date=prop.get('pending_date'),
-                last_sold_date=last_sold_date,
-                prc_sqft=prop.get('prc_sqft'),
-                new_construction=prop.get('new_construction'),
-                hoa_fee=prop.get('hoa_fee'),
-                days_on_mls=days_on_mls,
-                description=description,
-                tags=prop.get('tags', []),
-                details=prop.get('details', []),
-                latitude=prop.get('coordinates', {}).get('lat') if prop.get('coordinates') else None,
-                longitude=prop.get('coordinates', {}).get('lng') if prop.get('coordinates') else None,
-                neighborhoods=neighborhoods,
-                county=prop.get('county'),
-                fips_code=prop.get('fips_code'),
-                nearby_schools=prop.get('nearby_schools', []),
-                assessed_value=prop.get('assessed_value'),
-                estimated_value=prop.get('estimated_value'),
-                tax=prop.get('tax'),
-                tax_history=prop.get('tax_history', []),
-                mls_status=prop.get('mls_status'),
-                last_sold_price=prop.get('last_sold_price'),
-                open_houses=open_houses,
-                pet_policy=prop.get('pet_policy'),
-                units=units,
-                monthly_fees=prop.get('monthly_fees'),
-                one_time_fees=prop.get('one_time_fees', []),
-                parking=prop.get('parking'),
-                terms=prop.get('terms', []),
-                popularity=prop.get('popularity'),
-                tax_record=tax_record,
-                parcel_info=prop.get('parcel_info'),
-                current_estimates=prop.get('current_estimates', []),
-                estimates=estimates,
-                photos=prop.get('photos', []),
-                flags=prop.get('flags'),
-                advertisers=Advertisers(
-                    agent=Agent(
-                        name=prop.get('agent', {}).get('name') if prop.get('agent') else None,
-                        uuid=prop.get('agent', {}).get('uuid') if prop.get('agent') else None,
-                        mls_set=prop.get('agent', {}).get('mls_set') if prop.get('agent') else None,
-                        nrds_id=prop.get('agent', {}).get('nrds_id') if prop.get('agent') else None,
-                        email=prop.get('agent', {}).get('email') if prop.get('agent') else None,
-                        phones=prop.get('agent', {}).get('phones', []) if prop.get('agent') else None,
-                        href=prop.get('agent', {}).get('href') if prop.get('agent') else None,
-                        state_license=prop.get('agent', {}).get('state_license') if prop.get('agent') else None
-                    ) if prop.get('agent') else None,
-                    broker=Broker(
-                        name=prop.get('broker', {}).get('name') if prop.get('broker') else None,
-                        uuid=prop.get('broker', {}).get('uuid') if prop.get('broker') else None
-                    ) if prop.get('broker') else None,
-                    builder=Builder(
-                        name=prop.get('builder', {}).get('name') if prop.get('builder') else None,
-                        uuid=prop.get('builder', {}).get('uuid') if prop.get('builder') else None
-                    ) if prop.get('builder') else None,
-                    office=Office(
-                        name=prop.get('office', {}).get('name') if prop.get('office') else None,
-                        uuid=prop.get('office', {}).get('uuid') if prop.get('office') else None,
-                        mls_set=prop.get('office', {}).get('mls_set') if prop.get('office') else None,
-                        email=prop.get('office', {}).get('email') if prop.get('office') else None,
-                        phones=prop.get('office', {}).get('phones', []) if prop.get('office') else None,
-                        href=prop.get('office', {}).get('href') if prop.get('office') else None
-                    ) if prop.get('office') else None
-                ) if any([prop.get('agent'), prop.get('broker'), prop.get('builder'), prop.get('office')]) else None
-            )
-        except Exception as e:
-            logger.error(f"Error formatting property: {e}")
-            # Return a basic Property object if parsing fails
-            return Property(
-                property_url=prop.get('href', 'https://realtor.com'),
-                property_id=prop.get('property_id', ''),
-                listing_id=prop.get('listing_id'),
-                permalink=prop.get('permalink'),
-                mls=prop.get('mls'),
-                mls_id=prop.get('mls_id'),
-                status=prop.get('status'),
-                address=Address(
-                    full_line=prop.get('address', {}).get('line', '') if prop.get('address') else '',
-                    city=prop.get('address', {}).get('city') if prop.get('address') else None,
-                    state=prop.get('address', {}).get('state') if prop.get('address') else None,
-                    zip=prop.get('address', {}).get('postal_code') if prop.get('address') else None
-                ) if prop.get('address') else None,
-                list_price=prop.get('list_price'),
-                list_price_min=prop.get('list_price_min'),
-                list_price_max=prop.get('list_price_max'),
-                list_date=prop.get('list_date'),
-                pending_date=prop.get('pending_date'),
-                last_sold_date=prop.get('last_sold_date'),
-                prc_sqft=prop.get('prc_sqft'),
-                new_construction=prop.get('new_construction'),
-                hoa_fee=prop.get('hoa_fee'),
-                days_on_mls=prop.get('days_on_mls'),
-                description=Description(
-                    beds=prop.get('beds'),
-                    baths_full=prop.get('baths'),
-                    sqft=prop.get('sqft'),
-                    lot_sqft=prop.get('lot_sqft'),
-                    year_built=prop.get('year_built'),
-                    garage=prop.get('garage'),
-                    text=prop.get('description'),
-                    type=prop.get('property_type')
-                ) if any([prop.get('beds'), prop.get('baths'), prop.get('sqft')]) else None,
-                tags=prop.get('tags', []),
-                details=prop.get('details', []),
-                latitude=prop.get('coordinates', {}).get('lat') if prop.get('coordinates') else None,
-                longitude=prop.get('coordinates', {}).get('lng') if prop.get('coordinates') else None,
-                neighborhoods=prop.get('neighborhoods'),
-                county=prop.get('county'),
-                fips_code=prop.get('fips_code'),
-                nearby_schools=prop.get('nearby_schools', []),
-                assessed_value=prop.get('assessed_value'),
-                estimated_value=prop.get('estimated_value'),
-                tax=prop.get('tax'),
-                tax_history=prop.get('tax_history', []),
-                mls_status=prop.get('mls_status'),
-                last_sold_price=prop.get('last_sold_price'),
-                open_houses=prop.get('open_houses', []),
-                pet_policy=prop.get('pet_policy'),
-                units=prop.get('units', []),
-                monthly_fees=prop.get('monthly_fees'),
-                one_time_fees=prop.get('one_time_fees', []),
-                parking=prop.get('parking'),
-                terms=prop.get('terms', []),
-                popularity=prop.get('popularity'),
-                tax_record=prop.get('tax_record'),
-                parcel_info=prop.get('parcel_info'),
-                current_estimates=prop.get('current_estimates', []),
-                estimates=prop.get('estimates'),
-                photos=prop.get('photos', []),
-                flags=prop.get('flags'),
-                advertisers=Advertisers(
-                    agent=Agent(
-                        name=prop.get('agent', {}).get('name') if prop.get('agent') else None,
-                        uuid=prop.get('agent', {}).get('uuid') if prop.get('agent') else None,
-                        mls_set=prop.get('agent', {}).get('mls_set') if prop.get('agent') else None,
-                        nrds_id=prop.get('agent', {}).get('nrds_id') if prop.get('agent') else None,
-                        email=prop.get('agent', {}).get('email') if prop.get('agent') else None,
-                        phones=prop.get('agent', {}).get('phones', []) if prop.get('agent') else None,
-                        href=prop.get('agent', {}).get('href') if prop.get('agent') else None,
-                        state_license=prop.get('agent', {}).get('state_license') if prop.get('agent') else None
-                    ) if prop.get('agent') else None,
-                    office=Office(
-                        name=prop.get('office', {}).get('name') if prop.get('office') else None,
-                        uuid=prop.get('office', {}).get('uuid') if prop.get('office') else None,
-                        mls_set=prop.get('office', {}).get('mls_set') if prop.get('office') else None,
-                        email=prop.get('office', {}).get('email') if prop.get('office') else None,
-                        phones=prop.get('office', {}).get('phones', []) if prop.get('office') else None,
-                        href=prop.get('office', {}).get('href') if prop.get('office') else None
-                    ) if prop.get('office') else None
-                ) if any([prop.get('agent'), prop.get('office')]) else None
-            )
+        """Build the final Property for a raw GraphQL home; None if it is filtered out or malformed"""
+        return self._property_parser(mls_only, extra_property_data, exclude_pending, listing_type)(prop)
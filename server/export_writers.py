@@ -0,0 +1,329 @@
+"""
+Streaming file writers for large exports, with resumable checkpoints
+"""
+
+import csv
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
+from models import Property
+from utils import ordered_properties, property_row
+
+logger = logging.getLogger(__name__)
+
+# Rows per write, and the longest rows wait before being written when pages arrive slowly
+EXPORT_CHUNK_SIZE = 500
+EXPORT_FLUSH_SECONDS = 5.0
+
+_EMPTY_TEXT = ("", "None")
+
+
+def _is_empty(value) -> bool:
+    return value is None or (type(value) is str and value in _EMPTY_TEXT)
+
+
+def json_record(row: Dict[str, Any], columns: Sequence[str] = ordered_properties) -> Dict[str, Any]:
+    """A property_row limited to ``columns``, with empty values as None, ready for json.dumps"""
+    return {column: None if _is_empty(row.get(column)) else row.get(column) for column in columns}
+
+
+class ExportWriter(ABC):
+    """Writes property_row rows to one file a chunk at a time.
+
+    Resumable writers append to a file that can be cut back to any offset
+    returned by ``flush``; the others produce their file on ``close``.
+    """
+    extension = ""
+    resumable = False
+
+    def __init__(self, path: str, columns: Sequence[str], offset: Optional[int] = None):
+        self.path = path
+        self.columns = list(columns)
+
+    @abstractmethod
+    def write_rows(self, rows: List[Dict[str, Any]]):
+        """Write one chunk of rows"""
+
+    def flush(self) -> Optional[int]:
+        """Make the rows written so far durable; the file size for resumable writers"""
+        return None
+
+    def close(self):
+        pass
+
+    @classmethod
+    def written_ids(cls, path: str) -> Set[str]:
+        """property_ids already in a file this writer produced"""
+        return set()
+
+
+class _TextExportWriter(ExportWriter):
+    resumable = True
+
+    def __init__(self, path: str, columns: Sequence[str], offset: Optional[int] = None):
+        super().__init__(path, columns)
+        if offset is None:
+            self.file = open(path, "w", newline="", encoding="utf-8")
+        else:
+            # Anything written after the checkpoint was not recorded by it
+            with open(path, "r+b") as existing:
+                existing.truncate(offset)
+            self.file = open(path, "a", newline="", encoding="utf-8")
+        self.start(fresh=offset is None)
+
+    def start(self, fresh: bool):
+        pass
+
+    def flush(self) -> int:
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class CsvExportWriter(_TextExportWriter):
+    """CSV with a header row; nested values (tax history, phones) are written as JSON"""
+    extension = "csv"
+
+    def start(self, fresh: bool):
+        self.writer = csv.writer(self.file)
+        if fresh:
+            self.writer.writerow(self.columns)
+
+    def write_rows(self, rows: List[Dict[str, Any]]):
+        self.writer.writerows([[self.cell(row.get(column)) for column in self.columns] for row in rows])
+
+    @staticmethod
+    def cell(value):
+        if _is_empty(value):
+            return ""
+        if isinstance(value, (list, dict)):
+            return json.dumps(value, default=str)
+        return value
+
+    @classmethod
+    def written_ids(cls, path: str) -> Set[str]:
+        with open(path, newline="", encoding="utf-8") as f:
+            return {row["property_id"] for row in csv.DictReader(f) if row.get("property_id")}
+
+
+class NdjsonExportWriter(_TextExportWriter):
+    """One JSON object per line"""
+    extension = "ndjson"
+
+    def write_rows(self, rows: List[Dict[str, Any]]):
+        self.file.writelines(json.dumps(json_record(row, self.columns), default=str) + "\n" for row in rows)
+
+    @classmethod
+    def written_ids(cls, path: str) -> Set[str]:
+        with open(path, encoding="utf-8") as f:
+            return {json.loads(line).get("property_id") for line in f if line.strip()}
+
+
+class JsonExportWriter(ExportWriter):
+    """A JSON array of records, written element by element; closed with ``]`` on ``close``"""
+    extension = "json"
+
+    def __init__(self, path: str, columns: Sequence[str], offset: Optional[int] = None):
+        super().__init__(path, columns)
+        self.file = open(path, "w", encoding="utf-8")
+        self.file.write("[")
+        self.empty = True
+
+    def write_rows(self, rows: List[Dict[str, Any]]):
+        for row in rows:
+            self.file.write(("\n" if self.empty else ",\n") + json.dumps(json_record(row, self.columns), default=str))
+            self.empty = False
+
+    def flush(self) -> Optional[int]:
+        self.file.flush()
+        return None
+
+    def close(self):
+        self.file.write("]\n" if self.empty else "\n]\n")
+        self.file.close()
+
+
+class ExcelExportWriter(ExportWriter):
+    """openpyxl write-only workbook: rows go to a temporary sheet file rather than staying in memory"""
+    extension = "xlsx"
+
+    def __init__(self, path: str, columns: Sequence[str], offset: Optional[int] = None):
+        from openpyxl import Workbook
+        from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+        super().__init__(path, columns)
+        self._illegal = ILLEGAL_CHARACTERS_RE
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet()
+        self.sheet.append(self.columns)
+
+    def write_rows(self, rows: List[Dict[str, Any]]):
+        for row in rows:
+            self.sheet.append([self.cell(row.get(column)) for column in self.columns])
+
+    def cell(self, value):
+        if _is_empty(value):
+            return None
+        if isinstance(value, (list, dict)):
+            return json.dumps(value, default=str)
+        if isinstance(value, str):
+            return self._illegal.sub("", value)
+        return value
+
+    def close(self):
+        self.workbook.save(self.path)
+
+
+class ParquetExportWriter(ExportWriter):
+    """One Parquet row group per chunk, with the fixed arrow_output.property_schema"""
+    extension = "parquet"
+
+    def __init__(self, path: str, columns: Sequence[str], offset: Optional[int] = None):
+        from arrow_output import pq, property_schema
+
+        super().__init__(path, columns)
+        self.writer = pq.ParquetWriter(path, property_schema(self.columns), compression="zstd")
+
+    def write_rows(self, rows: List[Dict[str, Any]]):
+        from arrow_output import property_table
+
+        self.writer.write_table(property_table(rows, self.columns))
+
+    def close(self):
+        self.writer.close()
+
+
+EXPORT_WRITERS = {
+    "csv": CsvExportWriter,
+    "ndjson": NdjsonExportWriter,
+    "json": JsonExportWriter,
+    "excel": ExcelExportWriter,
+    "parquet": ParquetExportWriter,
+}
+
+
+@dataclass
+class ExportCheckpoint:
+    """How far an export got: rows and bytes durably written, for the query that produced them"""
+    path: str
+    output: str
+    output_format: str
+    query: Dict[str, Any] = field(default_factory=dict)
+    rows: int = 0
+    offset: Optional[int] = None
+
+    @classmethod
+    def load(cls, path: str) -> Optional["ExportCheckpoint"]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        data["path"] = path
+        return cls(**data)
+
+    def save(self):
+        data = asdict(self)
+        del data["path"]
+        # Written aside and renamed so a crash mid-save leaves the previous checkpoint
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temporary, self.path)
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+@dataclass
+class ExportStats:
+    """Rows written by this run (``total`` includes the ones a resumed export already had)"""
+    rows: int = 0
+    total: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def stream_export(properties: Iterable[Property], path: str, output_format: str,
+                  columns: Sequence[str] = ordered_properties,
+                  checkpoint_path: Optional[str] = None, resume: bool = False,
+                  query: Optional[Dict[str, Any]] = None,
+                  chunk_size: int = EXPORT_CHUNK_SIZE, flush_seconds: float = EXPORT_FLUSH_SECONDS,
+                  progress: Optional[Callable[[ExportStats], None]] = None) -> ExportStats:
+    """Write properties to ``path`` as they arrive, a chunk at a time.
+
+    With a ``checkpoint_path`` (csv and ndjson only) the rows and bytes written
+    are recorded after every chunk; ``resume=True`` cuts the file back to the
+    checkpoint and appends, skipping listings the file already holds. The
+    checkpoint is removed once the export completes.
+    """
+    writer_cls = EXPORT_WRITERS[output_format]
+    query = query or {}
+    checkpoint = None
+    if checkpoint_path:
+        if not writer_cls.resumable:
+            raise ValueError(f"{output_format} exports cannot be checkpointed; use csv or ndjson")
+        checkpoint = ExportCheckpoint.load(checkpoint_path) if resume else None
+        if checkpoint and (checkpoint.output != path or checkpoint.output_format != output_format
+                           or checkpoint.query != query):
+            raise ValueError(f"Checkpoint {checkpoint_path} is for a different export")
+        if resume and checkpoint is None:
+            logger.warning(f"No checkpoint at {checkpoint_path}, starting {path} from scratch")
+        checkpoint = checkpoint or ExportCheckpoint(checkpoint_path, path, output_format, query)
+
+    offset = checkpoint.offset if checkpoint else None
+    writer = writer_cls(path, columns, offset=offset)
+    done = writer_cls.written_ids(path) if offset is not None else set()
+    stats = ExportStats(total=checkpoint.rows if checkpoint else 0)
+    started = last_flush = time.perf_counter()
+    chunk = []
+
+    def write_chunk():
+        nonlocal last_flush
+        writer.write_rows(chunk)
+        offset = writer.flush()
+        stats.rows += len(chunk)
+        stats.total += len(chunk)
+        stats.seconds = time.perf_counter() - started
+        chunk.clear()
+        last_flush = time.perf_counter()
+        if checkpoint:
+            checkpoint.rows, checkpoint.offset = stats.total, offset
+            checkpoint.save()
+        if progress:
+            progress(stats)
+
+    try:
+        for prop in properties:
+            row = property_row(prop)
+            if row["property_id"] in done:
+                stats.skipped += 1
+                continue
+            chunk.append(row)
+            if len(chunk) >= chunk_size or time.perf_counter() - last_flush >= flush_seconds:
+                write_chunk()
+        if chunk:
+            write_chunk()
+    finally:
+        writer.close()
+
+    stats.seconds = time.perf_counter() - started
+    if checkpoint:
+        checkpoint.remove()
+    logger.info(f"Exported {stats.rows} rows to {path} "
+                f"({stats.rows_per_second:.0f} rows/s, {stats.skipped} already written)")
+    return stats
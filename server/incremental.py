@@ -0,0 +1,148 @@
+"""
+Watermark store and change detection for incremental (delta) scrapes
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from location_cache import normalize_location
+from models import ListingType, Property
+
+WATERMARK_FIELDS = {
+    "sold": "last_sold_date",
+    "pending": "pending_date",
+}
+
+# Fields whose change makes a known listing an update
+CHANGE_FIELDS = (
+    "status", "mls_status", "list_price", "list_price_min", "list_price_max", "list_date",
+    "pending_date", "last_sold_date", "last_sold_price",
+)
+
+
+def _listing_type_value(listing_type: Union[str, ListingType]) -> str:
+    if isinstance(listing_type, ListingType):
+        listing_type = listing_type.value
+    return listing_type.lower()
+
+
+def watermark_field(listing_type: Union[str, ListingType]) -> str:
+    """Property date that advances for new results of this listing type"""
+    return WATERMARK_FIELDS.get(_listing_type_value(listing_type), "list_date")
+
+
+def make_query_key(location: str, listing_type: Union[str, ListingType], **filters: Any) -> str:
+    """Stable identifier for a search so each query keeps its own watermark"""
+    canonical = json.dumps(
+        {"location": normalize_location(location), "listing_type": _listing_type_value(listing_type),
+         **{name: value for name, value in filters.items() if value not in (None, False, [])}},
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def fingerprint(prop: Property) -> str:
+    """Hash of the fields that change over a listing's life"""
+    values = {name: getattr(prop, name, None) for name in CHANGE_FIELDS}
+    return hashlib.sha1(json.dumps(values, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class PropertyChanges:
+    """Result of an incremental scrape"""
+    inserts: List[Any] = field(default_factory=list)
+    updates: List[Any] = field(default_factory=list)
+    removals: List[str] = field(default_factory=list)
+    watermark: Optional[date] = None
+    full_refresh: bool = False
+
+
+class WatermarkStore:
+    """SQLite record of each query's watermark and the listings it has seen"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS watermarks "
+            "(query_key TEXT PRIMARY KEY, watermark TEXT, updated_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS known_listings "
+            "(query_key TEXT NOT NULL, property_id TEXT NOT NULL, fingerprint TEXT NOT NULL, "
+            "PRIMARY KEY (query_key, property_id))"
+        )
+        self._db.commit()
+
+    def load(self, query_key: str) -> Tuple[Optional[date], Dict[str, str]]:
+        """Return (watermark, {property_id: fingerprint}); the watermark is None before the first run"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT watermark FROM watermarks WHERE query_key = ?", (query_key,)
+            ).fetchone()
+            known = dict(self._db.execute(
+                "SELECT property_id, fingerprint FROM known_listings WHERE query_key = ?", (query_key,)
+            ).fetchall())
+        watermark = date.fromisoformat(row[0]) if row and row[0] else None
+        return watermark, known
+
+    def save(self, query_key: str, watermark: Optional[date], seen: Dict[str, str],
+             removed: Iterable[str] = ()) -> None:
+        """Advance the watermark and upsert/delete known listings in one transaction"""
+        with self._lock:
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO watermarks (query_key, watermark, updated_at) VALUES (?, ?, ?)",
+                    (query_key, watermark.isoformat() if watermark else None, time.time()),
+                )
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO known_listings (query_key, property_id, fingerprint) VALUES (?, ?, ?)",
+                    [(query_key, property_id, digest) for property_id, digest in seen.items()],
+                )
+                self._db.executemany(
+                    "DELETE FROM known_listings WHERE query_key = ? AND property_id = ?",
+                    [(query_key, property_id) for property_id in removed],
+                )
+
+
+def detect_changes(properties: List[Property], known: Dict[str, str], listing_type: Union[str, ListingType],
+                   watermark: Optional[date]) -> Tuple[PropertyChanges, Dict[str, str]]:
+    """Split fetched properties into inserts and updates and compute the next watermark.
+
+    Returns the changes plus the {property_id: fingerprint} map of every
+    fetched property, to be saved back to the store.
+    """
+    changes = PropertyChanges(watermark=watermark, full_refresh=watermark is None)
+    date_name = watermark_field(listing_type)
+    seen = {}
+
+    for prop in properties:
+        digest = fingerprint(prop)
+        seen[prop.property_id] = digest
+        previous = known.get(prop.property_id)
+        if previous is None:
+            changes.inserts.append(prop)
+        elif previous != digest:
+            changes.updates.append(prop)
+
+        value = getattr(prop, date_name, None)
+        if isinstance(value, datetime):
+            value = value.date()
+        if isinstance(value, date) and (changes.watermark is None or value > changes.watermark):
+            changes.watermark = value
+
+    return changes, seen
+
+
+def changes_to_records(changes: PropertyChanges) -> List[Dict[str, Any]]:
+    """Flatten changes into dicts tagged with change_type, for JSON/CSV export"""
+    records = [{**prop.model_dump(), "change_type": "insert"} for prop in changes.inserts]
+    records += [{**prop.model_dump(), "change_type": "update"} for prop in changes.updates]
+    records += [{"property_id": property_id, "change_type": "removed"} for property_id in changes.removals]
+    return records
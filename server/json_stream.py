@@ -0,0 +1,122 @@
+"""
+Incremental decoding of home_search / property_search responses
+"""
+
+import json
+import logging
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import ijson
+except ImportError:  # optional: responses are decoded whole without it
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+
+class _TeeReader:
+    """File-like wrapper keeping a copy of every chunk read from ``raw``"""
+
+    def __init__(self, raw: Any):
+        self.raw = raw
+        self.chunks: List[bytes] = []
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.raw.read(size)
+        self.chunks.append(chunk)
+        return chunk
+
+
+class SearchResultStream:
+    """The homes of one search response, yielded one at a time.
+
+    With ijson installed the body is parsed straight off the socket and each
+    home is built only when the consumer asks for it, so a 200-result page
+    never has to be resident at once. ``total`` is filled in as soon as it has
+    been read, which is before the results since every search query selects
+    ``total`` first.
+    """
+
+    def __init__(self, results: Iterable[Dict[str, Any]], total: int = 0):
+        self._results = iter(results)
+        self._decoder = None
+        self._response = None
+        self.total = total
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self._results
+
+    def read_total(self) -> int:
+        """Decode up to the first home so ``total`` is known before any result is consumed"""
+        first = next(self._results, None)
+        if first is not None:
+            self._results = chain([first], self._results)
+        return self.total
+
+    def close(self) -> None:
+        """Release the underlying connection, even if the results were not read to the end"""
+        if self._decoder is not None:
+            self._decoder.close()
+        if self._response is not None:
+            self._response.close()
+
+    @classmethod
+    def from_response(cls, response: Any, search_key: str,
+                      on_complete: Optional[Callable[[bytes], None]] = None) -> "SearchResultStream":
+        """Stream the results of a response requested with ``stream=True``.
+
+        ``on_complete`` gets the raw body once it has been decoded to the end
+        without GraphQL errors; a page closed early is never passed on.
+        """
+        raw = getattr(response, "raw", None)
+        if ijson is None or raw is None:
+            payload = response.json()
+            if on_complete is not None and payload and payload.get("data") and not payload.get("errors"):
+                on_complete(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+            return cls.from_payload(payload, search_key)
+
+        stream = cls(())
+        stream._response = response
+        stream._decoder = stream._results = stream._decode(response, raw, search_key, on_complete)
+        return stream
+
+    @classmethod
+    def from_payload(cls, response_json: Optional[Dict[str, Any]], search_key: str) -> "SearchResultStream":
+        """Wrap an already-decoded response, tolerating empty payloads"""
+        data = (response_json or {}).get("data") or {}
+        search_data = data.get(search_key) or {}
+        return cls(search_data.get("results") or [], search_data.get("total") or 0)
+
+    def _decode(self, response: Any, raw: Any, search_key: str,
+                on_complete: Optional[Callable[[bytes], None]] = None) -> Iterator[Dict[str, Any]]:
+        total_prefix = f"data.{search_key}.total"
+        item_prefix = f"data.{search_key}.results.item"
+        if hasattr(raw, "decode_content"):
+            raw.decode_content = True
+        if on_complete is not None:
+            raw = _TeeReader(raw)
+
+        builder = None
+        has_total = has_errors = False
+        try:
+            for prefix, event, value in ijson.parse(raw, use_float=True):
+                if builder is not None:
+                    builder.event(event, value)
+                    if prefix == item_prefix and event == "end_map":
+                        home, builder = builder.value, None
+                        yield home
+                elif prefix == item_prefix and event == "start_map":
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                elif prefix == total_prefix and event == "number":
+                    self.total, has_total = int(value), True
+                elif prefix == "errors" and event == "start_array":
+                    has_errors = True
+            if on_complete is not None and has_total and not has_errors:
+                try:
+                    on_complete(b"".join(raw.chunks))
+                except Exception as e:
+                    logger.error(f"Could not hand on the decoded response: {e}")
+        finally:
+            response.close()
@@ -0,0 +1,314 @@
+"""
+Compact listing records for bulk pipelines
+"""
+
+import sys
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import numpy as np
+from model_builder import ModelBuilder, get_model_builder
+from models import Property, PropertyType
+
+#: Record column -> path of the Property field it holds; names follow utils.ordered_properties
+COLUMN_PATHS: Dict[str, Tuple[str, ...]] = {
+    "property_url": ("property_url",),
+    "property_id": ("property_id",),
+    "listing_id": ("listing_id",),
+    "permalink": ("permalink",),
+    "mls": ("mls",),
+    "mls_id": ("mls_id",),
+    "status": ("status",),
+    "mls_status": ("mls_status",),
+    "text": ("description", "text"),
+    "style": ("description", "style"),
+    "full_street_line": ("address", "full_line"),
+    "street": ("address", "street"),
+    "unit": ("address", "unit"),
+    "city": ("address", "city"),
+    "state": ("address", "state"),
+    "zip_code": ("address", "zip"),
+    "street_direction": ("address", "street_direction"),
+    "street_number": ("address", "street_number"),
+    "street_name": ("address", "street_name"),
+    "street_suffix": ("address", "street_suffix"),
+    "beds": ("description", "beds"),
+    "full_baths": ("description", "baths_full"),
+    "half_baths": ("description", "baths_half"),
+    "sqft": ("description", "sqft"),
+    "year_built": ("description", "year_built"),
+    "days_on_mls": ("days_on_mls",),
+    "list_price": ("list_price",),
+    "list_price_min": ("list_price_min",),
+    "list_price_max": ("list_price_max",),
+    "list_date": ("list_date",),
+    "pending_date": ("pending_date",),
+    "sold_price": ("description", "sold_price"),
+    "last_sold_date": ("last_sold_date",),
+    "last_sold_price": ("last_sold_price",),
+    "assessed_value": ("assessed_value",),
+    "estimated_value": ("estimated_value",),
+    "tax": ("tax",),
+    "new_construction": ("new_construction",),
+    "lot_sqft": ("description", "lot_sqft"),
+    "price_per_sqft": ("prc_sqft",),
+    "latitude": ("latitude",),
+    "longitude": ("longitude",),
+    "neighborhoods": ("neighborhoods",),
+    "county": ("county",),
+    "fips_code": ("fips_code",),
+    "stories": ("description", "stories"),
+    "hoa_fee": ("hoa_fee",),
+    "parking_garage": ("description", "garage"),
+    "agent_id": ("advertisers", "agent", "uuid"),
+    "agent_name": ("advertisers", "agent", "name"),
+    "broker_id": ("advertisers", "broker", "uuid"),
+    "broker_name": ("advertisers", "broker", "name"),
+    "office_id": ("advertisers", "office", "uuid"),
+    "office_name": ("advertisers", "office", "name"),
+    "primary_photo": ("description", "primary_photo"),
+}
+
+#: Low-cardinality columns whose strings are shared between records
+INTERNED_COLUMNS = frozenset([
+    "mls", "status", "mls_status", "city", "state", "zip_code", "neighborhoods", "county", "fips_code",
+    "agent_name", "broker_name", "office_name",
+])
+
+#: Columns batched into typed arrays, with the array dtype
+TYPED_COLUMNS: Dict[str, str] = {
+    **{name: "int64" for name in (
+        "beds", "full_baths", "half_baths", "sqft", "year_built", "days_on_mls", "list_price", "list_price_min",
+        "list_price_max", "sold_price", "last_sold_price", "assessed_value", "estimated_value", "tax", "lot_sqft",
+        "price_per_sqft", "stories", "hoa_fee")},
+    **{name: "float64" for name in ("latitude", "longitude", "parking_garage")},
+    "new_construction": "bool",
+    **{name: "datetime64[us]" for name in ("list_date", "pending_date", "last_sold_date")},
+}
+
+# Nested dicts the columns are taken out of, deepest first so emptied parents are pruned after their children
+_NESTED_PATHS = sorted({path[:depth] for path in COLUMN_PATHS.values() for depth in range(1, len(path))},
+                       key=len, reverse=True)
+
+
+@dataclass(slots=True)
+class ListingRecord:
+    """One listing as flat scalar columns, a fraction of the size of a Property.
+
+    ``extra`` holds everything else the Property carried (photos, tax history,
+    open houses, the rest of the advertisers, ...) as plain dicts, so
+    ``from_property(prop).to_property()`` gives back an equal Property. Records
+    built with ``keep_extra=False`` drop it and keep only the columns.
+    """
+    property_url: str
+    property_id: str
+    listing_id: Optional[str] = None
+    permalink: Optional[str] = None
+    mls: Optional[str] = None
+    mls_id: Optional[str] = None
+    status: Optional[str] = None
+    mls_status: Optional[str] = None
+    text: Optional[str] = None
+    style: Optional[PropertyType] = None
+    full_street_line: Optional[str] = None
+    street: Optional[str] = None
+    unit: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    zip_code: Optional[str] = None
+    street_direction: Optional[str] = None
+    street_number: Optional[str] = None
+    street_name: Optional[str] = None
+    street_suffix: Optional[str] = None
+    beds: Optional[int] = None
+    full_baths: Optional[int] = None
+    half_baths: Optional[int] = None
+    sqft: Optional[int] = None
+    year_built: Optional[int] = None
+    days_on_mls: Optional[int] = None
+    list_price: Optional[int] = None
+    list_price_min: Optional[int] = None
+    list_price_max: Optional[int] = None
+    list_date: Optional[datetime] = None
+    pending_date: Optional[datetime] = None
+    sold_price: Optional[int] = None
+    last_sold_date: Optional[datetime] = None
+    last_sold_price: Optional[int] = None
+    assessed_value: Optional[int] = None
+    estimated_value: Optional[int] = None
+    tax: Optional[int] = None
+    new_construction: Optional[bool] = None
+    lot_sqft: Optional[int] = None
+    price_per_sqft: Optional[int] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    neighborhoods: Optional[str] = None
+    county: Optional[str] = None
+    fips_code: Optional[str] = None
+    stories: Optional[int] = None
+    hoa_fee: Optional[int] = None
+    parking_garage: Optional[float] = None
+    agent_id: Optional[str] = None
+    agent_name: Optional[str] = None
+    broker_id: Optional[str] = None
+    broker_name: Optional[str] = None
+    office_id: Optional[str] = None
+    office_name: Optional[str] = None
+    primary_photo: Optional[str] = None
+    extra: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_property(cls, prop: Property, keep_extra: bool = True) -> "ListingRecord":
+        data = prop.model_dump()
+        if isinstance(data.get("address"), dict):
+            data["address"].pop("formatted_address", None)
+
+        columns = {}
+        taken = set()
+        for name, path in COLUMN_PATHS.items():
+            value = _take(data, path)
+            if value is None:
+                continue
+            if name in INTERNED_COLUMNS and type(value) is str:
+                value = sys.intern(value)
+            elif name in ("property_url", "primary_photo"):
+                value = str(value)
+            columns[name] = value
+            taken.update(path[:depth] for depth in range(1, len(path)))
+
+        if not keep_extra:
+            return cls(**columns)
+
+        for path in _NESTED_PATHS:
+            parent = _get(data, path[:-1])
+            nested = parent.get(path[-1]) if isinstance(parent, dict) else None
+            if isinstance(nested, dict):
+                remainder = {key: value for key, value in nested.items() if value is not None}
+                # A nested model present only for the columns taken out of it is rebuilt from them
+                if remainder or path not in taken:
+                    parent[path[-1]] = remainder
+                else:
+                    del parent[path[-1]]
+        extra = {key: value for key, value in data.items() if value is not None}
+        return cls(**columns, extra=extra or None)
+
+    def to_property(self, builder: Optional[ModelBuilder] = None) -> Property:
+        """Property holding the same data (validated unless ``builder`` is trusted)"""
+        data = dict(self.extra) if self.extra else {}
+        copied = set()
+        for name, path in COLUMN_PATHS.items():
+            value = getattr(self, name)
+            if value is None:
+                continue
+            parent = data
+            for depth, key in enumerate(path[:-1], 1):
+                child = parent.get(key)
+                if path[:depth] not in copied:
+                    # Copy rather than fill in the dicts shared with ``extra``
+                    child = dict(child) if child else {}
+                    parent[key] = child
+                    copied.add(path[:depth])
+                parent = child
+            parent[path[-1]] = value
+        return (builder or get_model_builder()).build(Property, data)
+
+
+def _get(data: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _take(data: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    parent = _get(data, path[:-1])
+    return parent.pop(path[-1], None) if isinstance(parent, dict) else None
+
+
+COLUMNS = tuple(field.name for field in fields(ListingRecord) if field.name != "extra")
+
+
+class ListingBatch:
+    """Column-oriented batch of listing records.
+
+    Numeric, boolean and date columns are held in typed numpy arrays (with a
+    missing-value mask for the numeric ones), strings in lists sharing the
+    records' interned values. Columns that do not fit their array type, such
+    as timezone-aware dates, stay lists.
+    """
+
+    def __init__(self, columns: Dict[str, Union[np.ndarray, list]], missing: Dict[str, np.ndarray],
+                 extras: List[Optional[Dict[str, Any]]]):
+        self._columns = columns
+        self._missing = missing
+        self.extras = extras
+
+    @classmethod
+    def from_records(cls, records: Iterable[ListingRecord]) -> "ListingBatch":
+        records = list(records)
+        columns = {}
+        missing = {}
+        for name in COLUMNS:
+            values = [getattr(record, name) for record in records]
+            dtype = TYPED_COLUMNS.get(name)
+            try:
+                if dtype is None:
+                    columns[name] = values
+                elif dtype.startswith("datetime64"):
+                    if any(value is not None and value.tzinfo is not None for value in values):
+                        raise ValueError("timezone-aware dates")
+                    columns[name] = np.array(values, dtype=dtype)
+                else:
+                    mask = np.array([value is None for value in values], dtype=bool)
+                    columns[name] = np.array([0 if value is None else value for value in values], dtype=dtype)
+                    missing[name] = mask
+            except (OverflowError, TypeError, ValueError):
+                columns[name] = values
+        if all(record.extra is None for record in records):
+            extras = [None] * len(records)
+        else:
+            extras = [record.extra for record in records]
+        return cls(columns, missing, extras)
+
+    @classmethod
+    def from_properties(cls, properties: Iterable[Property], keep_extra: bool = True) -> "ListingBatch":
+        return cls.from_records(ListingRecord.from_property(prop, keep_extra=keep_extra) for prop in properties)
+
+    def __len__(self) -> int:
+        return len(self.extras)
+
+    def column(self, name: str) -> Union[np.ndarray, list]:
+        """The values of one column: a masked array for numeric columns, NaT for missing dates"""
+        if name in self._missing:
+            return np.ma.MaskedArray(self._columns[name], mask=self._missing[name])
+        return self._columns[name]
+
+    def _values(self, name: str) -> list:
+        values = self._columns[name]
+        if not isinstance(values, np.ndarray):
+            return values
+        values = values.tolist()
+        if name in self._missing:
+            return [None if absent else value for value, absent in zip(values, self._missing[name].tolist())]
+        return values
+
+    def __iter__(self) -> Iterator[ListingRecord]:
+        columns = [self._values(name) for name in COLUMNS]
+        for row, extra in zip(zip(*columns), self.extras):
+            yield ListingRecord(*row, extra=extra)
+
+    def __getitem__(self, index: int) -> ListingRecord:
+        row = {}
+        for name in COLUMNS:
+            values = self._columns[name]
+            if name in self._missing and self._missing[name][index]:
+                row[name] = None
+            elif isinstance(values, np.ndarray):
+                row[name] = values[index].item()
+            else:
+                row[name] = values[index]
+        return ListingRecord(**row, extra=self.extras[index])
+
+    def to_properties(self, builder: Optional[ModelBuilder] = None) -> List[Property]:
+        return [record.to_property(builder) for record in self]
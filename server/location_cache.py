@@ -0,0 +1,135 @@
+"""
+TTL + LRU cache for realtor.com location autocomplete lookups
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def normalize_location(location: str) -> str:
+    """Normalize a location string so equivalent spellings share a cache key"""
+    return re.sub(r"[\s,]+", " ", location).strip().lower()
+
+
+class LocationCache:
+    """Thread-safe in-memory LRU cache with TTL and an optional SQLite tier.
+
+    The memory tier is bounded by ``maxsize``; the SQLite tier (enabled by
+    passing ``db_path``) survives restarts and repopulates the memory tier on a
+    hit. Only successful lookups are cached so transient upstream failures are
+    retried on the next request.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 86400, db_path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.db_path = db_path
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS location_cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, location: str) -> Optional[Dict[str, Any]]:
+        """Return the cached location info, or None on a miss or expired entry"""
+        key = normalize_location(location)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM location_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row and row[1] > now:
+                    value = json.loads(row[0])
+                    self._store(key, value, row[1])
+                    self.disk_hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def set(self, location: str, value: Dict[str, Any]) -> None:
+        """Cache a successful location lookup"""
+        key = normalize_location(location)
+        expires_at = time.time() + self.ttl
+
+        with self._lock:
+            self._store(key, value, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO location_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), expires_at),
+                )
+                self._db.commit()
+
+    def clear(self) -> None:
+        """Drop every cached entry from both tiers and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM location_cache")
+                self._db.commit()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current memory tier size"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "persistent": self._db is not None,
+            }
+
+    def _store(self, key: str, value: Dict[str, Any], expires_at: float) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+_shared_cache: Optional[LocationCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_location_cache() -> LocationCache:
+    """Process-wide location cache configured from the environment"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = LocationCache(
+                maxsize=int(os.getenv('LOCATION_CACHE_SIZE', '4096')),
+                ttl=float(os.getenv('LOCATION_CACHE_TTL_SECONDS', '86400')),
+                db_path=os.getenv('LOCATION_CACHE_DB') or None,
+            )
+        return _shared_cache
@@ -0,0 +1,131 @@
+"""
+Validated or trusted construction of models from parser output
+"""
+
+import itertools
+import logging
+import os
+import threading
+import typing
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Type
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+VALIDATION_MODES = ("full", "trusted")
+
+
+@lru_cache(maxsize=None)
+def _nested_models(model_cls: Type[BaseModel]) -> Dict[str, Tuple[Type[BaseModel], bool]]:
+    """{field: (model class, is a list)} for every field of ``model_cls`` holding models"""
+    # Resolve forward references, which models.py uses for types defined after Property
+    model_cls.model_rebuild()
+    nested = {}
+    for name, field in model_cls.model_fields.items():
+        for arg in typing.get_args(field.annotation) or (field.annotation,):
+            many = typing.get_origin(arg) is list
+            if many:
+                arg = (typing.get_args(arg) or (None,))[0]
+            if isinstance(arg, type) and issubclass(arg, BaseModel):
+                nested[name] = (arg, many)
+                break
+    return nested
+
+
+@lru_cache(maxsize=None)
+def _required_fields(model_cls: Type[BaseModel]) -> Tuple[str, ...]:
+    return tuple(name for name, field in model_cls.model_fields.items() if field.is_required())
+
+
+def construct(model_cls: Type[BaseModel], data: Dict[str, Any]) -> BaseModel:
+    """Build ``model_cls`` from ``data`` with ``model_construct``, recursing into nested model dicts.
+
+    Unknown keys are dropped and missing fields take their defaults.
+    """
+    fields = model_cls.model_fields
+    values = {name: value for name, value in data.items() if name in fields}
+    for name, (nested_cls, many) in _nested_models(model_cls).items():
+        value = values.get(name)
+        if isinstance(value, dict):
+            values[name] = construct(nested_cls, value)
+        elif many and isinstance(value, list):
+            values[name] = [construct(nested_cls, item) if isinstance(item, dict) else item for item in value]
+    return model_cls.model_construct(_fields_set=set(values), **values)
+
+
+def validate_without_invalid_fields(model_cls: Type[BaseModel], data: Dict[str, Any],
+                                    error: ValidationError) -> BaseModel:
+    """Validate ``data`` again with the fields ``error`` rejected left to their defaults.
+
+    Raises ValidationError when that is not enough, e.g. a required field is invalid.
+    """
+    invalid = {err["loc"][0] for err in error.errors() if err["loc"]}
+    return model_cls.model_validate({name: value for name, value in data.items() if name not in invalid})
+
+
+def has_shape(model_cls: Type[BaseModel], data: Dict[str, Any]) -> bool:
+    """Cheap check that ``data`` can be trusted: required fields are set and model fields hold dicts or lists"""
+    if any(data.get(name) is None for name in _required_fields(model_cls)):
+        return False
+    for name, (nested_cls, many) in _nested_models(model_cls).items():
+        value = data.get(name)
+        if value is not None and not isinstance(value, (dict, list, nested_cls)):
+            return False
+    return True
+
+
+class ModelBuilder:
+    """Builds models from our own parsers' output.
+
+    The default validates every record. In trusted mode records that pass a
+    cheap shape check are built with ``model_construct`` (URLs, numbers and
+    dates are not re-checked); every ``validate_every``-th record is still
+    fully validated so upstream schema drift shows up in the logs. A sampled
+    record that fails is returned validated, with the rejected fields left
+    to their defaults.
+    """
+
+    def __init__(self, trusted: bool = False, validate_every: int = 0):
+        self.trusted = trusted
+        self.validate_every = validate_every
+        self.drift = 0
+        self._built = itertools.count(1)
+
+    def __reduce__(self):
+        # Parse workers get a fresh builder with the same settings and their own sample counter
+        return ModelBuilder, (self.trusted, self.validate_every)
+
+    def build(self, model_cls: Type[BaseModel], data: Dict[str, Any]) -> BaseModel:
+        if not self.trusted:
+            return model_cls.model_validate(data)
+        if not has_shape(model_cls, data):
+            return model_cls.model_validate(data)
+        if self.validate_every and next(self._built) % self.validate_every == 0:
+            try:
+                return model_cls.model_validate(data)
+            except ValidationError as e:
+                self.drift += 1
+                logger.warning(f"Upstream schema drift in {model_cls.__name__} "
+                               f"{data.get('property_id') or ''}: {e}")
+                return validate_without_invalid_fields(model_cls, data, e)
+        return construct(model_cls, data)
+
+
+_shared_builder: Optional[ModelBuilder] = None
+_shared_builder_lock = threading.Lock()
+
+
+def get_model_builder() -> ModelBuilder:
+    """Process-wide model builder; PROPERTY_VALIDATION=trusted opts into the fast path"""
+    global _shared_builder
+    with _shared_builder_lock:
+        if _shared_builder is None:
+            mode = os.getenv('PROPERTY_VALIDATION', 'full').lower()
+            if mode not in VALIDATION_MODES:
+                raise ValueError(f"PROPERTY_VALIDATION must be one of {', '.join(VALIDATION_MODES)}, not {mode!r}")
+            _shared_builder = ModelBuilder(
+                trusted=mode == 'trusted',
+                validate_every=int(os.getenv('PROPERTY_VALIDATION_SAMPLE_EVERY', '1000')),
+            )
+        return _shared_builder
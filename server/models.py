@@ -5,15 +5,27 @@ Proprietary and confidential. Unauthorized copying, distribution, or use is proh
 
 from __future__ import annotations
 from enum import Enum
-from typing import Optional, Union, Union, Any, List, Dict, Dict
+from typing import Optional, Union, Union, Any, List, Dict, Dict, Annotated
 from datetime import datetime
 from dataclasses import dataclass
-from pydantic import BaseModel, computed_field, HttpUrl, Field
+from pydantic import BaseModel, computed_field, HttpUrl, Field, PlainSerializer
+
+
+def _serialize_url(value, info):
+    # Trusted (model_construct) models keep upstream URLs as plain strings
+    if isinstance(value, str) or not info.mode_is_json():
+        return value
+    return str(value)
+
+
+#: HttpUrl that also serializes the unvalidated strings of trusted models without warnings
+Url = Annotated[HttpUrl, PlainSerializer(_serialize_url)]
 
 
 class ReturnType(Enum):
     pydantic = "pydantic"
     pandas = "pandas"
+    arrow = "arrow"
     raw = "raw"
 
 
@@ -115,8 +127,8 @@ class Address(BaseModel):
 
 
 class Description(BaseModel):
-    primary_photo: Union[HttpUrl, None] = None
-    alt_photos: Union[List[HttpUrl], None] = None
+    primary_photo: Union[Url, None] = None
+    alt_photos: Union[List[Url], None] = None
     style: Union[PropertyType, None] = None
     beds: Union[int, None] = Field(None, description="Total number of bedrooms")
     baths_full: Union[int, None] = Field(None, description="Total number of full bathrooms (4 parts: Sink, Shower, Bathtub and Toilet)")
@@ -178,7 +190,7 @@ class Advertisers(BaseModel):
 
 
 class Property(BaseModel):
-    property_url: HttpUrl
+    property_url: Url
     property_id: str = Field(..., description="Unique Home identifier also known as property id")
     #: allows_cats: bool
     #: allows_dogs: bool
@@ -272,7 +284,7 @@ class OpenHouse(BaseModel):
     description: Union[str, None] = None
     time_zone: Union[str, None] = None
     dst: Union[bool, None] = None
-    href: Union[HttpUrl, None] = None
+    href: Union[Url, None] = None
     methods: Union[List[str], None] = None
 
 
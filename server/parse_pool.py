@@ -0,0 +1,148 @@
+"""
+Process-pool parse stage for large result sets
+"""
+
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from model_builder import ModelBuilder
+from models import ListingType
+from parsers import normalize_dates
+from processors import process_property, process_extra_property_details, get_key
+from utils import property_row
+
+logger = logging.getLogger(__name__)
+
+# Homes per task sent to a worker, and the smallest batch worth the round trip;
+# smaller batches are parsed on the calling thread
+PARSE_CHUNK_SIZE = 50
+MIN_POOL_BATCH = 100
+
+
+@dataclass(frozen=True)
+class PropertyParser:
+    """Raw GraphQL home -> Property (or flat output row), picklable so it can run in a worker.
+
+    Properties are expensive to send back across processes (every nested
+    model and URL is rebuilt when unpickled); ``rows=True`` returns the flat
+    utils.property_row dicts instead, which cost a fraction to transfer.
+    """
+    mls_only: bool = False
+    extra_property_data: bool = False
+    exclude_pending: bool = False
+    listing_type: ListingType = ListingType.FOR_SALE
+    builder: Optional[ModelBuilder] = None
+    rows: bool = False
+
+    def __call__(self, home: Dict[str, Any]) -> Any:
+        try:
+            prop = process_property(
+                home,
+                mls_only=self.mls_only,
+                extra_property_data=self.extra_property_data,
+                exclude_pending=self.exclude_pending,
+                listing_type=self.listing_type,
+                get_key_func=get_key,
+                process_extra_property_details_func=process_extra_property_details,
+                builder=self.builder,
+            )
+        except Exception as e:
+            logger.error(f"Skipping property {home.get('property_id')}: {e}")
+            return None
+        if prop is None or not self.rows:
+            return prop
+        return property_row(prop)
+
+
+def parse_chunk(parse: Callable[[Dict[str, Any]], Any], homes: List[Dict[str, Any]]) -> List[Any]:
+    """Worker task: parse one chunk of raw homes, dropping the ones filtered out"""
+    return [result for result in map(parse, normalize_dates(homes)) if result is not None]
+
+
+def _picklable(parse: Callable) -> bool:
+    try:
+        pickle.dumps(parse)
+        return True
+    except Exception:
+        return False
+
+
+class ParsePool:
+    """Parses batches of raw homes in worker processes, ``chunk_size`` homes per task.
+
+    Batches smaller than ``min_batch``, and parse callables that cannot be
+    pickled (lambdas, bound methods of scrapers holding sessions), are parsed
+    in-process instead. Workers are started on first use and shared by every
+    thread submitting to the pool.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, chunk_size: int = PARSE_CHUNK_SIZE,
+                 min_batch: int = MIN_POOL_BATCH):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.min_batch = min_batch
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process with live session and fetch threads is not safe
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def map(self, parse: Callable[[Dict[str, Any]], Any], homes: Iterable[Dict[str, Any]]) -> List[Any]:
+        """``parse`` applied to every home, in order, without the None results.
+
+        ``homes`` may be an iterator, such as a page still being decoded:
+        once it has yielded ``min_batch`` homes, each chunk is sent to the
+        workers as soon as it fills, so parsing overlaps producing the rest.
+        """
+        homes = iter(homes)
+        if not _picklable(parse):
+            return parse_chunk(parse, list(homes))
+        head = list(islice(homes, self.min_batch))
+        if len(head) < self.min_batch:
+            return parse_chunk(parse, head)
+
+        executor = self._get_executor()
+        futures = [executor.submit(parse_chunk, parse, head[i:i + self.chunk_size])
+                   for i in range(0, len(head), self.chunk_size)]
+        while chunk := list(islice(homes, self.chunk_size)):
+            futures.append(executor.submit(parse_chunk, parse, chunk))
+
+        parsed = []
+        for future in futures:
+            parsed.extend(future.result())
+        return parsed
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+_shared_pool: Optional[ParsePool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> Optional[ParsePool]:
+    """Process-wide parse pool, enabled by setting PARSE_WORKERS (0 or unset parses in-process)"""
+    global _shared_pool
+    with _shared_pool_lock:
+        workers = int(os.getenv('PARSE_WORKERS', '0'))
+        if _shared_pool is None and workers > 0:
+            _shared_pool = ParsePool(
+                max_workers=workers,
+                chunk_size=int(os.getenv('PARSE_CHUNK_SIZE', str(PARSE_CHUNK_SIZE))),
+                min_batch=int(os.getenv('PARSE_MIN_POOL_BATCH', str(MIN_POOL_BATCH))),
+            )
+        return _shared_pool
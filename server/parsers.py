@@ -4,8 +4,12 @@ Parsers for realtor.com data processing
 
 from datetime import datetime
 from typing import Optional, Union, List, Dict, Dict
+import numpy as np
 from models import Address, Description, PropertyType
 
+#: Top-level home dates normalized a batch at a time by normalize_dates
+HOME_DATE_FIELDS = ("list_date", "last_sold_date", "pending_date")
+
 
 def parse_open_houses(open_houses_data: Union[List[dict], None]) -> Union[List[dict], None]:
     """Parse open houses data and convert date strings to datetime objects"""
@@ -152,7 +156,7 @@ def parse_estimates(estimates_data: Union[dict, None]) -> Union[dict, None]:
 def parse_neighborhoods(result: dict) -> Optional[str]:
     """Parse neighborhoods from location data"""
     neighborhoods_list = []
-    neighborhoods = result["location"].get("neighborhoods", [])
+    neighborhoods = (result.get("location") or {}).get("neighborhoods", [])
 
     if neighborhoods:
         for neighborhood in neighborhoods:
@@ -170,14 +174,28 @@ def handle_none_safely(address_part):
     return address_part
 
 
-def parse_address(result: dict, search_type: str) -> Address:
+def parse_address(result: dict, search_type: str) -> Union[Address, None]:
     """Parse address data from result"""
     if search_type == "general_search":
-        address = result["location"]["address"]
+        address = (result.get("location") or {}).get("address")
     else:
-        address = result["address"]
+        address = result.get("address")
+
+    return build_address(address)
+
 
-    return Address(
+def build_address(address: Optional[dict]) -> Union[Address, None]:
+    """Build an Address from a GraphQL address object"""
+    fields = address_fields(address)
+    return Address(**fields) if fields else None
+
+
+def address_fields(address: Optional[dict]) -> Optional[dict]:
+    """Address model fields for a GraphQL address object"""
+    if not address:
+        return None
+
+    return dict(
         full_line=address.get("line"),
         street=" ".join(
             part
@@ -189,10 +207,10 @@ def parse_address(result: dict, search_type: str) -> Address:
             ]
             if part is not None
         ).strip(),
-        unit=address["unit"],
-        city=address["city"],
-        state=address["state_code"],
-        zip=address["postal_code"],
+        unit=address.get("unit"),
+        city=address.get("city"),
+        state=address.get("state_code"),
+        zip=address.get("postal_code"),
         
         # Additional address fields
         street_direction=address.get("street_direction"),
@@ -204,6 +222,12 @@ def parse_address(result: dict, search_type: str) -> Address:
 
 def parse_description(result: dict) -> Union[Description, None]:
     """Parse description data from result"""
+    fields = description_fields(result)
+    return Description(**fields) if fields else None
+
+
+def description_fields(result: dict) -> Optional[dict]:
+    """Description model fields for a raw GraphQL home"""
     if not result:
         return None
 
@@ -222,7 +246,7 @@ def parse_description(result: dict) -> Union[Description, None]:
     ):
         primary_photo = primary_photo_href.replace("s.jpg", "od-w480_h360_x2.webp?w=1080&q=75")
 
-    return Description(
+    return dict(
         primary_photo=primary_photo,
         alt_photos=process_alt_photos(result.get("photos", [])),
         style=(PropertyType.__getitem__(style) if style and style in PropertyType.__members__ else None),
@@ -233,7 +257,7 @@ def parse_description(result: dict) -> Union[Description, None]:
         lot_sqft=description_data.get("lot_sqft"),
         sold_price=(
             result.get("last_sold_price") or description_data.get("sold_price")
-            if result.get("last_sold_date") or result["list_price"] != description_data.get("sold_price")
+            if result.get("last_sold_date") or result.get("list_price") != description_data.get("sold_price")
             else None
         ),  #: has a sold date or list and sold price are different
         year_built=description_data.get("year_built"),
@@ -247,22 +271,76 @@ def parse_description(result: dict) -> Union[Description, None]:
     )
 
 
+def parse_date(value: Union[str, datetime, None]) -> Optional[datetime]:
+    """Parse the date part of a GraphQL date or timestamp string; datetimes from normalize_dates pass through"""
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value.split("T")[0]) if value else None
+
+
+def _date_text(value) -> str:
+    if isinstance(value, str) and value:
+        return value[:10]
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    return "NaT"
+
+
+def normalize_dates(homes: List[dict], now: Optional[datetime] = None) -> List[dict]:
+    """Parse a batch of raw homes' list/sold/pending dates in one vectorized pass.
+
+    Each date string is replaced by a datetime and ``days_on_mls`` is set for
+    every home against a single reference time, so process_property does no
+    per-home date work. A batch with an unparseable date is left untouched
+    and falls back to per-home parsing.
+    """
+    if not homes:
+        return homes
+
+    try:
+        columns = {
+            field: np.array([_date_text(home.get(field)) for home in homes], dtype="datetime64[D]")
+            for field in HOME_DATE_FIELDS
+        }
+    except ValueError:
+        return homes
+
+    listed, sold = columns["list_date"], columns["last_sold_date"]
+    status = np.array([home.get("status") for home in homes], dtype=object)
+    is_sold = status == "sold"
+    is_active = (status == "for_sale") | (status == "for_rent")
+    today = np.datetime64((now or datetime.now()).date(), "D")
+
+    days = np.where(is_sold, sold - listed, today - listed).astype("timedelta64[D]")
+    valid = ~np.isnat(days) & (is_sold | is_active)
+    valid[valid] = days[valid] >= np.timedelta64(0, "D")
+    days_on_mls = np.where(valid, days.astype(np.int64), -1).tolist()
+
+    values = {field: column.astype("datetime64[us]").tolist() for field, column in columns.items()}
+    for index, home in enumerate(homes):
+        for field in HOME_DATE_FIELDS:
+            home[field] = values[field][index]
+        home["days_on_mls"] = days_on_mls[index] if days_on_mls[index] >= 0 else None
+    return homes
+
+
 def calculate_days_on_mls(result: dict) -> Optional[int]:
     """Calculate days on MLS from result data"""
-    list_date_str = result.get("list_date")
-    list_date = datetime.strptime(list_date_str.split("T")[0], "%Y-%m-%d") if list_date_str else None
-    last_sold_date_str = result.get("last_sold_date")
-    last_sold_date = datetime.strptime(last_sold_date_str, "%Y-%m-%d") if last_sold_date_str else None
-    today = datetime.now()
+    return days_on_mls(result.get("status"), parse_date(result.get("list_date")),
+                       parse_date(result.get("last_sold_date")))
+
 
+def days_on_mls(status: Optional[str], list_date: Optional[datetime],
+                last_sold_date: Optional[datetime]) -> Optional[int]:
+    """Days on MLS from already-parsed list and sold dates"""
     if list_date:
-        if result["status"] == "sold":
+        if status == "sold":
             if last_sold_date:
                 days = (last_sold_date - list_date).days
                 if days >= 0:
                     return days
-        elif result["status"] in ("for_sale", "for_rent"):
-            days = (today - list_date).days
+        elif status in ("for_sale", "for_rent"):
+            days = (datetime.now() - list_date).days
             if days >= 0:
                 return days
 
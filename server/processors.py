@@ -2,18 +2,14 @@
 Processors for realtor.com property data processing
 """
 
-from datetime import datetime
 from typing import Optional, Union, Union, List, Dict
 from models import (
     Property,
     ListingType,
-    Agent,
-    Broker,
-    Builder,
     Advertisers,
-    Office,
     ReturnType
 )
+from model_builder import ModelBuilder, get_model_builder
 from parsers import (
     parse_open_houses,
     parse_units,
@@ -21,27 +17,34 @@ from parsers import (
     parse_current_estimates,
     parse_estimates,
     parse_neighborhoods,
-    parse_address,
-    parse_description,
-    calculate_days_on_mls,
+    description_fields,
+    parse_date,
+    address_fields,
+    days_on_mls,
     process_alt_photos
 )
 
 
 def process_advertisers(advertisers: Union[List[dict], None]) -> Union[Advertisers, None]:
     """Process advertisers data from GraphQL response"""
+    fields = advertiser_fields(advertisers)
+    return Advertisers(**fields) if fields is not None else None
+
+
+def advertiser_fields(advertisers: Union[List[dict], None]) -> Union[dict, None]:
+    """Advertisers model fields (agent, broker, office, builder) from GraphQL advertisers"""
     if not advertisers:
         return None
 
     def _parse_fulfillment_id(fulfillment_id: Union[str, None]) -> Union[str, None]:
         return fulfillment_id if fulfillment_id and fulfillment_id != "0" else None
 
-    processed_advertisers = Advertisers()
+    processed_advertisers = {}
 
     for advertiser in advertisers:
         advertiser_type = advertiser.get("type")
         if advertiser_type == "seller":  #: agent
-            processed_advertisers.agent = Agent(
+            processed_advertisers["agent"] = dict(
                 uuid=_parse_fulfillment_id(advertiser.get("fulfillment_id")),
                 nrds_id=advertiser.get("nrds_id"),
                 mls_set=advertiser.get("mls_set"),
@@ -52,13 +55,13 @@ def process_advertisers(advertisers: Union[List[dict], None]) -> Union[Advertise
             )
 
             if advertiser.get("broker") and advertiser["broker"].get("name"):  #: has a broker
-                processed_advertisers.broker = Broker(
+                processed_advertisers["broker"] = dict(
                     uuid=_parse_fulfillment_id(advertiser["broker"].get("fulfillment_id")),
                     name=advertiser["broker"].get("name"),
                 )
 
             if advertiser.get("office"):  #: has an office
-                processed_advertisers.office = Office(
+                processed_advertisers["office"] = dict(
                     uuid=_parse_fulfillment_id(advertiser["office"].get("fulfillment_id")),
                     mls_set=advertiser["office"].get("mls_set"),
                     name=advertiser["office"].get("name"),
@@ -68,7 +71,7 @@ def process_advertisers(advertisers: Union[List[dict], None]) -> Union[Advertise
 
         if advertiser_type == "community":  #: could be builder
             if advertiser.get("builder"):
-                processed_advertisers.builder = Builder(
+                processed_advertisers["builder"] = dict(
                     uuid=_parse_fulfillment_id(advertiser["builder"].get("fulfillment_id")),
                     name=advertiser["builder"].get("name"),
                 )
@@ -78,67 +81,80 @@ def process_advertisers(advertisers: Union[List[dict], None]) -> Union[Advertise
 
 def process_property(result: dict, mls_only: bool = False, extra_property_data: bool = False, 
                     exclude_pending: bool = False, listing_type: ListingType = ListingType.FOR_SALE,
-                    get_key_func=None, process_extra_property_details_func=None) -> Union[Property, None]:
-    """Process property data from GraphQL response"""
-    mls = result["source"].get("id") if "source" in result and isinstance(result["source"], dict) else None
+                    get_key_func=None, process_extra_property_details_func=None,
+                    builder: Optional[ModelBuilder] = None) -> Union[Property, None]:
+    """Build the final Property from a raw GraphQL home in a single pass.
+
+    This is the one builder every search mode uses. Nested objects are looked
+    up once and each date is parsed once, including for days_on_mls; homes
+    batched through parsers.normalize_dates arrive with both done. Nested
+    models are assembled as plain fields and handed to ``builder`` (the
+    process-wide ModelBuilder by default), which validates or trusts them.
+    """
+    source = result.get("source")
+    if not isinstance(source, dict):
+        source = {}
+    mls = source.get("id")
 
     if not mls and mls_only:
         return None
 
-    able_to_get_lat_long = (
-        result
-        and result.get("location")
-        and result["location"].get("address")
-        and result["location"]["address"].get("coordinate")
-    )
-
-    is_pending = result["flags"].get("is_pending")
-    is_contingent = result["flags"].get("is_contingent")
+    # Projected queries may omit any field except property_id and href
+    flags = result.get("flags") or {}
+    is_pending = flags.get("is_pending")
+    is_contingent = flags.get("is_contingent")
 
     if (is_pending or is_contingent) and (exclude_pending and listing_type != ListingType.PENDING):
         return None
 
-    property_id = result["property_id"]
-    prop_details = process_extra_property_details_func(result) if extra_property_data and process_extra_property_details_func else {}
-
-    property_estimates_root = result.get("current_estimates") or result.get("estimates", {}).get("currentValues")
-    estimated_value = get_key_func(property_estimates_root, [0, "estimate"]) if get_key_func else None
-
-    advertisers = process_advertisers(result.get("advertisers"))
-
-    realty_property = Property(
+    location = result.get("location") or {}
+    address = location.get("address") or {}
+    coordinate = address.get("coordinate") or {}
+    county = location.get("county") or {}
+    hoa = result.get("hoa")
+    status = result.get("status")
+    list_date = parse_date(result.get("list_date"))
+    last_sold_date = parse_date(result.get("last_sold_date"))
+
+    get_key_func = get_key_func or get_key
+    process_extra_property_details_func = process_extra_property_details_func or process_extra_property_details
+    prop_details = process_extra_property_details_func(result) if extra_property_data else {}
+
+    current_estimates = result.get("current_estimates")
+    estimates = result.get("estimates")
+    property_estimates_root = current_estimates or (estimates or {}).get("currentValues")
+    estimated_value = get_key_func(property_estimates_root, [0, "estimate"])
+
+    return (builder or get_model_builder()).build(Property, dict(
         mls=mls,
-        mls_id=(
-            result["source"].get("listing_id")
-            if "source" in result and isinstance(result["source"], dict)
-            else None
-        ),
+        mls_id=source.get("listing_id"),
         property_url=result["href"],
-        property_id=property_id,
+        property_id=result["property_id"],
         listing_id=result.get("listing_id"),
         permalink=result.get("permalink"),
-        status=("PENDING" if is_pending else "CONTINGENT" if is_contingent else result["status"].upper()),
-        list_price=result["list_price"],
-        list_price_min=result["list_price_min"],
-        list_price_max=result["list_price_max"],
-        list_date=(datetime.fromisoformat(result["list_date"].split("T")[0]) if result.get("list_date") else None),
+        status=("PENDING" if is_pending else "CONTINGENT" if is_contingent else (status or "").upper() or None),
+        list_price=result.get("list_price"),
+        list_price_min=result.get("list_price_min"),
+        list_price_max=result.get("list_price_max"),
+        list_date=list_date,
         prc_sqft=result.get("price_per_sqft"),
-        last_sold_date=(datetime.fromisoformat(result["last_sold_date"]) if result.get("last_sold_date") else None),
-        pending_date=(datetime.fromisoformat(result["pending_date"].split("T")[0]) if result.get("pending_date") else None),
-        new_construction=result["flags"].get("is_new_construction") is True,
-        hoa_fee=(result["hoa"]["fee"] if result.get("hoa") and isinstance(result["hoa"], dict) else None),
-        latitude=(result["location"]["address"]["coordinate"].get("lat") if able_to_get_lat_long else None),
-        longitude=(result["location"]["address"]["coordinate"].get("lon") if able_to_get_lat_long else None),
-        address=parse_address(result, search_type="general_search"),
-        description=parse_description(result),
+        last_sold_date=last_sold_date,
+        pending_date=parse_date(result.get("pending_date")),
+        new_construction=flags.get("is_new_construction") is True,
+        hoa_fee=(hoa.get("fee") if isinstance(hoa, dict) else None),
+        latitude=coordinate.get("lat"),
+        longitude=coordinate.get("lon"),
+        address=address_fields(address),
+        description=description_fields(result),
         neighborhoods=parse_neighborhoods(result),
-        county=(result["location"]["county"].get("name") if result["location"]["county"] else None),
-        fips_code=(result["location"]["county"].get("fips_code") if result["location"]["county"] else None),
-        days_on_mls=calculate_days_on_mls(result),
+        county=county.get("name"),
+        fips_code=county.get("fips_code"),
+        days_on_mls=(result["days_on_mls"] if "days_on_mls" in result
+                     else days_on_mls(status, list_date, last_sold_date)),
         nearby_schools=prop_details.get("schools"),
         assessed_value=prop_details.get("assessed_value"),
         estimated_value=estimated_value if estimated_value else None,
-        advertisers=advertisers,
+        advertisers=advertiser_fields(result.get("advertisers")),
         tax=prop_details.get("tax"),
         tax_history=prop_details.get("tax_history"),
         
@@ -156,13 +172,12 @@ def process_property(result: dict, mls_only: bool = False, extra_property_data:
         terms=result.get("terms"),
         popularity=result.get("popularity"),
         tax_record=parse_tax_record(result.get("tax_record")),
-        parcel_info=result.get("location", {}).get("parcel"),
-        current_estimates=parse_current_estimates(result.get("current_estimates")),
-        estimates=parse_estimates(result.get("estimates")),
+        parcel_info=location.get("parcel"),
+        current_estimates=parse_current_estimates(current_estimates),
+        estimates=parse_estimates(estimates),
         photos=result.get("photos"),
         flags=result.get("flags"),
-    )
-    return realty_property
+    ))
 
 
 def process_extra_property_details(result: dict, get_key_func=None) -> dict:
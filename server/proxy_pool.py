@@ -0,0 +1,181 @@
+"""
+Health-scored proxy pool for spreading realtor.com requests across proxies
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+import requests
+from exceptions import ScrapingError
+from rate_limiter import THROTTLE_STATUS_CODES, RateLimiterRegistry
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[RateLimiterRegistry], requests.Session]
+
+
+def parse_proxies(proxy: Union[str, Sequence[str], None]) -> List[str]:
+    """Split a comma-separated proxy string (or list of them) into proxy URLs"""
+    if not proxy:
+        return []
+    if isinstance(proxy, str):
+        proxy = proxy.split(",")
+    return [p.strip() for p in proxy if p and p.strip()]
+
+
+class ProxyEndpoint:
+    """One proxy with its own session, rate limiters and health counters"""
+
+    def __init__(self, url: str, session: requests.Session, registry: RateLimiterRegistry):
+        self.url = url
+        self.session = session
+        self.registry = registry
+        self.session.proxies.update({"http": url, "https": url})
+
+        self.latency: Optional[float] = None
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.in_flight = 0
+        self.retired = False
+
+    @property
+    def error_rate(self) -> float:
+        return self.failures / self.requests if self.requests else 0.0
+
+    def score(self, default_latency: float) -> float:
+        """Lower is better: latency EWMA penalised by the observed error rate"""
+        latency = self.latency if self.latency is not None else default_latency
+        return latency * (1 + 4 * self.error_rate)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "latency": round(self.latency, 4) if self.latency is not None else None,
+            "requests": self.requests,
+            "failures": self.failures,
+            "error_rate": round(self.error_rate, 3),
+            "in_flight": self.in_flight,
+            "retired": self.retired,
+        }
+
+
+class ProxyPool:
+    """Session-compatible wrapper that routes each request through the healthiest proxy.
+
+    Every proxy gets its own ``requests.Session`` and its own per-host rate
+    limiters, so N proxies give N independent request budgets. Each request
+    goes to the proxy with the fewest requests in flight, ties broken by a
+    latency EWMA scaled by error rate, which spreads the scraper's parallel
+    page and detail fetches across the pool. Connection errors and throttle
+    responses count as failures and the request is retried on another proxy;
+    a proxy that fails ``max_consecutive_failures`` times in a row is retired.
+    The pool owns throttle retries, so its sessions should not retry
+    throttles themselves (see sessions.create_proxy_session).
+    """
+
+    EWMA_ALPHA = 0.3
+
+    def __init__(self, proxies: Sequence[str], session_factory: SessionFactory,
+                 max_consecutive_failures: int = 5, max_attempts: int = 3):
+        if not proxies:
+            raise ValueError("ProxyPool requires at least one proxy")
+
+        self.max_consecutive_failures = max_consecutive_failures
+        self.max_attempts = max_attempts
+        self.endpoints: List[ProxyEndpoint] = []
+        for url in proxies:
+            registry = RateLimiterRegistry()
+            self.endpoints.append(ProxyEndpoint(url, session_factory(registry), registry))
+        self._lock = threading.Lock()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        last_error: Optional[Exception] = None
+        throttled: Optional[requests.Response] = None
+        tried = set()
+
+        for _ in range(self.max_attempts):
+            endpoint = self._acquire(exclude=tried)
+            if endpoint is None:
+                break
+            tried.add(endpoint.url)
+
+            started = time.monotonic()
+            try:
+                response = endpoint.session.request(method, url, **kwargs)
+            except requests.RequestException as e:
+                last_error = e
+                self._release(endpoint, ok=False)
+                logger.warning(f"Request via proxy {endpoint.url} failed: {e}")
+                continue
+
+            if response.status_code in THROTTLE_STATUS_CODES:
+                self._release(endpoint, ok=False)
+                # Only the last throttle response is returned; release earlier ones' connections
+                if throttled is not None:
+                    throttled.close()
+                throttled = response
+                continue
+
+            self._release(endpoint, ok=True, latency=time.monotonic() - started)
+            if throttled is not None:
+                throttled.close()
+            return response
+
+        if throttled is not None:
+            return throttled
+        if last_error is not None:
+            raise last_error
+        raise ScrapingError("All proxies in the pool have been retired")
+
+    def healthy(self) -> List[ProxyEndpoint]:
+        with self._lock:
+            return [e for e in self.endpoints if not e.retired]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {e.url: e.stats() for e in self.endpoints}
+
+    def close(self) -> None:
+        for endpoint in self.endpoints:
+            endpoint.session.close()
+
+    def _acquire(self, exclude=()) -> Optional[ProxyEndpoint]:
+        with self._lock:
+            candidates = [e for e in self.endpoints if not e.retired and e.url not in exclude]
+            if not candidates:
+                candidates = [e for e in self.endpoints if not e.retired]
+            if not candidates:
+                return None
+
+            known = [e.latency for e in candidates if e.latency is not None]
+            default_latency = min(known) if known else 1.0
+            endpoint = min(candidates, key=lambda e: (e.in_flight, e.score(default_latency)))
+            endpoint.in_flight += 1
+            return endpoint
+
+    def _release(self, endpoint: ProxyEndpoint, ok: bool, latency: Optional[float] = None) -> None:
+        with self._lock:
+            endpoint.in_flight -= 1
+            endpoint.requests += 1
+            if ok:
+                endpoint.consecutive_failures = 0
+                if latency is not None:
+                    endpoint.latency = latency if endpoint.latency is None else (
+                        self.EWMA_ALPHA * latency + (1 - self.EWMA_ALPHA) * endpoint.latency
+                    )
+                return
+
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            if endpoint.consecutive_failures >= self.max_consecutive_failures and not endpoint.retired:
+                endpoint.retired = True
+                logger.warning(
+                    f"Retiring proxy {endpoint.url} after {endpoint.consecutive_failures} consecutive failures"
+                )
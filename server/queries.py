@@ -2,124 +2,57 @@
 GraphQL query templates for Realtor.com data processing
 """
 
-_SEARCH_HOMES_DATA_BASE = """{
-    pending_date
-    listing_id
-    property_id
+from typing import Iterable, List, Optional, Union
+
+# Top-level home_search result fields and their selection sets, in the order they are requested
+SEARCH_FIELD_SELECTIONS = {
+    "pending_date": "pending_date",
+    "listing_id": "listing_id",
+    "property_id": "property_id",
+    "href": "href",
+    "permalink": "permalink",
+    "list_date": "list_date",
+    "status": "status",
+    "mls_status": "mls_status",
+    "last_sold_price": "last_sold_price",
+    "last_sold_date": "last_sold_date",
+    "list_price": "list_price",
+    "list_price_max": "list_price_max",
+    "list_price_min": "list_price_min",
+    "price_per_sqft": "price_per_sqft",
+    "tags": "tags",
+    "open_houses": """open_houses {
+    start_date
+    end_date
+    description
+    time_zone
+    dst
     href
-    permalink
-    list_date
-    status
-    mls_status
-    last_sold_price
-    last_sold_date
-    list_price
-    list_price_max
-    list_price_min
-    price_per_sqft
-    tags
-    open_houses {
-        start_date
-        end_date
-        description
-        time_zone
-        dst
-        href
-        methods
-    }
-    details {
-        category
-        text
-        parent_category
-    }
-    pet_policy {
-        cats
-        dogs
-        dogs_small
-        dogs_large
-        __typename
-    }
-    units {
-        availability {
-          date
-          __typename
-        }
-        description {
-          baths_consolidated
-          baths
-          beds
-          sqft
-          __typename
-        }
-        photos(https: true) {
-            title
-            href
-            tags {
-                label
-            }
-        }
-        list_price
-        __typename
-    }
-    flags {
-        is_contingent
-        is_pending
-        is_new_construction
+    methods
+}""",
+    "details": """details {
+    category
+    text
+    parent_category
+}""",
+    "pet_policy": """pet_policy {
+    cats
+    dogs
+    dogs_small
+    dogs_large
+    __typename
+}""",
+    "units": """units {
+    availability {
+      date
+      __typename
     }
     description {
-        type
-        sqft
-        beds
-        baths_full
-        baths_half
-        lot_sqft
-        year_built
-        garage
-        type
-        name
-        stories
-        text
-    }
-    source {
-        id
-        listing_id
-    }
-    hoa {
-        fee
-    }
-    location {
-        address {
-            street_direction
-            street_number
-            street_name
-            street_suffix
-            line
-            unit
-            city
-            state_code
-            postal_code
-            coordinate {
-                lon
-                lat
-            }
-        }
-        county {
-            name
-            fips_code
-        }
-        neighborhoods {
-            name
-        }
-    }
-    tax_record {
-        cl_id
-        public_record_id
-        last_update_date
-        apn
-        tax_parcel_id
-    }
-    primary_photo(https: true) {
-        href
+      baths_consolidated
+      baths
+      beds
+      sqft
+      __typename
     }
     photos(https: true) {
         title
@@ -128,58 +61,129 @@ _SEARCH_HOMES_DATA_BASE = """{
             label
         }
     }
-    advertisers {
-        email
-        broker {
-            name
-            fulfillment_id
+    list_price
+    __typename
+}""",
+    "flags": """flags {
+    is_contingent
+    is_pending
+    is_new_construction
+}""",
+    "description": """description {
+    type
+    sqft
+    beds
+    baths_full
+    baths_half
+    lot_sqft
+    year_built
+    garage
+    name
+    stories
+    text
+}""",
+    "source": """source {
+    id
+    listing_id
+}""",
+    "hoa": """hoa {
+    fee
+}""",
+    "location": """location {
+    address {
+        street_direction
+        street_number
+        street_name
+        street_suffix
+        line
+        unit
+        city
+        state_code
+        postal_code
+        coordinate {
+            lon
+            lat
         }
+    }
+    county {
+        name
+        fips_code
+    }
+    neighborhoods {
+        name
+    }
+}""",
+    "tax_record": """tax_record {
+    cl_id
+    public_record_id
+    last_update_date
+    apn
+    tax_parcel_id
+}""",
+    "primary_photo": """primary_photo(https: true) {
+    href
+}""",
+    "photos": """photos(https: true) {
+    title
+    href
+    tags {
+        label
+    }
+}""",
+    "advertisers": """advertisers {
+    email
+    broker {
+        name
+        fulfillment_id
+    }
+    type
+    name
+    fulfillment_id
+    builder {
+        name
+        fulfillment_id
+    }
+    phones {
+        ext
+        primary
         type
+        number
+    }
+    office {
         name
+        email
         fulfillment_id
-        builder {
-            name
-            fulfillment_id
-        }
+        href
         phones {
-            ext
-            primary
-            type
             number
-        }
-        office {
-            name
-            email
-            fulfillment_id
-            href
-            phones {
-                number
-                type
-                primary
-                ext
-            }
-            mls_set
-        }
-        corporation {
-            specialties
-            name
-            bio
-            href
-            fulfillment_id
+            type
+            primary
+            ext
         }
         mls_set
-        nrds_id
-        state_license
-        rental_corporation {
-            fulfillment_id
-        }
-        rental_management {
-            name
-            href
-            fulfillment_id
-        }
     }
-    """
+    corporation {
+        specialties
+        name
+        bio
+        href
+        fulfillment_id
+    }
+    mls_set
+    nrds_id
+    state_license
+    rental_corporation {
+        fulfillment_id
+    }
+    rental_management {
+        name
+        href
+        fulfillment_id
+    }
+}""",
+}
+
+_SEARCH_HOMES_DATA_BASE = "{\n%s\n" % "\n".join(SEARCH_FIELD_SELECTIONS.values())
 
 
 HOME_FRAGMENT = """
@@ -229,6 +233,18 @@ fragment HomeData on Home {
         text
         category
     }
+    estimates {
+        __typename
+        currentValues: current_values {
+            __typename
+            source { __typename type name }
+            estimate
+            estimateHigh: estimate_high
+            estimateLow: estimate_low
+            date
+            isBestHomeValue: isbest_homevalue
+        }
+    }
 }
 """
 
@@ -286,8 +302,7 @@ HOMES_DATA = """%s
                 }
 }""" % _SEARCH_HOMES_DATA_BASE
 
-SEARCH_HOMES_DATA = """%s
-current_estimates {
+CURRENT_ESTIMATES_SELECTION = """current_estimates {
     __typename
     source {
         __typename
@@ -299,8 +314,120 @@ current_estimates {
     estimateLow: estimate_low
     date
     isBestHomeValue: isbest_homevalue
+}"""
+
+SEARCH_HOMES_DATA = """%s
+%s
+}""" % (_SEARCH_HOMES_DATA_BASE, CURRENT_ESTIMATES_SELECTION)
+
+# Smaller selections for callers that only need some fields; "full" keeps SEARCH_HOMES_DATA
+PROJECTION_SELECTIONS = {
+    **SEARCH_FIELD_SELECTIONS,
+    "current_estimates": CURRENT_ESTIMATES_SELECTION,
+    "map_location": """location {
+    address {
+        line
+        city
+        state_code
+        postal_code
+        coordinate {
+            lon
+            lat
+        }
+    }
+}""",
 }
-}""" % _SEARCH_HOMES_DATA_BASE
+
+# Always selected so every projected home can still be parsed into a Property
+REQUIRED_SEARCH_FIELDS = ("property_id", "href", "status", "flags")
+
+QUERY_PROFILES = {
+    "pins": ("list_price", "primary_photo", "map_location"),
+    "table": (
+        "listing_id", "permalink", "source", "mls_status", "description", "location", "list_date",
+        "pending_date", "list_price", "list_price_min", "list_price_max", "last_sold_date", "last_sold_price",
+        "price_per_sqft", "hoa", "advertisers", "primary_photo", "photos", "current_estimates",
+    ),
+}
+
+# Output columns (utils.ordered_properties) mapped to the search fields they are parsed from
+COLUMN_FIELDS = {
+    "property_url": ("href",),
+    "mls": ("source",),
+    "mls_id": ("source",),
+    "status": ("status", "flags"),
+    "new_construction": ("flags",),
+    "text": ("description",),
+    "style": ("description",),
+    "beds": ("description",),
+    "full_baths": ("description",),
+    "half_baths": ("description",),
+    "sqft": ("description",),
+    "year_built": ("description",),
+    "lot_sqft": ("description",),
+    "stories": ("description",),
+    "parking_garage": ("description",),
+    "sold_price": ("description", "last_sold_price"),
+    "days_on_mls": ("list_date", "last_sold_date", "status"),
+    "estimated_value": ("current_estimates",),
+    "hoa_fee": ("hoa",),
+    "alt_photos": ("photos",),
+    **{column: ("location",) for column in (
+        "formatted_address", "full_street_line", "street", "unit", "city", "state", "zip_code",
+        "latitude", "longitude", "neighborhoods", "county", "fips_code",
+    )},
+    **{column: ("advertisers",) for column in (
+        "agent_id", "agent_name", "agent_email", "agent_phones", "agent_mls_set", "agent_nrds_id",
+        "broker_id", "broker_name", "builder_id", "builder_name",
+        "office_id", "office_mls_set", "office_name", "office_email", "office_phones",
+    )},
+}
+
+# Columns that only come from the per-property detail query (extra_property_data)
+DETAIL_COLUMNS = frozenset(["assessed_value", "tax", "tax_history", "nearby_schools"])
+
+
+def resolve_search_fields(fields: Union[str, Iterable[str], None]) -> Optional[List[str]]:
+    """Expand a profile name or list of output columns / search fields into search field names.
+
+    Returns None for the full selection. Raises ValueError for unknown names.
+    """
+    if fields is None or fields == "full":
+        return None
+    if isinstance(fields, str):
+        if fields not in QUERY_PROFILES:
+            raise ValueError(f"Unknown query profile '{fields}', expected one of: full, {', '.join(QUERY_PROFILES)}")
+        fields = QUERY_PROFILES[fields]
+
+    resolved = list(REQUIRED_SEARCH_FIELDS)
+    for name in fields:
+        if name in COLUMN_FIELDS:
+            sources = COLUMN_FIELDS[name]
+        elif name in PROJECTION_SELECTIONS:
+            sources = (name,)
+        elif name in DETAIL_COLUMNS:
+            sources = ()
+        else:
+            raise ValueError(f"Unknown field '{name}'")
+        resolved.extend(source for source in sources if source not in resolved)
+    return resolved
+
+
+def build_search_selection(fields: Union[str, Iterable[str], None] = None) -> str:
+    """Smallest home_search results selection covering the requested profile or fields"""
+    resolved = resolve_search_fields(fields)
+    if resolved is None:
+        return SEARCH_HOMES_DATA
+    return "{\n%s\n}" % "\n".join(PROJECTION_SELECTIONS[name] for name in resolved)
+
+
+def needs_property_details(fields: Union[str, Iterable[str], None]) -> bool:
+    """Whether the requested fields include any that only the detail query provides"""
+    if fields is None or fields == "full" or fields == "table":
+        return True
+    if isinstance(fields, str):
+        return False
+    return any(name in DETAIL_COLUMNS for name in fields)
 
 GENERAL_RESULTS_QUERY = """{
                             count
@@ -0,0 +1,181 @@
+"""
+Adaptive per-host rate limiting for realtor.com traffic
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_STATUS_CODES = frozenset([429, 403])
+# Times an adapter re-sends a throttled request before returning the throttle response
+MAX_THROTTLE_RETRIES = 3
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose refill rate adapts with AIMD.
+
+    Each second's worth of successful responses adds ``increase`` requests/second
+    up to ``max_rate``; a throttle response (429/403) multiplies the rate by
+    ``decrease_factor`` down to ``min_rate``. Decreases are applied at most
+    once per ``cooldown`` so a burst of throttles from requests already in
+    flight counts as one congestion signal.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: Optional[float] = None, min_rate: float = 0.5,
+                 max_rate: float = 50.0, increase: float = 0.5, decrease_factor: float = 0.5,
+                 cooldown: float = 1.0):
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._last_decrease = 0.0
+        self._waiting = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Block until a request token is available; returns False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._waiting += 1
+        try:
+            while (wait := self.try_acquire()) > 0:
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                time.sleep(wait)
+            return True
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    async def acquire_async(self) -> None:
+        """Coroutine counterpart of acquire() that yields to the event loop while waiting"""
+        with self._lock:
+            self._waiting += 1
+        try:
+            while (wait := self.try_acquire()) > 0:
+                await asyncio.sleep(wait)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available; otherwise return the seconds until the next one"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def on_success(self) -> None:
+        with self._lock:
+            self._refill()
+            # Additive increase of `increase` req/s per second's worth of successful requests
+            self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._refill()
+            self._last_decrease = now
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self._tokens = min(self._tokens, 0.0)
+            logger.warning(f"Upstream throttled, rate reduced to {self.rate:.2f} req/s")
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            self._refill()
+            return {
+                "rate": round(self.rate, 3),
+                "tokens": round(self._tokens, 3),
+                "queue_depth": self._waiting,
+            }
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+
+class RateLimiterRegistry:
+    """One AdaptiveRateLimiter per upstream host, shared by every scraper in the process"""
+
+    DEFAULT_RATES = {
+        "www.realtor.com": 10.0,
+        "parser-external.geo.moveaws.com": 20.0,
+        "graph.realtor.com": 5.0,
+    }
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None, default_rate: float = 10.0):
+        self.rates = {**self.DEFAULT_RATES, **(rates or {})}
+        self.default_rate = default_rate
+        self._limiters: Dict[str, AdaptiveRateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> AdaptiveRateLimiter:
+        return self.for_host(urlparse(url).hostname or "")
+
+    def for_host(self, host: str) -> AdaptiveRateLimiter:
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                rate = self.rates.get(host, self.default_rate)
+                limiter = AdaptiveRateLimiter(rate=rate, max_rate=rate * 5)
+                self._limiters[host] = limiter
+            return limiter
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {host: limiter.stats() for host, limiter in limiters.items()}
+
+
+rate_limiters = RateLimiterRegistry()
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that waits on the host's limiter and feeds responses back into it.
+
+    Throttled responses are retried here, after the limiter has slowed down,
+    instead of through urllib3's exponential backoff, so a 429 lowers the
+    shared rate rather than stalling every worker for the same fixed time.
+    """
+
+    def __init__(self, registry: RateLimiterRegistry = rate_limiters, max_throttle_retries: int = MAX_THROTTLE_RETRIES, **kwargs):
+        self.registry = registry
+        self.max_throttle_retries = max_throttle_retries
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        limiter = self.registry.for_url(request.url)
+        for attempt in range(self.max_throttle_retries + 1):
+            limiter.acquire()
+            response = self._send_once(request, **kwargs)
+            if response.status_code not in THROTTLE_STATUS_CODES:
+                limiter.on_success()
+                return response
+            limiter.on_throttle()
+            if attempt < self.max_throttle_retries:
+                response.close()
+        return response
+
+    def _send_once(self, request, **kwargs):
+        """One attempt at the wire; the hook transports override to redirect or replay"""
+        return super().send(request, **kwargs)
@@ -6,27 +6,107 @@ Flask API endpoint for Realtor.com data processing
 Serves parsed property data to the TypeScript frontend
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import json
 import logging
-from typing import Dict, Any, List
+import time
+from dataclasses import asdict
+from itertools import chain
+from typing import Dict, Any, Iterable, List, Optional
 from dreamery_property_scraper import DreameryPropertyScraper
 from models import PropertyData, Property, ListingType, SearchPropertyType, ReturnType, HomeFlags, PetPolicy, OpenHouse, Unit, HomeMonthlyFee, HomeOneTimeFee, HomeParkingDetails, PropertyDetails, Popularity, TaxRecord, PropertyEstimate, HomeEstimates
 from parsers import parse_address, parse_description, parse_open_houses, parse_units, parse_tax_record, parse_estimates
 from enhanced_scraper import ScraperInput
-from scraper_api import scrape_property
+from scraper_api import scrape_property, scrape_properties_batch, iter_properties, output_columns
+from arrow_output import ARROW_STREAM_MIMETYPE, arrow_stream
+from export_writers import json_record
+from utils import property_row
+from exceptions import InvalidDate, InvalidListingType, ValidationError
+from rate_limiter import rate_limiters
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Largest number of locations accepted by one batch search request
+MAX_BATCH_LOCATIONS = 500
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend integration
 
 # Initialize the scraper
 scraper = DreameryPropertyScraper()
 
+NDJSON_MIMETYPE = "application/x-ndjson"
+STREAM_FORMATS = ("ndjson", "json")
+
+
+def _stream_format(search_params: Dict[str, Any]) -> Optional[str]:
+    """'ndjson' or 'json' when the request asks for a streamed response.
+
+    Taken from a ``stream`` query argument or search parameter (true means
+    ndjson), or an ``Accept: application/x-ndjson`` header. Raises
+    ValidationError for any other ``stream`` value.
+    """
+    requested = request.args.get('stream', search_params.pop('stream', None))
+    if requested in (None, False, 'false', '0'):
+        return 'ndjson' if request.accept_mimetypes.best == NDJSON_MIMETYPE else None
+    if requested in (True, 'true', '1'):
+        return 'ndjson'
+    if requested not in STREAM_FORMATS:
+        raise ValidationError(f"stream must be one of {', '.join(STREAM_FORMATS)}", field='stream')
+    return requested
+
+
+def _stream_response(records: Iterable[Dict[str, Any]], stream_format: str, key: str = 'properties',
+                     count_key: str = 'total', **fields) -> Response:
+    """Send each record as soon as it is produced, then a summary.
+
+    ndjson sends one record per line and a final ``{"summary": {...}}`` line;
+    json sends the endpoint's usual ``{"properties": [...], "success": ...,
+    "total": ...}`` object (``key`` and ``count_key`` name the array and the
+    count, ``fields`` are added to it) with the array written as it fills.
+    The first record is produced before responding, so errors up to the
+    first page get the endpoint's usual error response; later ones are
+    reported in the summary.
+    """
+    started = time.perf_counter()
+    records = iter(records)
+    first = next(records, None)
+
+    def generate():
+        total = 0
+        error = None
+        if stream_format == 'json':
+            yield f'{{{json.dumps(key)}: ['
+        try:
+            for record in chain([first], records) if first is not None else ():
+                text = json.dumps(record, default=str)
+                if stream_format == 'ndjson':
+                    yield text + '\n'
+                else:
+                    yield ('\n' if not total else ',\n') + text
+                total += 1
+        except Exception as e:
+            logger.error(f"Streamed search failed after {total} properties: {e}")
+            error = str(e)
+
+        summary = {'success': error is None, count_key: total, **fields,
+                   'seconds': round(time.perf_counter() - started, 3)}
+        if error is not None:
+            summary['error'] = error
+        if stream_format == 'ndjson':
+            yield json.dumps({'summary': summary}) + '\n'
+        else:
+            # The summary's keys close the object the properties array was opened in
+            yield '\n], ' + json.dumps(summary)[1:]
+
+    mimetype = NDJSON_MIMETYPE if stream_format == 'ndjson' else 'application/json'
+    # Keeps buffering reverse proxies from holding the records back until the end
+    return Response(stream_with_context(generate()), mimetype=mimetype, headers={'X-Accel-Buffering': 'no'})
+
+
 @app.route('/api/realtor/search', methods=['POST'])
 def search_properties():
     """Search for properties using the integrated parsers"""
@@ -41,6 +121,12 @@ def search_properties():
                 'total': 0
             }), 400
 
+        stream_format = _stream_format(search_params)
+        if stream_format:
+            # search_properties' filters, with its defaults for the processing options
+            properties = scraper.iter_properties(**search_params)
+            return _stream_response((property_to_dict(prop) for prop in properties), stream_format)
+
         # Search properties using the scraper
         properties = scraper.search_properties(**search_params)
         
@@ -61,6 +147,14 @@ def search_properties():
             'total': len(serialized_properties)
         })
 
+    except ValidationError as e:
+        logger.error(f"Validation error in property search: {e}")
+        return jsonify({
+            'success': False,
+            'error': f'Validation error: {str(e)}',
+            'properties': [],
+            'total': 0
+        }), 400
     except Exception as e:
         logger.error(f"Property search failed: {e}")
         return jsonify({
@@ -70,6 +164,69 @@ def search_properties():
             'total': 0
         }), 500
 
+@app.route('/api/realtor/search/batch', methods=['POST'])
+def search_properties_batch():
+    """Run one search against many locations, de-duplicating homes found by several of them"""
+    try:
+        search_params = request.get_json()
+        locations = (search_params or {}).get('locations')
+        if not isinstance(locations, list) or not locations:
+            return jsonify({
+                'success': False,
+                'error': 'locations must be a non-empty list',
+                'properties': [],
+                'total': 0
+            }), 400
+        if len(locations) > MAX_BATCH_LOCATIONS:
+            return jsonify({
+                'success': False,
+                'error': f'At most {MAX_BATCH_LOCATIONS} locations per batch',
+                'properties': [],
+                'total': 0
+            }), 400
+
+        result = scrape_properties_batch(
+            locations=locations,
+            listing_type=search_params.get('listing_type', 'for_sale'),
+            return_type='pydantic',
+            property_type=search_params.get('property_type'),
+            radius=search_params.get('radius'),
+            mls_only=search_params.get('mls_only', False),
+            past_days=search_params.get('past_days'),
+            proxy=search_params.get('proxy'),
+            date_from=search_params.get('date_from'),
+            date_to=search_params.get('date_to'),
+            extra_property_data=search_params.get('extra_property_data', True),
+            exclude_pending=search_params.get('exclude_pending', False),
+            limit=search_params.get('limit', 10000),
+            fields=search_params.get('fields'),
+            max_concurrency=search_params.get('max_concurrency', 8)
+        )
+
+        return jsonify({
+            'success': True,
+            'properties': [property_to_dict(prop) for prop in result.properties],
+            'total': len(result.properties),
+            'locations': [asdict(report) for report in result.locations]
+        })
+
+    except (ValueError, InvalidListingType, InvalidDate) as e:
+        logger.error(f"Validation error in batch search: {e}")
+        return jsonify({
+            'success': False,
+            'error': f'Validation error: {str(e)}',
+            'properties': [],
+            'total': 0
+        }), 400
+    except Exception as e:
+        logger.error(f"Batch search failed: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'properties': [],
+            'total': 0
+        }), 500
+
 @app.route('/api/realtor/property/<property_id>', methods=['GET'])
 def get_property_details(property_id):
     """Get detailed information for a specific property"""
@@ -159,6 +316,16 @@ def search_properties_advanced():
         extra_property_data = search_params.pop('extra_property_data', False)
         exclude_pending = search_params.pop('exclude_pending', False)
 
+        stream_format = _stream_format(search_params)
+        if stream_format:
+            properties = scraper.iter_properties(
+                mls_only=mls_only,
+                extra_property_data=extra_property_data,
+                exclude_pending=exclude_pending,
+                **search_params
+            )
+            return _stream_response((property_to_dict(prop) for prop in properties), stream_format)
+
         # Search properties using the advanced method
         properties = scraper.search_properties_advanced(
             mls_only=mls_only,
@@ -182,6 +349,14 @@ def search_properties_advanced():
             'total': len(serialized_properties)
         })
 
+    except ValidationError as e:
+        logger.error(f"Validation error in advanced property search: {e}")
+        return jsonify({
+            'success': False,
+            'error': f'Validation error: {str(e)}',
+            'properties': [],
+            'total': 0
+        }), 400
     except Exception as e:
         logger.error(f"Advanced property search failed: {e}")
         return jsonify({
@@ -210,6 +385,19 @@ def search_properties_comprehensive():
         extra_property_data = search_params.pop('extra_property_data', True)  # Default to True for comprehensive
         exclude_pending = search_params.pop('exclude_pending', False)
 
+        stream_format = _stream_format(search_params)
+        if stream_format:
+            # iter_properties yields Property objects; flat rows are made from them as they arrive
+            rows = search_params.pop('rows', False)
+            properties = scraper.iter_properties(
+                mls_only=mls_only,
+                extra_property_data=extra_property_data,
+                exclude_pending=exclude_pending,
+                **search_params
+            )
+            serialize = (lambda prop: json_record(property_row(prop))) if rows else property_to_dict
+            return _stream_response(map(serialize, properties), stream_format)
+
         # Search properties using the comprehensive method
         properties = scraper.search_properties_comprehensive(
             mls_only=mls_only,
@@ -233,6 +421,14 @@ def search_properties_comprehensive():
             'total': len(serialized_properties)
         })
 
+    except ValidationError as e:
+        logger.error(f"Validation error in comprehensive property search: {e}")
+        return jsonify({
+            'success': False,
+            'error': f'Validation error: {str(e)}',
+            'properties': [],
+            'total': 0
+        }), 400
     except Exception as e:
         logger.error(f"Comprehensive property search failed: {e}")
         return jsonify({
@@ -256,6 +452,9 @@ def search_properties_enhanced():
                 'total': 0
             }), 400
 
+        stream_format = _stream_format(search_params)
+        fields = search_params.pop('fields', None)
+
         # Create ScraperInput from request data
         try:
             scraper_input = ScraperInput(**search_params)
@@ -269,34 +468,34 @@ def search_properties_enhanced():
 
         # Create enhanced scraper
         enhanced_scraper = DreameryPropertyScraper.from_scraper_input(scraper_input)
+
+        # The same search whichever method serves it
+        search_kwargs = dict(
+            location=scraper_input.location,
+            listing_type=scraper_input.listing_type.value,
+            property_types=[pt.value for pt in scraper_input.property_type] if scraper_input.property_type else None,
+            radius=scraper_input.radius,
+            past_days=scraper_input.last_x_days,
+            limit=scraper_input.limit,
+            mls_only=scraper_input.mls_only,
+            extra_property_data=scraper_input.extra_property_data,
+            exclude_pending=scraper_input.exclude_pending,
+            date_from=scraper_input.date_from,
+            date_to=scraper_input.date_to,
+            fields=fields
+        )
+
+        if stream_format:
+            properties = enhanced_scraper.iter_properties(**search_kwargs)
+            return _stream_response((property_to_dict(prop) for prop in properties), stream_format)
         
         # Perform search based on return type
-        if scraper_input.return_type == ReturnType.PANDAS:
+        if scraper_input.return_type == ReturnType.pandas:
             # For pandas return type, use comprehensive search
-            properties = enhanced_scraper.search_properties_comprehensive(
-                location=scraper_input.location,
-                listing_type=scraper_input.listing_type.value,
-                property_types=[pt.value for pt in scraper_input.property_type] if scraper_input.property_type else None,
-                radius=scraper_input.radius,
-                past_days=scraper_input.last_x_days,
-                limit=scraper_input.limit,
-                mls_only=scraper_input.mls_only,
-                extra_property_data=scraper_input.extra_property_data,
-                exclude_pending=scraper_input.exclude_pending
-            )
+            properties = enhanced_scraper.search_properties_comprehensive(**search_kwargs)
         else:
             # For other return types, use standard search
-            properties = enhanced_scraper.search_properties_advanced(
-                location=scraper_input.location,
-                listing_type=scraper_input.listing_type.value,
-                property_types=[pt.value for pt in scraper_input.property_type] if scraper_input.property_type else None,
-                radius=scraper_input.radius,
-                past_days=scraper_input.last_x_days,
-                limit=scraper_input.limit,
-                mls_only=scraper_input.mls_only,
-                extra_property_data=scraper_input.extra_property_data,
-                exclude_pending=scraper_input.exclude_pending
-            )
+            properties = enhanced_scraper.search_properties_advanced(**search_kwargs)
         
         # Convert Property objects to dictionaries for JSON serialization
         serialized_properties = []
@@ -314,6 +513,14 @@ def search_properties_enhanced():
             'return_type': scraper_input.return_type.value
         })
 
+    except ValidationError as e:
+        logger.error(f"Validation error in enhanced property search: {e}")
+        return jsonify({
+            'success': False,
+            'error': f'Validation error: {str(e)}',
+            'properties': [],
+            'total': 0
+        }), 400
     except Exception as e:
         logger.error(f"Enhanced property search failed: {e}")
         return jsonify({
@@ -347,6 +554,8 @@ def scrape_properties_api():
 
         listing_type = search_params.get('listing_type', 'for_sale')
         return_type = search_params.get('return_type', 'pandas')
+        if request.accept_mimetypes.best == ARROW_STREAM_MIMETYPE:
+            return_type = 'arrow'
         property_type = search_params.get('property_type')
         radius = search_params.get('radius')
         mls_only = search_params.get('mls_only', False)
@@ -358,6 +567,33 @@ def scrape_properties_api():
         extra_property_data = search_params.get('extra_property_data', True)
         exclude_pending = search_params.get('exclude_pending', False)
         limit = search_params.get('limit', 10000)
+        fields = search_params.get('fields')
+
+        stream_format = _stream_format(search_params)
+        if stream_format and return_type != 'arrow':
+            # Validated before the first request; properties are serialized page by page
+            properties = iter_properties(
+                location=location,
+                listing_type=listing_type,
+                property_type=property_type,
+                radius=radius,
+                mls_only=mls_only,
+                past_days=past_days,
+                proxy=proxy,
+                date_from=date_from,
+                date_to=date_to,
+                foreclosure=foreclosure,
+                extra_property_data=extra_property_data,
+                exclude_pending=exclude_pending,
+                limit=limit,
+                fields=fields
+            )
+            if return_type == 'pandas':
+                columns = output_columns(fields)
+                records = (json_record(property_row(prop), columns) for prop in properties)
+            else:
+                records = (prop.model_dump(mode='json') for prop in properties)
+            return _stream_response(records, stream_format, key='data', count_key='count', return_type=return_type)
 
         # Call the high-level scraping API
         results = scrape_property(
@@ -374,11 +610,18 @@ def scrape_properties_api():
             foreclosure=foreclosure,
             extra_property_data=extra_property_data,
             exclude_pending=exclude_pending,
-            limit=limit
+            limit=limit,
+            fields=fields,
+            # Records go out as JSON, which the untyped object columns serialize as is
+            dtype_backend=None
         )
 
         # Handle different return types
-        if return_type == 'pandas':
+        if return_type == 'arrow':
+            # Binary Arrow IPC stream; the row count travels in a header
+            return Response(arrow_stream(results), mimetype=ARROW_STREAM_MIMETYPE,
+                            headers={'X-Result-Count': str(results.num_rows)})
+        elif return_type == 'pandas':
             # Convert pandas DataFrame to JSON
             if hasattr(results, 'to_dict'):
                 data = results.to_dict('records')
@@ -402,7 +645,7 @@ def scrape_properties_api():
             'count': len(data) if isinstance(data, list) else len(data) if hasattr(data, '__len__') else 1
         })
 
-    except ValueError as e:
+    except (ValueError, ValidationError) as e:
         logger.error(f"Validation error in scrape API: {e}")
         return jsonify({
             'success': False,
@@ -423,7 +666,9 @@ def health_check():
     return jsonify({
         'success': True,
         'status': 'healthy',
-        'message': 'Realtor API is running'
+        'message': 'Realtor API is running',
+        'location_cache': scraper.location_cache.stats(),
+        'rate_limits': rate_limiters.stats()
     })
 
 def property_data_to_dict(property_data: PropertyData) -> Dict[str, Any]:
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Local realtor.com stand-in for offline benchmarks and load tests
+
+Serves autocomplete and GraphQL search/detail requests either from recorded
+fixtures (see transport.py) or from synthesized homes, with configurable
+latency and injected 429s. Point the scraper at it with:
+
+    REALTOR_TRANSPORT=standin REALTOR_STANDIN_URL=http://127.0.0.1:8765
+"""
+
+import argparse
+import json
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from transport import FixtureStore, encode_body
+
+logger = logging.getLogger(__name__)
+
+DETAIL_ALIAS = re.compile(r'(home_\d+): home\(property_id: "([^"]+)"\)')
+PAGE_LIMIT = re.compile(r'limit: (\d+)')
+PRICE_FILTER = re.compile(r'list_price: \{([^}]*)\}')
+RANGE_BOUND = re.compile(r'(min|max): (\d+)')
+
+
+@dataclass
+class StandInConfig:
+    """What the stand-in serves and how it misbehaves"""
+    fixture_dir: Optional[str] = None
+    total: int = 1000
+    photos: int = 25
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    throttle_rate: float = 0.0
+    result_window: int = 10000
+    seed: int = 0
+
+
+def synthesized_price(index: int) -> int:
+    """List price of synthesized home ``index``, spread over $50k-$2M so price shards split evenly"""
+    return 50000 + (index * 7919) % 1950 * 1000
+
+
+def synthesize_home(index: int, city: str = "Dallas", state_code: str = "TX", photos: int = 25) -> Dict[str, Any]:
+    """A home_search result with the shape and rough size of a real one; deterministic per index"""
+    rng = random.Random(index)
+    property_id = str(9000000000 + index)
+    price = synthesized_price(index)
+    sqft = rng.randint(700, 5000)
+    list_date = date(2020, 1, 1) + timedelta(days=index % 1800)
+    street = f"{100 + index % 9800} {rng.choice(['Oak', 'Elm', 'Maple', 'Cedar', 'Pine'])}"
+    photo_key = f"{index:08x}"
+    return {
+        "property_id": property_id,
+        "listing_id": str(2900000000 + index),
+        "href": f"https://www.realtor.com/realestateandhomes-detail/M{property_id}",
+        "permalink": f"{street.replace(' ', '-')}-St_{city.replace(' ', '-')}_{state_code}_75201_M{property_id}",
+        "status": "for_sale",
+        "mls_status": "Active",
+        "list_date": f"{list_date.isoformat()}T00:00:00Z",
+        "pending_date": None,
+        "last_sold_date": None,
+        "last_sold_price": None,
+        "list_price": price,
+        "list_price_min": None,
+        "list_price_max": None,
+        "price_per_sqft": price // sqft,
+        "tags": rng.sample(["garage", "central_air", "hardwood_floors", "pool", "fireplace", "updated_kitchen"], 3),
+        "flags": {"is_pending": None, "is_contingent": None, "is_new_construction": rng.random() < 0.05},
+        "description": {
+            "type": rng.choice(["single_family", "condos", "townhomes"]),
+            "beds": rng.randint(1, 6),
+            "baths_full": rng.randint(1, 4),
+            "baths_half": rng.randint(0, 2),
+            "sqft": sqft,
+            "lot_sqft": rng.randint(2000, 20000),
+            "year_built": rng.randint(1920, 2024),
+            "garage": rng.randint(0, 3),
+            "stories": rng.randint(1, 3),
+            "text": "Beautifully updated home close to parks, schools and shopping. " * 6,
+            "name": None,
+        },
+        "source": {"id": f"{state_code}MLS", "listing_id": f"MLS{index:07d}"},
+        "hoa": {"fee": rng.choice([None, 50, 150, 400])},
+        "location": {
+            "address": {
+                "street_direction": None,
+                "street_number": street.split()[0],
+                "street_name": street.split()[1],
+                "street_suffix": "St",
+                "line": f"{street} St",
+                "unit": None,
+                "city": city,
+                "state_code": state_code,
+                "postal_code": "75201",
+                "coordinate": {"lon": -96.8 + rng.uniform(-0.3, 0.3), "lat": 32.7 + rng.uniform(-0.3, 0.3)},
+            },
+            "county": {"name": "Dallas", "fips_code": "48113"},
+            "neighborhoods": [{"name": "Uptown"}, {"name": "Oak Lawn"}],
+        },
+        "primary_photo": {"href": f"https://ap.rdcpix.com/{photo_key}/{property_id}-m0s.jpg"},
+        "photos": [
+            {"href": f"https://ap.rdcpix.com/{photo_key}/{property_id}-m{n}s.jpg", "title": None,
+             "tags": [{"label": rng.choice(["exterior", "kitchen", "bedroom", "bathroom", "living_room"])}]}
+            for n in range(photos)
+        ],
+        "advertisers": [{
+            "type": "seller",
+            "name": f"Agent {index % 500}",
+            "email": f"agent{index % 500}@example.com",
+            "phones": [{"number": "2145550100", "type": "Mobile", "primary": True}],
+            "office": {"name": f"Brokerage {index % 40}", "email": None, "phones": []},
+            "broker": {"name": f"Brokerage {index % 40}"},
+        }],
+    }
+
+
+def synthesize_details(property_id: str) -> Dict[str, Any]:
+    """Detail-level fields (schools, tax history) for a batched GetHomes alias"""
+    rng = random.Random(property_id)
+    assessed = rng.randint(100000, 1500000)
+    return {
+        "property_id": property_id,
+        "nearbySchools": {"schools": [{"district": {"name": "Dallas ISD"}}]},
+        "taxHistory": [
+            {"year": 2024 - n, "tax": assessed // 50, "assessment": {"building": assessed * 3 // 4,
+                                                                      "land": assessed // 4, "total": assessed}}
+            for n in range(5)
+        ],
+    }
+
+
+class RealtorStandIn(ThreadingHTTPServer):
+    """HTTP server answering the scraper's autocomplete and GraphQL requests"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], config: Optional[StandInConfig] = None):
+        self.config = config or StandInConfig()
+        self.store = FixtureStore(self.config.fixture_dir) if self.config.fixture_dir else None
+        self.rng = random.Random(self.config.seed)
+        self.requests = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+        super().__init__(address, StandInHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def next_delay(self) -> Tuple[float, bool]:
+        """(seconds to wait, whether to answer 429) for the next request"""
+        with self._lock:
+            self.requests += 1
+            jitter = self.rng.uniform(-self.config.jitter_ms, self.config.jitter_ms)
+            throttle = self.rng.random() < self.config.throttle_rate
+            if throttle:
+                self.throttled += 1
+        return max(0.0, self.config.latency_ms + jitter) / 1000.0, throttle
+
+    def autocomplete(self, location: str) -> Dict[str, Any]:
+        parts = [part.strip() for part in location.split(",")]
+        return {"autocomplete": [{
+            "area_type": "city",
+            "city": parts[0] or "Dallas",
+            "state_code": parts[1] if len(parts) > 1 and parts[1] else "TX",
+            "centroid": {"lon": -96.8, "lat": 32.7},
+        }]}
+
+    def graphql(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        query = payload.get("query", "")
+        aliases = DETAIL_ALIAS.findall(query)
+        if aliases:
+            return {"data": {alias: synthesize_details(property_id) for alias, property_id in aliases}}
+
+        variables = payload.get("variables") or {}
+        offset = variables.get("offset") or 0
+        page_size = int(PAGE_LIMIT.search(query).group(1)) if PAGE_LIMIT.search(query) else 200
+        matches = self._matching_indexes(query)
+        page = matches[offset:offset + page_size] if offset < self.config.result_window else []
+        city = variables.get("city") or "Dallas"
+        state_code = variables.get("state_code") or "TX"
+        return {"data": {"home_search": {
+            "total": len(matches),
+            "results": [synthesize_home(index, city, state_code, self.config.photos) for index in page],
+        }}}
+
+    def _matching_indexes(self, query: str) -> List[int]:
+        indexes = range(self.config.total)
+        price_filter = PRICE_FILTER.search(query)
+        if not price_filter:
+            return list(indexes)
+        bounds = dict(RANGE_BOUND.findall(price_filter.group(1)))
+        low, high = int(bounds.get("min", 0)), int(bounds.get("max", 10 ** 12))
+        return [index for index in indexes if low <= synthesized_price(index) <= high]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server: RealtorStandIn
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._handle(None)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self._handle(self.rfile.read(length) if length else b"")
+
+    def _handle(self, body: Optional[bytes]):
+        delay, throttle = self.server.next_delay()
+        if delay:
+            time.sleep(delay)
+        if throttle:
+            return self._send(429, {"error": "Too Many Requests"}, {"Retry-After": "1"})
+
+        if self.server.store is not None:
+            recorded = self.server.store.load(self.command, self.path, body)
+            if recorded is None:
+                return self._send(404, {"error": f"No recorded exchange for {self.command} {self.path}"})
+            return self._send(recorded["status"], recorded["body"])
+
+        parts = urlsplit(self.path)
+        if self.command == "GET":
+            location = parse_qs(parts.query).get("input", [""])[0]
+            return self._send(200, self.server.autocomplete(location))
+        if parts.path == "/auth/token":
+            return self._send(200, {"access_token": "standin-token", "expires_in": 1800})
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return self._send(400, {"errors": [{"message": "Request body is not JSON"}]})
+        return self._send(200, self.server.graphql(payload))
+
+    def _send(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None):
+        content = encode_body(body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local realtor.com stand-in for offline benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", help="Replay exchanges recorded with REALTOR_TRANSPORT=record from this directory")
+    parser.add_argument("--total", type=int, default=1000, help="Homes matched by every synthesized search")
+    parser.add_argument("--photos", type=int, default=25, help="Photos per synthesized home")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean response latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter on the latency")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    config = StandInConfig(
+        fixture_dir=args.fixtures, total=args.total, photos=args.photos, latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms, throttle_rate=args.throttle_rate, seed=args.seed,
+    )
+    server = RealtorStandIn((args.host, args.port), config)
+    print(f"realtor.com stand-in listening on {server.url}")
+    print(f"   REALTOR_TRANSPORT=standin REALTOR_STANDIN_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Content-addressed cache for realtor.com GraphQL search responses
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+from models import ListingType
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """SQLite-backed cache of GraphQL payloads keyed on a canonical query hash.
+
+    Bodies are stored zlib-compressed. Entries expire per listing type: sold
+    data changes rarely and can live for days, while for_sale results go stale
+    in minutes. With ``stale_while_revalidate`` an expired entry inside the
+    ``max_stale`` window is served immediately while one background refresh
+    per key replaces it.
+
+    Misses are not decoded twice: the scraper streams the live response and
+    hands its raw body to ``store_body`` once the page has been read to the
+    end. A page abandoned part way (e.g. a search that hit its limit) is
+    not stored.
+    """
+
+    DEFAULT_TTLS = {
+        "sold": 3 * 24 * 3600,
+        "pending": 30 * 60,
+        "for_rent": 15 * 60,
+        "for_sale": 5 * 60,
+    }
+    DEFAULT_TTL = 5 * 60
+
+    def __init__(self, db_path: str, ttls: Optional[Dict[str, float]] = None,
+                 stale_while_revalidate: bool = False, max_stale: float = 3600):
+        self.db_path = db_path
+        self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_stale = max_stale
+
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, body BLOB NOT NULL, listing_type TEXT, "
+            "created_at REAL NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(query: str, variables: Optional[Dict[str, Any]]) -> str:
+        """Canonical hash of the query text (whitespace-insensitive) plus its variables"""
+        canonical = json.dumps(
+            {"query": re.sub(r"\s+", " ", query).strip(), "variables": variables or {}},
+            sort_keys=True, separators=(",", ":"), default=str,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, listing_type: Union[str, ListingType, None]) -> float:
+        if isinstance(listing_type, ListingType):
+            listing_type = listing_type.value
+        return self.ttls.get((listing_type or "").lower(), self.DEFAULT_TTL)
+
+    def lookup(self, query: str, variables: Optional[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Return (payload, is_stale); payload is None on a miss or past the stale window"""
+        key = self.make_key(query, variables)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or (row[1] <= now and (not self.stale_while_revalidate or row[1] + self.max_stale <= now)):
+                self.misses += 1
+                return None, False
+
+            payload = json.loads(zlib.decompress(row[0]))
+            if row[1] > now:
+                self.hits += 1
+                return payload, False
+            self.stale_hits += 1
+            return payload, True
+
+    def store(self, query: str, variables: Optional[Dict[str, Any]],
+              listing_type: Union[str, ListingType, None], payload: Dict[str, Any]) -> None:
+        """Cache a successful payload; error or empty responses are never stored"""
+        if not payload or payload.get("errors") or not payload.get("data"):
+            return
+
+        self.store_body(query, variables, listing_type, json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+    def store_body(self, query: str, variables: Optional[Dict[str, Any]],
+                   listing_type: Union[str, ListingType, None], body: bytes) -> None:
+        """Cache an already-serialized successful payload as is"""
+        key = self.make_key(query, variables)
+        now = time.time()
+        body = zlib.compress(body)
+        listing_type_value = listing_type.value if isinstance(listing_type, ListingType) else listing_type
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, body, listing_type, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, body, listing_type_value, now, now + self.ttl_for(listing_type)),
+            )
+            self._db.commit()
+
+    def fetch(self, query: str, variables: Optional[Dict[str, Any]],
+              listing_type: Union[str, ListingType, None],
+              fetcher: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Serve from cache, revalidating stale entries in the background when enabled"""
+        payload, is_stale = self.lookup(query, variables)
+        if payload is not None:
+            if is_stale:
+                self.revalidate_in_background(query, variables, listing_type, fetcher)
+            return payload
+
+        payload = fetcher()
+        self.store(query, variables, listing_type, payload)
+        return payload
+
+    def claim_refresh(self, query: str, variables: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Reserve the single background refresh for a key; None if one is already running"""
+        key = self.make_key(query, variables)
+        with self._lock:
+            if key in self._refreshing:
+                return None
+            self._refreshing.add(key)
+            return key
+
+    def release_refresh(self, key: str) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def purge_expired(self) -> int:
+        """Delete entries that are past their stale window; returns the number removed"""
+        cutoff = time.time() - (self.max_stale if self.stale_while_revalidate else 0)
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (cutoff,))
+            self._db.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "entries": entries,
+                "stale_while_revalidate": self.stale_while_revalidate,
+            }
+
+    def revalidate_in_background(self, query, variables, listing_type, fetcher) -> None:
+        """Replace a stale entry with ``fetcher()`` on a background thread, once per key at a time"""
+        key = self.claim_refresh(query, variables)
+        if key is None:
+            return
+
+        def refresh():
+            try:
+                self.store(query, variables, listing_type, fetcher())
+            except Exception as e:
+                logger.error(f"Background cache refresh failed: {e}")
+            finally:
+                self.release_refresh(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+
+_shared_cache: Optional[ResponseCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process-wide response cache, enabled by setting RESPONSE_CACHE_DB"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None and os.getenv('RESPONSE_CACHE_DB'):
+            _shared_cache = ResponseCache(
+                db_path=os.getenv('RESPONSE_CACHE_DB'),
+                stale_while_revalidate=os.getenv('RESPONSE_CACHE_SWR', 'false').lower() == 'true',
+                max_stale=float(os.getenv('RESPONSE_CACHE_MAX_STALE_SECONDS', '3600')),
+            )
+        return _shared_cache
@@ -2,13 +2,25 @@
 High-level property scraping API with comprehensive validation
 """
 
-import warnings
+import logging
+from datetime import date
 import pandas as pd
-from typing import Union, Optional, List, Dict
+from typing import TYPE_CHECKING, Union, Optional, List, Dict, Iterator
 from enhanced_scraper import ScraperInput
 from models import ListingType, SearchPropertyType, ReturnType, Property
 from dreamery_property_scraper import DreameryPropertyScraper
-from utils import process_result, ordered_properties, validate_input, validate_dates, validate_limit
+from exceptions import ScrapingError
+from batch_search import NUM_LOCATION_WORKERS, BatchSearchResult, run_batch_search
+from incremental import PropertyChanges, WatermarkStore, detect_changes, make_query_key
+from queries import resolve_search_fields
+from arrow_output import property_table, require_pyarrow
+from utils import (property_row, property_frame, ordered_properties, apply_property_dtypes, validate_input,
+                   validate_dates, validate_limit, validate_dtype_backend)
+
+if TYPE_CHECKING:  # pyarrow is optional; only the annotations name it here
+    import pyarrow as pa
+
+logger = logging.getLogger(__name__)
 
 
 
@@ -21,37 +33,71 @@ def scrape_property(
     radius: float = None,
     mls_only: bool = False,
     past_days: int = None,
-    proxy: str = None,
+    proxy: Union[str, List[str]] = None,
     date_from: str = None,
     date_to: str = None,
     foreclosure: bool = None,
     extra_property_data: bool = True,
     exclude_pending: bool = False,
-    limit: int = 10000
-) -> Union[pd.DataFrame, List[dict], List[Property]]:
+    limit: int = 10000,
+    incremental_db: Optional[str] = None,
+    sweep_removals: bool = False,
+    fields: Union[str, List[str], None] = None,
+    dtype_backend: Optional[str] = "numpy_nullable"
+) -> Union[pd.DataFrame, "pa.Table", List[dict], List[Property], PropertyChanges]:
     """
     Scrape properties from Realtor.com based on a given location and listing type.
     
     :param location: Location to search (e.g. "Dallas, TX", "85281", "2530 Al Lipscomb Way")
     :param listing_type: Listing Type (for_sale, for_rent, sold, pending)
-    :param return_type: Return type (pandas, pydantic, raw)
+    :param return_type: Return type (pandas, pydantic, arrow, raw). arrow returns a pyarrow Table with
+        the fixed arrow_output.property_schema of the DataFrame columns (requires pyarrow).
     :param property_type: Property Type (single_family, multi_family, condos, condo_townhome_rowhome_coop, condo_townhome, townhomes, duplex_triplex, farm, land, mobile)
     :param radius: Get properties within _ (e.g. 1.0) miles. Only applicable for individual addresses.
     :param mls_only: If set, fetches only listings with MLS IDs.
-    :param proxy: Proxy to use for scraping
+    :param proxy: Proxy to use for scraping. A list or comma-separated string of proxies spreads
+        requests across a health-scored pool, retiring proxies that keep failing.
     :param past_days: Get properties sold or listed (dependent on your listing_type) in the last _ days.
         - PENDING: Filters by pending_date. Contingent properties without pending_date are included.
         - SOLD: Filters by sold_date (when property was sold)
         - FOR_SALE/FOR_RENT: Filters by list_date (when property was listed)
     :param date_from, date_to: Get properties sold or listed (dependent on your listing_type) between these dates. format: 2021-01-28
     :param foreclosure: If set, fetches only foreclosure listings.
-    :param extra_property_data: Increases requests by O(n). If set, this fetches additional property data (e.g. agent, broker, property evaluations etc.)
+    :param extra_property_data: Increases requests by O(n / DETAIL_BATCH_SIZE). If set, this fetches additional property data (e.g. schools, tax history, property evaluations etc.) in batched detail queries.
     :param exclude_pending: If true, this excludes pending or contingent properties from the results, unless listing type is pending.
-    :param limit: Limit the number of results returned. Maximum is 10,000.
+    :param limit: Limit the number of results returned. Maximum is 100,000; area searches matching more
+        than the 10,000 results one query can page through are split into price/date shards.
+    :param incremental_db: Path to a SQLite watermark store. When set, only listings newer than the
+        last successful run of the same query are fetched (unless past_days/date_from are given) and
+        only changes are returned: a DataFrame (or Table) with a change_type column (insert, update,
+        removed) for pandas and arrow, otherwise a PropertyChanges.
+    :param sweep_removals: With incremental_db, also fetch the ids of every current match (one small
+        request per page) to report known listings that disappeared as removals.
+    :param fields: Only request what is needed for these output columns (e.g. ["property_id", "list_price",
+        "latitude", "longitude"]) or a profile: "pins" (price, coordinates, photo), "table" (the DataFrame
+        columns) or "full" (default). With a column list the DataFrame is limited to those columns.
+    :param dtype_backend: DataFrame column types for pandas: "numpy_nullable" (default) gives the typed
+        utils.PROPERTY_DTYPES schema (categoricals, nullable Int32/Int64/Float, datetime64 dates),
+        "pyarrow" the same types as pyarrow-backed dtypes, None the untyped object columns.
     """
     validate_input(listing_type)
     validate_dates(date_from, date_to)
     validate_limit(limit)
+    validate_dtype_backend(dtype_backend)
+    resolve_search_fields(fields)
+
+    store = query_key = None
+    watermark, known = None, {}
+    if incremental_db:
+        store = WatermarkStore(incremental_db)
+        query_key = make_query_key(
+            location, listing_type, property_type=property_type, radius=radius, mls_only=mls_only,
+            foreclosure=foreclosure, exclude_pending=exclude_pending, fields=fields,
+        )
+        watermark, known = store.load(query_key)
+        if watermark and not (past_days or date_from):
+            # Re-read the watermark day itself; more listings can land on it after a run
+            date_from, date_to = watermark.isoformat(), date.today().isoformat()
 
     scraper_input = ScraperInput(
         location=location,
@@ -70,10 +116,13 @@ def scrape_property(
         limit=limit,
     )
 
+    if scraper_input.return_type == ReturnType.arrow:
+        require_pyarrow()
+
     scraper = DreameryPropertyScraper.from_scraper_input(scraper_input)
     
     # Use appropriate search method based on return type
-    if scraper_input.return_type == ReturnType.pandas:
+    if scraper_input.return_type in (ReturnType.pandas, ReturnType.arrow):
         results = scraper.search_properties_comprehensive(
             location=scraper_input.location,
             listing_type=scraper_input.listing_type.value.lower(),
@@ -83,7 +132,12 @@ def scrape_property(
             limit=scraper_input.limit,
             mls_only=scraper_input.mls_only,
             extra_property_data=scraper_input.extra_property_data,
-            exclude_pending=scraper_input.exclude_pending
+            exclude_pending=scraper_input.exclude_pending,
+            date_from=scraper_input.date_from,
+            date_to=scraper_input.date_to,
+            fields=fields,
+            # Flat rows are all the DataFrame or Table needs, and cheap to bring back from parse workers
+            rows=store is None
         )
     else:
         results = scraper.search_properties_advanced(
@@ -95,19 +149,213 @@ def scrape_property(
             limit=scraper_input.limit,
             mls_only=scraper_input.mls_only,
             extra_property_data=scraper_input.extra_property_data,
-            exclude_pending=scraper_input.exclude_pending
+            exclude_pending=scraper_input.exclude_pending,
+            date_from=scraper_input.date_from,
+            date_to=scraper_input.date_to,
+            fields=fields
         )
 
-    if scraper_input.return_type != ReturnType.pandas:
-        return results
+    if store is not None:
+        changes, seen = detect_changes(results, known, scraper_input.listing_type, watermark)
+        if sweep_removals and known:
+            try:
+                current_ids = scraper.search_property_ids(
+                    scraper_input.location, scraper_input.listing_type.value.lower(), radius=scraper_input.radius
+                )
+                changes.removals = sorted(set(known) - current_ids - set(seen))
+            except ScrapingError as e:
+                logger.warning(f"Skipping removal sweep: {e}")
+        store.save(query_key, changes.watermark, seen, changes.removals)
 
-    properties_dfs = [df for result in results if not (df := process_result(result)).empty]
-    if not properties_dfs:
-        return pd.DataFrame()
+        if scraper_input.return_type == ReturnType.pandas:
+            return _changes_to_dataframe(changes, fields, dtype_backend)
+        if scraper_input.return_type == ReturnType.arrow:
+            return _changes_to_table(changes, fields)
+        return changes
 
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore", category=FutureWarning)
+    if scraper_input.return_type == ReturnType.pandas:
+        return _to_dataframe(results, fields, dtype_backend)
+    if scraper_input.return_type == ReturnType.arrow:
+        return property_table(results, output_columns(fields))
+    return results
 
-        return pd.concat(properties_dfs, ignore_index=True, axis=0)[ordered_properties()].replace(
-            {"None": pd.NA, None: pd.NA, "": pd.NA}
-        )
+
+def iter_properties(
+    location: str,
+    listing_type: str = "for_sale",
+    property_type: Optional[List[str]] = None,
+    radius: float = None,
+    mls_only: bool = False,
+    past_days: int = None,
+    proxy: Union[str, List[str]] = None,
+    date_from: str = None,
+    date_to: str = None,
+    extra_property_data: bool = True,
+    exclude_pending: bool = False,
+    limit: int = 10000,
+    fields: Union[str, List[str], None] = None,
+    foreclosure: bool = None
+) -> Iterator[Property]:
+    """
+    Yield Property objects page by page instead of building the full result list.
+
+    Takes scrape_property's search arguments and validates them before the
+    first request. The next page is fetched while the caller handles the
+    current one, so exporting 10,000 listings keeps at most two pages resident.
+    """
+    validate_input(listing_type)
+    validate_dates(date_from, date_to)
+    validate_limit(limit)
+    resolve_search_fields(fields)
+
+    scraper_input = ScraperInput(
+        location=location,
+        listing_type=ListingType(listing_type.upper()),
+        return_type=ReturnType.pydantic,
+        property_type=[SearchPropertyType[prop.upper()] for prop in property_type] if property_type else None,
+        proxy=proxy,
+        radius=radius,
+        mls_only=mls_only,
+        last_x_days=past_days,
+        date_from=date_from,
+        date_to=date_to,
+        foreclosure=foreclosure,
+        extra_property_data=extra_property_data,
+        exclude_pending=exclude_pending,
+        limit=limit,
+    )
+
+    scraper = DreameryPropertyScraper.from_scraper_input(scraper_input)
+    return scraper.iter_properties(
+        location=scraper_input.location,
+        listing_type=scraper_input.listing_type.value.lower(),
+        property_types=[pt.value for pt in scraper_input.property_type] if scraper_input.property_type else None,
+        radius=scraper_input.radius,
+        past_days=scraper_input.last_x_days,
+        limit=scraper_input.limit,
+        mls_only=scraper_input.mls_only,
+        extra_property_data=scraper_input.extra_property_data,
+        exclude_pending=scraper_input.exclude_pending,
+        date_from=scraper_input.date_from,
+        date_to=scraper_input.date_to,
+        fields=fields
+    )
+
+
+def scrape_properties_batch(
+    locations: List[str],
+    listing_type: str = "for_sale",
+    return_type: str = "pandas",
+    property_type: Optional[List[str]] = None,
+    radius: float = None,
+    mls_only: bool = False,
+    past_days: int = None,
+    proxy: Union[str, List[str]] = None,
+    date_from: str = None,
+    date_to: str = None,
+    extra_property_data: bool = True,
+    exclude_pending: bool = False,
+    limit: int = 10000,
+    fields: Union[str, List[str], None] = None,
+    max_concurrency: int = NUM_LOCATION_WORKERS,
+    dtype_backend: Optional[str] = "numpy_nullable"
+) -> BatchSearchResult:
+    """
+    Run the same search against many locations (e.g. a list of ZIP codes or cities).
+
+    Takes scrape_property's search arguments; ``limit`` applies per location.
+    Locations are resolved concurrently, then up to ``max_concurrency`` searches
+    run at once through one scraper, so they share its connection pool, proxy
+    pool and the per-host rate limiter. Homes matched by several locations are
+    returned once, for the first location that found them.
+
+    :return: BatchSearchResult whose ``properties`` is a DataFrame for pandas, a pyarrow Table
+        for arrow, otherwise a list of Property, and whose ``locations`` reports each location's result count,
+        duplicates, timings and error (None on success).
+    """
+    validate_input(listing_type)
+    validate_dates(date_from, date_to)
+    validate_limit(limit)
+    validate_dtype_backend(dtype_backend)
+    resolve_search_fields(fields)
+
+    scraper_input = ScraperInput(
+        location=locations[0] if locations else "",
+        listing_type=ListingType(listing_type.upper()),
+        return_type=ReturnType(return_type.lower()),
+        property_type=[SearchPropertyType[prop.upper()] for prop in property_type] if property_type else None,
+        proxy=proxy,
+        radius=radius,
+        mls_only=mls_only,
+        last_x_days=past_days,
+        date_from=date_from,
+        date_to=date_to,
+        extra_property_data=extra_property_data,
+        exclude_pending=exclude_pending,
+        limit=limit,
+    )
+    if scraper_input.return_type == ReturnType.arrow:
+        require_pyarrow()
+    scraper = DreameryPropertyScraper.from_scraper_input(scraper_input)
+
+    def search(location: str) -> List[Property]:
+        return list(scraper.iter_properties(
+            location=location,
+            listing_type=scraper_input.listing_type.value.lower(),
+            property_types=[pt.value for pt in scraper_input.property_type] if scraper_input.property_type else None,
+            radius=scraper_input.radius,
+            past_days=scraper_input.last_x_days,
+            limit=scraper_input.limit,
+            mls_only=scraper_input.mls_only,
+            extra_property_data=scraper_input.extra_property_data,
+            exclude_pending=scraper_input.exclude_pending,
+            date_from=scraper_input.date_from,
+            date_to=scraper_input.date_to,
+            fields=fields
+        ))
+
+    result = run_batch_search(scraper, locations, search, max_concurrency)
+    if scraper_input.return_type == ReturnType.pandas:
+        result.properties = _to_dataframe(result.properties, fields, dtype_backend)
+    elif scraper_input.return_type == ReturnType.arrow:
+        result.properties = property_table(result.properties, output_columns(fields))
+    return result
+
+
+def output_columns(fields: Union[str, List[str], None]) -> List[str]:
+    """DataFrame columns for the requested fields; profiles keep every column"""
+    if fields is None or isinstance(fields, str):
+        return ordered_properties
+    columns = [column for column in ordered_properties if column == "property_id" or column in fields]
+    return columns if len(columns) > 1 else ordered_properties
+
+
+def _to_dataframe(results: List[Union[Property, Dict[str, object]]],
+                  fields: Union[str, List[str], None] = None,
+                  dtype_backend: Optional[str] = None) -> pd.DataFrame:
+    """DataFrame from Properties or utils.property_row rows, built a column at a time"""
+    return property_frame(results, output_columns(fields), dtype_backend)
+
+
+def _changes_to_dataframe(changes: PropertyChanges, fields: Union[str, List[str], None] = None,
+                          dtype_backend: Optional[str] = None) -> pd.DataFrame:
+    """Inserted and updated listings plus one row per removed property_id, tagged by change_type"""
+    change_types = {prop.property_id: "insert" for prop in changes.inserts}
+    change_types.update({prop.property_id: "update" for prop in changes.updates})
+
+    df = _to_dataframe(changes.inserts + changes.updates, fields)
+    if not df.empty:
+        df["change_type"] = df["property_id"].map(change_types)
+    if changes.removals:
+        removed = pd.DataFrame({"property_id": changes.removals, "change_type": "removed"})
+        df = pd.concat([df, removed], ignore_index=True) if not df.empty else removed
+    # Typed after the removed rows are added, so concatenating does not fall back to object columns
+    return apply_property_dtypes(df, dtype_backend) if dtype_backend else df
+
+
+def _changes_to_table(changes: PropertyChanges, fields: Union[str, List[str], None] = None) -> "pa.Table":
+    """_changes_to_dataframe as an Arrow table: removed listings are rows holding only property_id"""
+    rows = [{**property_row(prop), "change_type": "insert"} for prop in changes.inserts]
+    rows += [{**property_row(prop), "change_type": "update"} for prop in changes.updates]
+    rows += [{"property_id": property_id, "change_type": "removed"} for property_id in changes.removals]
+    return property_table(rows, output_columns(fields) + ["change_type"])
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Memory held per listing: Property models vs compact listing records
+
+Builds synthesized realtor.com homes (see realtor_standin.py) into Property
+models, converts them to ListingRecords and ListingBatches, and reports the
+bytes each representation keeps alive, measured with tracemalloc.
+
+    python scripts/benchmark_listing_memory.py --homes 20000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from listing_record import ListingBatch, ListingRecord
+from model_builder import ModelBuilder
+from processors import process_property
+from realtor_standin import synthesize_home
+
+
+def held(build):
+    """Bytes still allocated once ``build()`` returns, with its result kept alive"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def report(name: str, count: int, size: int):
+    per_listing = size / count
+    print(f"  {name:<32} {per_listing:>8,.0f} bytes/listing  {per_listing * 1_000_000 / 2**30:6.2f} GiB per million")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the memory held by Property models and listing records")
+    parser.add_argument("--homes", type=int, default=20000)
+    parser.add_argument("--photos", type=int, default=25, help="Photos per synthesized home")
+    parser.add_argument("--trusted", action="store_true", help="Build the Property models without validation")
+    args = parser.parse_args()
+
+    builder = ModelBuilder(trusted=args.trusted)
+
+    def properties():
+        # Homes are synthesized inside each measurement so every string is owned by what is kept
+        return (process_property(synthesize_home(index, photos=args.photos), builder=builder)
+                for index in range(args.homes))
+
+    print(f"{args.homes} synthesized homes ({args.photos} photos each)")
+    for name, build in [
+        ("Property", lambda: list(properties())),
+        ("ListingRecord", lambda: [ListingRecord.from_property(prop) for prop in properties()]),
+        ("ListingRecord, keep_extra=False", lambda: [ListingRecord.from_property(prop, keep_extra=False)
+                                                     for prop in properties()]),
+        ("ListingBatch, keep_extra=False", lambda: ListingBatch.from_properties(properties(), keep_extra=False)),
+    ]:
+        _, size = held(build)
+        report(name, args.homes, size)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Property build throughput: full validation vs the trusted fast path
+
+Builds synthesized realtor.com homes (see realtor_standin.py) into Property
+models with each ModelBuilder mode and reports records per second. With
+--end-to-end the same comparison runs through a real search against an
+in-process stand-in server, so paging, decoding and detail batches are
+included. With --parse-workers N the flat-row parse is also timed through a
+ParsePool of N worker processes.
+
+    python scripts/benchmark_property_build.py --homes 10000
+    python scripts/benchmark_property_build.py --homes 10000 --end-to-end
+    python scripts/benchmark_property_build.py --homes 10000 --parse-workers 4
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_builder import ModelBuilder
+from parse_pool import ParsePool, PropertyParser
+from processors import process_property
+from realtor_standin import RealtorStandIn, StandInConfig, synthesize_home
+
+
+def builders(sample_every: int):
+    return [
+        ("full", ModelBuilder()),
+        ("trusted", ModelBuilder(trusted=True)),
+        (f"trusted, validate 1/{sample_every}", ModelBuilder(trusted=True, validate_every=sample_every)),
+    ]
+
+
+def report(name: str, count: int, seconds: float, baseline: float = None):
+    rate = count / seconds if seconds else float("inf")
+    speedup = f"  {baseline / seconds:.2f}x" if baseline else ""
+    print(f"  {name:<28} {count:>7} records  {seconds:7.3f}s  {rate:>10,.0f} records/s{speedup}")
+
+
+def bench_build(homes: int, photos: int, sample_every: int, repeat: int):
+    raw = [synthesize_home(index, photos=photos) for index in range(homes)]
+    print(f"process_property on {homes} synthesized homes ({photos} photos each), best of {repeat}")
+    baseline = None
+    for name, builder in builders(sample_every):
+        best = min(timeit.repeat(lambda: [process_property(home, builder=builder) for home in raw],
+                                 setup="gc.enable()", number=1, repeat=repeat))
+        report(name, homes, best, baseline)
+        baseline = baseline or best
+
+
+def bench_parse_pool(homes: int, photos: int, workers: int, repeat: int):
+    raw = [synthesize_home(index, photos=photos) for index in range(homes)]
+    parser = PropertyParser(rows=True)
+    pool = ParsePool(max_workers=workers)
+    pool.map(parser, raw[:pool.min_batch])  # start the workers outside the timing
+
+    print(f"flat rows for {homes} synthesized homes, in-process vs {workers} worker processes, best of {repeat}")
+    try:
+        baseline = min(timeit.repeat(lambda: [parser(home) for home in raw], number=1, repeat=repeat))
+        report("in-process", homes, baseline)
+        report(f"{workers} workers", homes, min(timeit.repeat(lambda: pool.map(parser, raw), number=1, repeat=repeat)),
+               baseline)
+    finally:
+        pool.close()
+
+
+def bench_end_to_end(homes: int, photos: int, sample_every: int):
+    server = RealtorStandIn(("127.0.0.1", 0), StandInConfig(total=homes, photos=photos))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["REALTOR_TRANSPORT"] = "standin"
+    os.environ["REALTOR_STANDIN_URL"] = server.url
+
+    from dreamery_property_scraper import DreameryPropertyScraper
+    from location_cache import LocationCache
+
+    print(f"search_properties_advanced for {homes} homes against the stand-in at {server.url}")
+    baseline = None
+    try:
+        for name, builder in builders(sample_every):
+            scraper = DreameryPropertyScraper(location_cache=LocationCache(), model_builder=builder)
+            started = time.perf_counter()
+            properties = scraper.search_properties_advanced("Dallas, TX", limit=homes)
+            elapsed = time.perf_counter() - started
+            report(name, len(properties), elapsed, baseline)
+            baseline = baseline or elapsed
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full and trusted Property construction")
+    parser.add_argument("--homes", type=int, default=5000)
+    parser.add_argument("--photos", type=int, default=25, help="Photos per synthesized home")
+    parser.add_argument("--sample-every", type=int, default=1000, help="Sampled validation rate for the third run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--end-to-end", action="store_true", help="Also time a full search against the stand-in")
+    parser.add_argument("--parse-workers", type=int, default=0, help="Also time the parse pool with this many workers")
+    args = parser.parse_args()
+
+    bench_build(args.homes, args.photos, args.sample_every, args.repeat)
+    if args.parse_workers:
+        print()
+        bench_parse_pool(args.homes, args.photos, args.parse_workers, args.repeat)
+    if args.end_to_end:
+        print()
+        bench_end_to_end(args.homes, args.photos, args.sample_every)
+
+
+if __name__ == "__main__":
+    main()
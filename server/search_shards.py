@@ -0,0 +1,124 @@
+"""
+Price band / date window shards for splitting oversized home_search queries
+"""
+
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+from typing import List, Optional, Union
+from models import ListingType
+
+# home_search refuses offsets past this many results
+MAX_RESULT_WINDOW = 10000
+# Largest limit a search accepts; area searches past one result window are split into shards
+MAX_SEARCH_LIMIT = 100000
+
+DATE_FIELDS = {
+    "sold": "sold_date",
+    "pending": "pending_date",
+}
+PRICE_FIELDS = {
+    "sold": "sold_price",
+}
+
+
+def _listing_type_value(listing_type: Union[str, ListingType, None]) -> str:
+    if isinstance(listing_type, ListingType):
+        listing_type = listing_type.value
+    return (listing_type or "").lower()
+
+
+def date_field_for(listing_type: Union[str, ListingType, None]) -> str:
+    """The date a listing type is filtered on (sold_date for sold, list_date for active listings)"""
+    return DATE_FIELDS.get(_listing_type_value(listing_type), "list_date")
+
+
+def price_field_for(listing_type: Union[str, ListingType, None]) -> str:
+    """The price a listing type is sharded on (sold_price for sold, list_price otherwise)"""
+    return PRICE_FIELDS.get(_listing_type_value(listing_type), "list_price")
+
+
+@dataclass(frozen=True)
+class SearchShard:
+    """A slice of a search bounded by an inclusive price band and date window.
+
+    ``None`` bounds are open-ended. Shards are split price-first, since prices
+    spread listings far more evenly than dates; once a price band is narrower
+    than ``MIN_PRICE_BAND`` the date window is bisected instead, down to a
+    single day. Homes without a price fall into no price band, so when the
+    price bands of an unpriced shard add up to less than its total the
+    planners split it by date (``split_dates``) instead.
+    """
+
+    date_field: str = "list_date"
+    price_field: str = "list_price"
+    price_min: Optional[int] = None
+    price_max: Optional[int] = None
+    date_min: Optional[date] = None
+    date_max: Optional[date] = None
+
+    MIN_PRICE_BAND = 1000
+    PRICE_PIVOT = 500000
+    DATE_HORIZON_DAYS = 365 * 30
+
+    @classmethod
+    def for_listing_type(cls, listing_type: Union[str, ListingType, None]) -> "SearchShard":
+        return cls(date_field=date_field_for(listing_type), price_field=price_field_for(listing_type))
+
+    @classmethod
+    def for_search(cls, listing_type: Union[str, ListingType, None], past_days: Optional[int] = None,
+                   date_from: Optional[str] = None, date_to: Optional[str] = None) -> "SearchShard":
+        """Root shard for a search's past_days / date_from..date_to window (YYYY-MM-DD)"""
+        date_min = date.fromisoformat(date_from) if date_from else None
+        date_max = date.fromisoformat(date_to) if date_to else None
+        if past_days:
+            date_min = date.today() - timedelta(days=past_days)
+        return cls(date_field=date_field_for(listing_type), price_field=price_field_for(listing_type),
+                   date_min=date_min, date_max=date_max)
+
+    @property
+    def is_unpriced(self) -> bool:
+        """True while no price band applies, so homes without a price are still included"""
+        return self.price_min is None and self.price_max is None
+
+    def split(self) -> List["SearchShard"]:
+        """Halve the shard; an empty list means it cannot be narrowed any further"""
+        low = self.price_min or 0
+        if self.price_max is None:
+            mid = max(2 * low, self.PRICE_PIVOT)
+            return [replace(self, price_min=low, price_max=mid), replace(self, price_min=mid + 1)]
+        if self.price_max - low >= self.MIN_PRICE_BAND:
+            mid = (low + self.price_max) // 2
+            return [replace(self, price_min=low, price_max=mid), replace(self, price_min=mid + 1)]
+        return self.split_dates()
+
+    def split_dates(self) -> List["SearchShard"]:
+        """Halve the date window, keeping the price band; empty once it is a single day"""
+        start = self.date_min or date.today() - timedelta(days=self.DATE_HORIZON_DAYS)
+        end = self.date_max or date.today()
+        if end <= start:
+            return []
+        mid = start + (end - start) // 2
+        return [replace(self, date_max=mid), replace(self, date_min=mid + timedelta(days=1))]
+
+    def query_filters(self) -> str:
+        """GraphQL home_search filter clauses for this shard's bounds"""
+        filters = []
+        price = self._range(self.price_min, self.price_max)
+        if price:
+            filters.append(f"{self.price_field}: {{{price}}}")
+        window = self._range(
+            f'"{self.date_min.isoformat()}"' if self.date_min else None,
+            f'"{self.date_max.isoformat()}"' if self.date_max else None,
+        )
+        if window:
+            filters.append(f"{self.date_field}: {{{window}}}")
+        return "\n".join(filters)
+
+    @staticmethod
+    def _range(minimum, maximum) -> str:
+        bounds = []
+        if minimum is not None:
+            bounds.append(f"min: {minimum}")
+        if maximum is not None:
+            bounds.append(f"max: {maximum}")
+        return ", ".join(bounds)
@@ -0,0 +1,45 @@
+"""
+realtor.com sessions shared by the scrapers
+"""
+
+import requests
+from rate_limiter import MAX_THROTTLE_RETRIES, RateLimiterRegistry, rate_limiters
+from token_manager import RealtorTokenAuth
+from transport import mount_transport
+
+DEFAULT_HEADERS = {
+    "accept": "application/json, text/javascript",
+    "accept-language": "en-US,en;q=0.9",
+    "cache-control": "no-cache",
+    "content-type": "application/json",
+    "origin": "https://www.realtor.com",
+    "pragma": "no-cache",
+    "priority": "u=1, i",
+    "rdc-ab-tests": "commute_travel_time_variation:v1",
+    "sec-ch-ua": '"Not)A;Brand";v="99", "Google Chrome";v="127", "Chromium";v="127"',
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": '"Windows"',
+    "sec-fetch-dest": "empty",
+    "sec-fetch-mode": "cors",
+    "sec-fetch-site": "same-origin",
+    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36",
+}
+
+
+def create_session(registry: RateLimiterRegistry = rate_limiters,
+                   max_throttle_retries: int = MAX_THROTTLE_RETRIES) -> requests.Session:
+    """Build a realtor.com session whose requests wait on the given per-host rate limiters.
+
+    REALTOR_TRANSPORT swaps the transport to record, replay or a local
+    stand-in server (see transport.py).
+    """
+    session = mount_transport(requests.Session(), registry=registry, max_throttle_retries=max_throttle_retries)
+    session.headers.update(DEFAULT_HEADERS)
+    # graph.realtor.com requests carry the shared access token, refreshed once if it is rejected
+    session.auth = RealtorTokenAuth()
+    return session
+
+
+def create_proxy_session(registry: RateLimiterRegistry) -> requests.Session:
+    """Session for one ProxyPool proxy; throttles go straight back to the pool, which retries on another proxy"""
+    return create_session(registry, max_throttle_retries=0)
@@ -32,6 +32,7 @@ def start_server():
         print("📍 Server will be available at: http://localhost:8001")
         print("🔍 API endpoints:")
         print("   - POST /api/realtor/search - Search properties")
+        print("   - POST /api/realtor/search/batch - Search many locations at once")
         print("   - GET  /api/realtor/property/<id> - Get property details")
         print("   - GET  /api/realtor/suggestions - Get suggestions")
         print("   - GET  /api/realtor/health - Health check")
@@ -1,6 +1,10 @@
 import pytest
+import io
+import json
+import re
 import sys
 import os
+import threading
 
 # Add the server directory to the Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -48,6 +52,174 @@ def sample_property_data():
         }
     }
 
+@pytest.fixture
+def raw_home_factory():
+    """Factory for raw home_search results shaped like the GraphQL response"""
+    def make_raw_home(property_id: str = "1234567890", **overrides):
+        home = {
+            "property_id": property_id,
+            "listing_id": f"listing_{property_id}",
+            "href": f"https://www.realtor.com/realestateandhomes-detail/{property_id}",
+            "permalink": f"123-Test-St_Test-City_TX_12345_M{property_id}",
+            "status": "for_sale",
+            "mls_status": "Active",
+            "list_date": "2024-01-15T00:00:00Z",
+            "pending_date": None,
+            "last_sold_date": None,
+            "last_sold_price": None,
+            "list_price": 500000,
+            "list_price_min": None,
+            "list_price_max": None,
+            "price_per_sqft": 250,
+            "tags": ["garage"],
+            "flags": {"is_pending": None, "is_contingent": None, "is_new_construction": None},
+            "description": {
+                "type": "single_family",
+                "beds": 3,
+                "baths_full": 2,
+                "baths_half": 1,
+                "sqft": 2000,
+                "lot_sqft": 5000,
+                "year_built": 2020,
+                "garage": 2,
+                "stories": 2,
+                "text": "A test home",
+                "name": None,
+            },
+            "source": {"id": "TXMLS", "listing_id": "MLS123"},
+            "hoa": {"fee": 100},
+            "location": {
+                "address": {
+                    "street_direction": None,
+                    "street_number": "123",
+                    "street_name": "Test",
+                    "street_suffix": "St",
+                    "line": "123 Test St",
+                    "unit": None,
+                    "city": "Test City",
+                    "state_code": "TX",
+                    "postal_code": "12345",
+                    "coordinate": {"lon": -96.8, "lat": 32.7},
+                },
+                "county": {"name": "Dallas", "fips_code": "48113"},
+                "neighborhoods": [{"name": "Downtown"}],
+            },
+            "primary_photo": {"href": "https://ap.rdcpix.com/test/photo-s.jpg"},
+            "photos": [{"href": "https://ap.rdcpix.com/test/photo1-s.jpg", "title": None, "tags": []}],
+            "advertisers": [],
+        }
+        home.update(overrides)
+        return home
+
+    return make_raw_home
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response"""
+
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self._payload
+
+    @property
+    def raw(self):
+        return io.BytesIO(json.dumps(self._payload).encode("utf-8"))
+
+    def close(self):
+        pass
+
+
+class FakeRealtorSession:
+    """In-memory realtor.com upstream serving autocomplete, search pages and detail batches.
+
+    ``cities`` maps city names to their own homes, for multi-location searches.
+    """
+
+    DETAIL_ALIAS = re.compile(r'(home_\d+): home\(property_id: "([^"]+)"\)')
+    RANGE_FILTER = re.compile(r'(list_price|sold_price|list_date|sold_date|pending_date): \{([^}]*)\}')
+    # home_search filter names whose values come back under a different key
+    RESULT_KEYS = {"sold_price": "last_sold_price", "sold_date": "last_sold_date"}
+
+    def __init__(self, homes, page_size=200, location_info=None, details=None, result_window=10000, cities=None):
+        self.homes = homes
+        self.cities = cities
+        self.page_size = page_size
+        self.result_window = result_window
+        self.location_info = location_info or {"area_type": "city", "city": "Test City", "state_code": "TX"}
+        self.details = details or {}
+        self.requests = []
+        self.proxies = {}
+        self._lock = threading.Lock()
+
+    def _record(self, kind, value):
+        with self._lock:
+            self.requests.append((kind, value))
+
+    def requests_of(self, kind):
+        return [value for request_kind, value in self.requests if request_kind == kind]
+
+    def request(self, method, url, **kwargs):
+        return self.get(url, **kwargs) if method == "GET" else self.post(url, **kwargs)
+
+    def get(self, url, params=None, **kwargs):
+        self._record("location", params["input"])
+        if self.cities is None:
+            return FakeResponse({"autocomplete": [self.location_info]})
+        city = params["input"].split(",")[0].strip()
+        return FakeResponse({"autocomplete": [{**self.location_info, "city": city}] if city in self.cities else []})
+
+    def post(self, url, json=None, **kwargs):
+        query = json["query"]
+        if "GetHomes" in query:
+            aliases = self.DETAIL_ALIAS.findall(query)
+            self._record("detail_batch", [property_id for _, property_id in aliases])
+            return FakeResponse({"data": {
+                alias: {"property_id": property_id, **self.details.get(property_id, {})}
+                for alias, property_id in aliases
+            }})
+
+        offset = json["variables"]["offset"]
+        self._record("search_page", offset)
+        self._record("search_query", query)
+        homes = self._filter(query, json["variables"].get("city"))
+        page = homes[offset:offset + self.page_size] if offset < self.result_window else []
+        return FakeResponse({"data": {"home_search": {"total": len(homes), "results": page}}})
+
+    def _filter(self, query, city=None):
+        """Apply home_search range filters (list_price, *_date) embedded in the query"""
+        homes = self.homes if self.cities is None else self.cities.get(city, [])
+        for field, bounds in self.RANGE_FILTER.findall(query):
+            is_date = field.endswith("_date")
+            name = self.RESULT_KEYS.get(field, field)
+            key = (lambda h: h[name][:10]) if is_date else (lambda h: h[name])
+            for bound, value in re.findall(r'(min|max): "?([^",]+)"?', bounds):
+                value = value if is_date else float(value)
+                homes = [
+                    h for h in homes
+                    if h.get(name) is not None and (key(h) >= value if bound == "min" else key(h) <= value)
+                ]
+        return homes
+
+
+@pytest.fixture
+def fake_realtor_session():
+    """Factory for an in-memory realtor.com upstream"""
+    return FakeRealtorSession
+
+
+@pytest.fixture
+def realtor_upstream(monkeypatch):
+    """Route every scraper built by scrape_property to one in-memory upstream"""
+    import dreamery_property_scraper
+    from location_cache import LocationCache
+
+    session = FakeRealtorSession([])
+    monkeypatch.setattr(dreamery_property_scraper, "create_session", lambda *args, **kwargs: session)
+    monkeypatch.setattr(dreamery_property_scraper, "get_location_cache", LocationCache)
+    return session
+
 # Skip slow tests unless explicitly requested
 def pytest_configure(config):
     config.addinivalue_line(
@@ -0,0 +1,75 @@
+import sys
+from datetime import date
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+import arrow_output
+import cli
+from arrow_output import ARROW_STREAM_MIMETYPE, arrow_stream, property_schema, property_table, write_parquet
+from processors import process_property
+from scraper_api import scrape_property
+from utils import ordered_properties, property_row
+
+
+def test_property_table_has_the_fixed_schema(raw_home_factory, caplog):
+    properties = [process_property(raw_home_factory(str(i), hoa=None if i % 2 else {"fee": 100})) for i in range(3)]
+    rows = [property_row(prop) for prop in properties]
+    rows[2]["list_price"] = "call for price"
+
+    table = property_table(rows)
+
+    assert table.schema == property_schema() and table.column_names == ordered_properties
+    assert pa.types.is_dictionary(table.schema.field("city").type)
+    assert table.column("list_date").to_pylist() == [date(2024, 1, 15)] * 3
+    assert table.column("hoa_fee").to_pylist() == [100, None, 100]
+    assert table.column("list_price").to_pylist() == [500000, 500000, None]
+    assert "Dropped 1 list_price values" in caplog.text
+    assert property_table([]).schema == property_schema()
+
+
+def test_parquet_and_arrow_stream_round_trip(raw_home_factory, tmp_path):
+    table = property_table([process_property(raw_home_factory(str(i))) for i in range(3)])
+
+    write_parquet(table, tmp_path / "homes.parquet")
+
+    assert pq.read_table(tmp_path / "homes.parquet").equals(table)
+    assert pa.ipc.open_stream(arrow_stream(table)).read_all().equals(table)
+
+
+def test_scrape_property_returns_arrow_tables(raw_home_factory, realtor_upstream, tmp_path):
+    realtor_upstream.homes = [raw_home_factory(str(i)) for i in range(3)]
+
+    table = scrape_property("Test City, TX", return_type="arrow", fields=["list_price"])
+    changes = scrape_property("Test City, TX", return_type="arrow", incremental_db=str(tmp_path / "state.db"))
+
+    assert table.column_names == ["property_id", "list_price"] and table.num_rows == 3
+    assert changes.column("change_type").to_pylist() == ["insert"] * 3
+
+
+def test_scrape_property_reports_missing_pyarrow(monkeypatch):
+    monkeypatch.setattr(arrow_output, "pa", None)
+
+    with pytest.raises(ImportError, match="pyarrow"):
+        scrape_property("Test City, TX", return_type="arrow")
+
+
+def test_scrape_endpoint_streams_arrow(raw_home_factory, realtor_upstream):
+    from realtor_api import app
+
+    realtor_upstream.homes = [raw_home_factory(str(i)) for i in range(3)]
+    response = app.test_client().post("/api/realtor/scrape", json={"location": "Test City, TX"},
+                                      headers={"Accept": ARROW_STREAM_MIMETYPE})
+
+    assert response.status_code == 200 and response.mimetype == ARROW_STREAM_MIMETYPE
+    assert response.headers["X-Result-Count"] == "3"
+    assert pa.ipc.open_stream(response.data).read_all().column("property_id").to_pylist() == ["0", "1", "2"]
+
+
+def test_cli_writes_parquet(raw_home_factory, realtor_upstream, tmp_path, monkeypatch):
+    realtor_upstream.homes = [raw_home_factory(str(i)) for i in range(3)]
+    monkeypatch.setattr(sys, "argv", ["cli.py", "Test City, TX", "--output", "parquet", "--filename", "homes",
+                                      "--output_dir", str(tmp_path)])
+
+    cli.main()
+
+    assert pq.read_table(tmp_path / "homes.parquet").column("property_id").to_pylist() == ["0", "1", "2"]
@@ -0,0 +1,54 @@
+import asyncio
+from async_property_scraper import AsyncDreameryPropertyScraper
+from models import Property
+from location_cache import LocationCache
+
+
+class FakeAsyncScraper(AsyncDreameryPropertyScraper):
+    """Async scraper with the HTTP layer replaced by in-memory responses"""
+
+    def __init__(self, homes):
+        super().__init__(location_cache=LocationCache())
+        self.homes = homes
+        self.requests = []
+
+    async def _get_json(self, url, params=None):
+        self.requests.append(("GET", params["input"]))
+        return {"autocomplete": [{"area_type": "city", "city": "Test City", "state_code": "TX"}]}
+
+    async def _post_json(self, url, payload):
+        offset = payload["variables"]["offset"]
+        self.requests.append(("POST", offset))
+        await asyncio.sleep(0)
+        page = self.homes[offset:offset + self.DEFAULT_PAGE_SIZE]
+        return {"data": {"home_search": {"total": len(self.homes), "results": page}}}
+
+
+def test_async_search_pages_concurrently(raw_home_factory):
+    scraper = FakeAsyncScraper([raw_home_factory(str(i)) for i in range(450)])
+
+    results = asyncio.run(scraper.search_properties("Test City, TX", limit=1000))
+
+    assert len(results) == 450
+    assert all(isinstance(result, Property) for result in results)
+    assert [result.property_id for result in results] == [str(i) for i in range(450)]
+    assert sorted(offset for method, offset in scraper.requests if method == "POST") == [0, 200, 400]
+
+
+def test_async_search_handles_unknown_location():
+    class NoLocationScraper(FakeAsyncScraper):
+        async def _get_json(self, url, params=None):
+            return {"autocomplete": []}
+
+    scraper = NoLocationScraper([])
+
+    assert asyncio.run(scraper.search_properties("Nowhere")) == []
+
+
+def test_async_location_lookup_is_cached():
+    scraper = FakeAsyncScraper([])
+
+    asyncio.run(scraper._handle_location("Test City, TX"))
+    asyncio.run(scraper._handle_location("test city tx"))
+
+    assert [request for request in scraper.requests if request[0] == "GET"] == [("GET", "Test City, TX")]
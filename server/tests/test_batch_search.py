@@ -0,0 +1,93 @@
+import pytest
+from batch_search import run_batch_search
+from dreamery_property_scraper import DreameryPropertyScraper
+from exceptions import InvalidListingType
+from location_cache import LocationCache
+from scraper_api import scrape_properties_batch
+
+
+@pytest.fixture
+def three_cities(raw_home_factory, realtor_upstream):
+    realtor_upstream.cities = {
+        "Austin": [raw_home_factory(str(i)) for i in (1, 2, 3)],
+        "Round Rock": [raw_home_factory(str(i)) for i in (3, 4)],
+        "Pflugerville": [],
+    }
+    return realtor_upstream
+
+
+def test_batch_dedupes_and_reports_each_location(three_cities):
+    result = scrape_properties_batch(
+        ["Austin, TX", "Round Rock, TX", "Pflugerville, TX", "Nowhere, TX"], return_type="pydantic"
+    )
+
+    assert [prop.property_id for prop in result.properties] == ["1", "2", "3", "4"]
+    reports = {report.location: report for report in result.locations}
+    assert (reports["Austin, TX"].count, reports["Austin, TX"].duplicates) == (3, 0)
+    assert (reports["Round Rock, TX"].count, reports["Round Rock, TX"].duplicates) == (2, 1)
+    assert reports["Pflugerville, TX"].count == 0 and reports["Pflugerville, TX"].error is None
+    assert reports["Nowhere, TX"].error == "Could not find location: Nowhere, TX"
+    assert all(report.resolve_seconds >= 0 for report in result.locations)
+
+
+def test_batch_returns_dataframe_for_pandas(three_cities):
+    result = scrape_properties_batch(["Austin, TX", "Round Rock, TX"], extra_property_data=False)
+
+    assert sorted(result.properties["property_id"]) == ["1", "2", "3", "4"]
+
+
+def test_batch_validates_before_searching(three_cities):
+    with pytest.raises(InvalidListingType):
+        scrape_properties_batch(["Austin, TX"], listing_type="for_lease")
+
+    assert three_cities.requests == []
+
+
+def test_batch_records_search_errors(fake_realtor_session):
+    scraper = DreameryPropertyScraper(location_cache=LocationCache())
+    scraper.session = fake_realtor_session([])
+
+    def search(location):
+        if location == "Bad":
+            raise RuntimeError("upstream exploded")
+        return []
+
+    result = run_batch_search(scraper, ["Good", "Bad"], search)
+
+    assert [report.error for report in result.locations] == [None, "upstream exploded"]
+    assert result.locations[1].search_seconds >= 0
+
+
+def test_batch_endpoint(three_cities):
+    from realtor_api import app
+
+    client = app.test_client()
+    response = client.post("/api/realtor/search/batch", json={
+        "locations": ["Austin, TX", "Round Rock, TX"], "extra_property_data": False, "limit": 50,
+    })
+
+    body = response.get_json()
+    assert response.status_code == 200 and body["total"] == 4
+    assert [report["duplicates"] for report in body["locations"]] == [0, 1]
+    assert client.post("/api/realtor/search/batch", json={"locations": []}).status_code == 400
+    assert client.post("/api/realtor/search/batch", json={
+        "locations": ["Austin, TX"], "listing_type": "for_lease",
+    }).status_code == 400
+
+
+def test_batch_reports_location_lookup_errors(fake_realtor_session):
+    scraper = DreameryPropertyScraper(location_cache=LocationCache())
+    session = fake_realtor_session([])
+    lookup = session.get
+
+    def get(url, **kwargs):
+        if kwargs.get("params", {}).get("input") == "Down":
+            raise ConnectionError("autocomplete unreachable")
+        return lookup(url, **kwargs)
+
+    session.get = get
+    scraper.session = session
+
+    result = run_batch_search(scraper, ["Up", "Down"], lambda location: [])
+
+    assert [report.error for report in result.locations] == [None, "Location lookup failed: autocomplete unreachable"]
@@ -0,0 +1,48 @@
+from datetime import datetime
+from dreamery_property_scraper import DreameryPropertyScraper
+from location_cache import LocationCache
+from models import ListingType, Property
+from processors import process_property
+
+
+def test_process_property_maps_nested_fields_in_one_pass(raw_home_factory):
+    home = raw_home_factory("1", advertisers=[{"type": "seller", "name": "Agent A", "office": {"name": "Office A"}}])
+
+    prop = process_property(home)
+
+    assert (prop.latitude, prop.longitude) == (32.7, -96.8)
+    assert (prop.county, prop.fips_code) == ("Dallas", "48113")
+    assert prop.list_date == datetime(2024, 1, 15)
+    assert prop.address.street == "123 Test St"
+    assert prop.hoa_fee == 100 and prop.mls == "TXMLS" and prop.mls_id == "MLS123"
+    assert prop.advertisers.agent.name == "Agent A" and prop.advertisers.office.name == "Office A"
+
+
+def test_process_property_parses_timestamped_sold_dates(raw_home_factory):
+    home = raw_home_factory("1", status="sold", last_sold_date="2024-03-01T00:00:00Z", last_sold_price=480000)
+
+    prop = process_property(home, listing_type=ListingType.SOLD)
+
+    assert prop.last_sold_date == datetime(2024, 3, 1)
+    assert prop.days_on_mls == 46
+
+
+def test_process_property_tolerates_projected_homes():
+    prop = process_property({"property_id": "1", "href": "https://www.realtor.com/x"})
+
+    assert prop.property_id == "1"
+    assert prop.address is None and prop.latitude is None and prop.county is None
+
+
+def test_general_search_builds_properties_and_skips_malformed_homes(raw_home_factory, fake_realtor_session):
+    broken = raw_home_factory("2")
+    del broken["href"]
+    scraper = DreameryPropertyScraper(location_cache=LocationCache())
+    scraper.session = fake_realtor_session([raw_home_factory("1"), broken, raw_home_factory("3")])
+
+    properties = scraper.search_properties("Test City, TX", limit=10)
+
+    assert [prop.property_id for prop in properties] == ["1", "3"]
+    assert all(isinstance(prop, Property) for prop in properties)
+    assert properties[0].latitude == 32.7 and properties[0].county == "Dallas"
+    assert properties[0].list_date == datetime(2024, 1, 15)
@@ -0,0 +1,153 @@
+import csv
+import json
+import os
+import sys
+import pyarrow.parquet as pq
+import pytest
+from openpyxl import load_workbook
+import cli
+import run_cli
+from export_writers import ExportCheckpoint, ExportWriter, stream_export
+from processors import process_property
+from utils import ordered_properties
+
+
+@pytest.fixture
+def properties(raw_home_factory):
+    return [process_property(raw_home_factory(str(i))) for i in range(7)]
+
+
+def interrupted(properties, after: int):
+    """The properties, failing like a dropped connection after ``after`` of them"""
+    for index, prop in enumerate(properties):
+        if index == after:
+            raise ConnectionError("connection reset")
+        yield prop
+
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_csv_and_ndjson_are_written_in_chunks(properties, tmp_path):
+    reports = []
+
+    stats = stream_export(iter(properties), str(tmp_path / "homes.csv"), "csv", chunk_size=3,
+                          progress=lambda stats: reports.append(stats.total))
+    stream_export(iter(properties), str(tmp_path / "homes.ndjson"), "ndjson", ["property_id", "list_price"])
+
+    rows = read_csv(tmp_path / "homes.csv")
+    assert list(rows[0]) == ordered_properties and [row["property_id"] for row in rows] == [str(i) for i in range(7)]
+    assert (stats.rows, reports) == (7, [3, 6, 7]) and stats.rows_per_second > 0
+    lines = (tmp_path / "homes.ndjson").read_text().splitlines()
+    assert json.loads(lines[0]) == {"property_id": "0", "list_price": 500000} and len(lines) == 7
+
+
+@pytest.mark.parametrize("output_format", ["csv", "ndjson"])
+def test_interrupted_exports_resume_from_the_checkpoint(properties, tmp_path, output_format):
+    path, checkpoint = str(tmp_path / f"homes.{output_format}"), str(tmp_path / "homes.checkpoint")
+    query = {"location": "Test City, TX"}
+
+    with pytest.raises(ConnectionError):
+        stream_export(interrupted(properties, 5), path, output_format, checkpoint_path=checkpoint, query=query,
+                      chunk_size=2)
+    assert ExportCheckpoint.load(checkpoint).rows == 4
+    with open(path, "a") as f:
+        f.write("half a row")  # written after the last checkpoint
+
+    stats = stream_export(iter(properties), path, output_format, checkpoint_path=checkpoint, resume=True,
+                          query=query, chunk_size=2)
+
+    if output_format == "csv":
+        ids = [row["property_id"] for row in read_csv(path)]
+    else:
+        ids = [json.loads(line)["property_id"] for line in open(path)]
+    assert ids == [str(i) for i in range(7)]
+    assert (stats.rows, stats.total, stats.skipped) == (3, 7, 4)
+    assert not os.path.exists(checkpoint)
+
+
+def test_resuming_a_different_export_is_refused(properties, tmp_path):
+    path, checkpoint = str(tmp_path / "homes.csv"), str(tmp_path / "homes.checkpoint")
+    with pytest.raises(ConnectionError):
+        stream_export(interrupted(properties, 3), path, "csv", checkpoint_path=checkpoint,
+                      query={"location": "A"}, chunk_size=1)
+
+    with pytest.raises(ValueError, match="different export"):
+        stream_export(iter(properties), path, "csv", checkpoint_path=checkpoint, resume=True, query={"location": "B"})
+    with pytest.raises(ValueError, match="cannot be checkpointed"):
+        stream_export(iter(properties), str(tmp_path / "homes.xlsx"), "excel", checkpoint_path=checkpoint)
+
+
+def test_excel_and_parquet_exports(properties, tmp_path):
+    stream_export(iter(properties), str(tmp_path / "homes.xlsx"), "excel", chunk_size=3)
+    stream_export(iter(properties), str(tmp_path / "homes.parquet"), "parquet", chunk_size=3)
+
+    sheet = load_workbook(tmp_path / "homes.xlsx", read_only=True).active
+    rows = list(sheet.values)
+    assert list(rows[0]) == ordered_properties and len(rows) == 8
+    parquet = pq.ParquetFile(tmp_path / "homes.parquet")
+    assert parquet.metadata.num_row_groups == 3 and parquet.read().column("list_price").to_pylist() == [500000] * 7
+
+
+def test_export_writers_must_implement_write_rows(tmp_path):
+    class NoRows(ExportWriter):
+        pass
+
+    with pytest.raises(TypeError):
+        NoRows(str(tmp_path / "out"), ordered_properties)
+
+
+def test_cli_streams_ndjson(raw_home_factory, realtor_upstream, tmp_path, monkeypatch, capsys):
+    realtor_upstream.homes = [raw_home_factory(str(i)) for i in range(3)]
+    monkeypatch.setattr(sys, "argv", ["cli.py", "Test City, TX", "--output", "ndjson", "--filename", "homes",
+                                      "--output_dir", str(tmp_path)])
+
+    cli.main()
+
+    lines = (tmp_path / "homes.ndjson").read_text().splitlines()
+    assert [json.loads(line)["property_id"] for line in lines] == ["0", "1", "2"]
+    assert "rows/s" in capsys.readouterr().out
+    assert not (tmp_path / "homes.ndjson.checkpoint").exists()
+
+
+def read_export(path, output_format):
+    if output_format == "csv":
+        return [row["property_id"] for row in read_csv(path)]
+    if output_format == "ndjson":
+        return [json.loads(line)["property_id"] for line in path.read_text().splitlines()]
+    if output_format == "json":
+        return [record["property_id"] for record in json.loads(path.read_text())]
+    if output_format == "excel":
+        rows = list(load_workbook(path).active.values)
+        column = rows[0].index("property_id")
+        return [str(row[column]) for row in rows[1:]]
+    return pq.read_table(path).column("property_id").to_pylist()
+
+
+@pytest.mark.parametrize("module", [cli, run_cli])
+@pytest.mark.parametrize("output_format,extension", [
+    ("csv", "csv"), ("ndjson", "ndjson"), ("json", "json"), ("excel", "xlsx"), ("parquet", "parquet"),
+])
+def test_cli_streams_every_output_format(module, output_format, extension, raw_home_factory, realtor_upstream,
+                                         tmp_path, monkeypatch):
+    realtor_upstream.homes = [raw_home_factory(str(i)) for i in range(3)]
+    monkeypatch.setattr(sys, "argv", ["cli.py", "Test City, TX", "--stream", "--output", output_format,
+                                      "--filename", "homes", "--output_dir", str(tmp_path)])
+
+    module.main()
+
+    assert read_export(tmp_path / f"homes.{extension}", output_format) == ["0", "1", "2"]
+
+
+@pytest.mark.parametrize("module", [cli, run_cli])
+def test_cli_rejects_streaming_object_return_types(module, realtor_upstream, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["cli.py", "Test City, TX", "--stream", "--return_type", "pydantic",
+                                      "--output_dir", str(tmp_path)])
+
+    with pytest.raises(SystemExit):
+        module.main()
+
+    assert "--return_type pydantic cannot be streamed" in capsys.readouterr().err
+    assert realtor_upstream.requests == []
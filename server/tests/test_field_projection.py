@@ -0,0 +1,89 @@
+import pytest
+from dreamery_property_scraper import DreameryPropertyScraper
+from queries import (
+    QUERY_PROFILES, REQUIRED_SEARCH_FIELDS, SEARCH_HOMES_DATA, build_search_selection, needs_property_details,
+    resolve_search_fields,
+)
+from scraper_api import scrape_property
+from utils import ordered_properties
+
+
+def test_full_profile_is_the_default_selection():
+    assert build_search_selection() == SEARCH_HOMES_DATA
+    assert build_search_selection("full") == SEARCH_HOMES_DATA
+
+
+def test_pins_profile_is_much_smaller():
+    selection = build_search_selection("pins")
+
+    assert len(selection) < len(SEARCH_HOMES_DATA) / 4
+    for field in ("property_id", "href", "list_price", "coordinate"):
+        assert field in selection
+    for field in ("photos", "advertisers", "open_houses", "units", "tax_record"):
+        assert field not in selection
+
+
+def test_table_profile_drops_fields_no_column_uses():
+    selection = build_search_selection("table")
+
+    for field in ("open_houses", "units", "pet_policy", "tax_record", "details"):
+        assert field not in selection
+    assert "advertisers" in selection and "current_estimates" in selection
+
+
+def test_columns_resolve_to_their_source_fields():
+    resolved = resolve_search_fields(["latitude", "beds", "agent_name"])
+
+    assert resolved == list(REQUIRED_SEARCH_FIELDS) + ["location", "description", "advertisers"]
+
+
+def test_every_output_column_is_resolvable():
+    resolved = resolve_search_fields(ordered_properties)
+
+    assert set(resolved) <= set(REQUIRED_SEARCH_FIELDS) | set(QUERY_PROFILES["table"])
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(ValueError):
+        resolve_search_fields(["not_a_column"])
+    with pytest.raises(ValueError):
+        build_search_selection("thumbnails")
+
+
+def test_needs_property_details():
+    assert needs_property_details(None)
+    assert needs_property_details(["list_price", "tax_history"])
+    assert not needs_property_details(["list_price", "latitude"])
+    assert not needs_property_details("pins")
+
+
+def test_processor_tolerates_projected_homes():
+    scraper = DreameryPropertyScraper()
+    pin = {
+        "property_id": "1",
+        "href": "https://www.realtor.com/realestateandhomes-detail/1",
+        "status": "for_sale",
+        "flags": {"is_pending": None, "is_contingent": None},
+        "list_price": 350000,
+        "location": {"address": {"line": "1 Main St", "city": "Austin", "coordinate": {"lat": 30.2, "lon": -97.7}}},
+    }
+
+    prop = scraper._process_property_with_processors(pin)
+
+    assert (prop.list_price, prop.latitude, prop.longitude) == (350000, 30.2, -97.7)
+    assert prop.address.city == "Austin" and prop.county is None
+
+    bare = scraper._process_property_with_processors({"property_id": "2", "href": pin["href"]})
+    assert bare.property_id == "2" and bare.address is None and bare.status is None
+
+
+def test_scrape_property_projects_query_and_columns(raw_home_factory, realtor_upstream):
+    realtor_upstream.homes = [raw_home_factory(str(i)) for i in range(3)]
+
+    df = scrape_property("Test City, TX", fields=["list_price", "latitude", "longitude"])
+
+    assert list(df.columns) == ["property_id", "list_price", "latitude", "longitude"]
+    assert len(df) == 3
+    query = realtor_upstream.requests_of("search_query")[0]
+    assert "photos" not in query and "advertisers" not in query
+    assert realtor_upstream.requests_of("detail_batch") == []
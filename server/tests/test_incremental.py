@@ -0,0 +1,130 @@
+from datetime import date
+import pytest
+from dreamery_property_scraper import DreameryPropertyScraper
+from exceptions import ScrapingError
+from incremental import (
+    PropertyChanges, WatermarkStore, changes_to_records, detect_changes, make_query_key, watermark_field,
+)
+from scraper_api import scrape_property
+
+
+@pytest.fixture
+def process_home():
+    scraper = DreameryPropertyScraper()
+    return lambda home: scraper._process_property_with_processors(home)
+
+
+def test_query_key_ignores_location_spelling_and_unset_filters():
+    assert make_query_key("Dallas, TX", "for_sale") == make_query_key("dallas tx", "FOR_SALE", radius=None)
+    assert make_query_key("Dallas, TX", "for_sale") != make_query_key("Dallas, TX", "sold")
+    assert make_query_key("Dallas, TX", "for_sale") != make_query_key("Dallas, TX", "for_sale", mls_only=True)
+
+
+def test_watermark_field_follows_listing_type():
+    assert watermark_field("sold") == "last_sold_date"
+    assert watermark_field("PENDING") == "pending_date"
+    assert watermark_field("for_rent") == "list_date"
+
+
+def test_watermark_store_round_trip(tmp_path):
+    store = WatermarkStore(str(tmp_path / "state.db"))
+    assert store.load("key") == (None, {})
+
+    store.save("key", date(2024, 1, 12), {"1": "a", "2": "b"})
+    store.save("key", date(2024, 1, 13), {"2": "c", "3": "d"}, removed=["1"])
+
+    assert store.load("key") == (date(2024, 1, 13), {"2": "c", "3": "d"})
+    assert WatermarkStore(str(tmp_path / "state.db")).load("other") == (None, {})
+
+
+def test_detect_changes(raw_home_factory, process_home):
+    original = process_home(raw_home_factory("1", list_date="2024-01-10T00:00:00Z"))
+    known = {"1": detect_changes([original], {}, "for_sale", None)[1]["1"]}
+
+    properties = [
+        process_home(raw_home_factory("1", list_date="2024-01-10T00:00:00Z", list_price=450000)),
+        process_home(raw_home_factory("2", list_date="2024-01-14T00:00:00Z")),
+    ]
+    changes, seen = detect_changes(properties, known, "for_sale", date(2024, 1, 12))
+
+    assert [prop.property_id for prop in changes.inserts] == ["2"]
+    assert [prop.property_id for prop in changes.updates] == ["1"]
+    assert changes.watermark == date(2024, 1, 14)
+    assert not changes.full_refresh
+    assert set(seen) == {"1", "2"}
+
+
+def test_unchanged_listing_is_not_an_update(raw_home_factory, process_home):
+    prop = process_home(raw_home_factory("1"))
+    _, seen = detect_changes([prop], {}, "for_sale", None)
+
+    changes, _ = detect_changes([prop], seen, "for_sale", None)
+
+    assert changes.inserts == [] and changes.updates == []
+
+
+def test_incremental_scrape_emits_inserts_updates_and_removals(tmp_path, raw_home_factory, realtor_upstream):
+    state_db = str(tmp_path / "state.db")
+    realtor_upstream.homes = [
+        raw_home_factory("1", list_date="2024-01-10T00:00:00Z"),
+        raw_home_factory("2", list_date="2024-01-11T00:00:00Z"),
+        raw_home_factory("3", list_date="2024-01-12T00:00:00Z"),
+    ]
+
+    first = scrape_property("Test City, TX", return_type="raw", incremental_db=state_db)
+
+    assert isinstance(first, PropertyChanges)
+    assert first.full_refresh
+    assert sorted(prop.property_id for prop in first.inserts) == ["1", "2", "3"]
+    assert first.watermark == date(2024, 1, 12)
+
+    realtor_upstream.homes = [
+        raw_home_factory("1", list_date="2024-01-10T00:00:00Z"),
+        raw_home_factory("3", list_date="2024-01-12T00:00:00Z", list_price=475000),
+        raw_home_factory("4", list_date="2024-01-13T00:00:00Z"),
+    ]
+    realtor_upstream.requests.clear()
+
+    second = scrape_property("Test City, TX", return_type="raw", incremental_db=state_db, sweep_removals=True)
+
+    assert [prop.property_id for prop in second.inserts] == ["4"]
+    assert [prop.property_id for prop in second.updates] == ["3"]
+    assert second.removals == ["2"]
+    assert second.watermark == date(2024, 1, 13)
+    assert WatermarkStore(state_db).load(make_query_key("Test City, TX", "for_sale"))[1].keys() == {"1", "3", "4"}
+
+
+def test_incremental_scrape_to_dataframe(tmp_path, raw_home_factory, realtor_upstream):
+    state_db = str(tmp_path / "state.db")
+    realtor_upstream.homes = [raw_home_factory("1", list_date="2024-01-10T00:00:00Z")]
+    scrape_property("Test City, TX", incremental_db=state_db)
+
+    realtor_upstream.homes = [raw_home_factory("2", list_date="2024-01-11T00:00:00Z")]
+    df = scrape_property("Test City, TX", incremental_db=state_db, sweep_removals=True)
+
+    assert dict(zip(df["property_id"], df["change_type"])) == {"2": "insert", "1": "removed"}
+
+
+def test_property_id_sweep_reads_the_total_from_the_first_page(raw_home_factory, fake_realtor_session):
+    scraper = DreameryPropertyScraper()
+    scraper.session = fake_realtor_session([raw_home_factory(str(i)) for i in range(450)])
+
+    assert scraper.search_property_ids("Test City, TX") == {str(i) for i in range(450)}
+    assert sorted(scraper.session.requests_of("search_page")) == [0, 200, 400]
+
+
+def test_property_id_sweep_shards_past_the_result_window(raw_home_factory, fake_realtor_session):
+    scraper = DreameryPropertyScraper()
+    scraper.session = fake_realtor_session([raw_home_factory(str(i), list_price=100 * (i + 1)) for i in range(10500)])
+
+    assert len(scraper.search_property_ids("Test City, TX")) == 10500
+    with pytest.raises(ScrapingError):
+        scraper.search_property_ids("Test City, TX", limit=10000)
+
+
+def test_changes_to_records(raw_home_factory, process_home):
+    changes = PropertyChanges(inserts=[process_home(raw_home_factory("1"))], removals=["9"])
+
+    records = changes_to_records(changes)
+
+    assert [(record["property_id"], record["change_type"]) for record in records] == [("1", "insert"), ("9", "removed")]
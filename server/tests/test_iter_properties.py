@@ -0,0 +1,97 @@
+import asyncio
+import time
+import pytest
+import async_property_scraper
+import dreamery_property_scraper
+from async_property_scraper import AsyncDreameryPropertyScraper
+from dreamery_property_scraper import DreameryPropertyScraper
+from exceptions import InvalidListingType
+from location_cache import LocationCache
+from models import Property
+from scraper_api import iter_properties
+
+
+@pytest.fixture
+def scraper_for(fake_realtor_session):
+    def make(homes, **kwargs):
+        scraper = DreameryPropertyScraper(location_cache=LocationCache())
+        scraper.session = fake_realtor_session(homes, **kwargs)
+        return scraper
+    return make
+
+
+def async_scraper_for(upstream):
+    class FakeAsyncScraper(AsyncDreameryPropertyScraper):
+        async def _post_json(self, url, payload):
+            return upstream.post(url, json=payload).json()
+
+        async def _get_json(self, url, params=None):
+            return upstream.get(url, params=params).json()
+
+    return FakeAsyncScraper(location_cache=LocationCache())
+
+
+def test_iter_properties_yields_processed_properties_in_order(raw_home_factory, scraper_for):
+    scraper = scraper_for([raw_home_factory(str(i)) for i in range(450)])
+
+    properties = list(scraper.iter_properties("Test City, TX", limit=1000))
+
+    assert all(isinstance(prop, Property) for prop in properties)
+    assert [prop.property_id for prop in properties] == [str(i) for i in range(450)]
+
+
+def test_iter_properties_fetches_one_page_ahead(raw_home_factory, scraper_for):
+    scraper = scraper_for([raw_home_factory(str(i)) for i in range(1000)])
+
+    properties = scraper.iter_properties("Test City, TX", limit=1000)
+    for _ in range(201):
+        next(properties)
+    deadline = time.monotonic() + 2
+    while len(scraper.session.requests_of("search_page")) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert sorted(scraper.session.requests_of("search_page")) == [0, 200, 400]
+    properties.close()
+
+
+def test_iter_properties_respects_limit(raw_home_factory, scraper_for):
+    scraper = scraper_for([raw_home_factory(str(i)) for i in range(450)])
+
+    properties = list(scraper.iter_properties("Test City, TX", limit=250, extra_property_data=True))
+
+    assert len(properties) == 250
+    assert sum(len(batch) for batch in scraper.session.requests_of("detail_batch")) == 250
+
+
+def test_iter_properties_walks_shards_without_duplicates(raw_home_factory, scraper_for, monkeypatch):
+    monkeypatch.setattr(dreamery_property_scraper, "MAX_RESULT_WINDOW", 500)
+    scraper = scraper_for([raw_home_factory(str(i), list_price=1000 * (i + 1)) for i in range(1200)],
+                          result_window=500)
+
+    property_ids = [prop.property_id for prop in scraper.iter_properties("Test City, TX", limit=10000)]
+
+    assert sorted(map(int, property_ids)) == list(range(1200))
+
+
+def test_async_iter_properties(raw_home_factory, fake_realtor_session, monkeypatch):
+    monkeypatch.setattr(async_property_scraper, "MAX_RESULT_WINDOW", 500)
+    upstream = fake_realtor_session([raw_home_factory(str(i), list_price=1000 * (i + 1)) for i in range(1200)],
+                                    result_window=500)
+    scraper = async_scraper_for(upstream)
+
+    async def collect(**kwargs):
+        return [prop.property_id async for prop in scraper.iter_properties("Test City, TX", **kwargs)]
+
+    assert sorted(map(int, asyncio.run(collect(limit=10000)))) == list(range(1200))
+    assert asyncio.run(collect(limit=300)) == [str(i) for i in range(300)]
+
+
+def test_api_iter_properties_validates_before_iterating(raw_home_factory, realtor_upstream):
+    with pytest.raises(InvalidListingType):
+        iter_properties("Test City, TX", listing_type="for_lease")
+
+    realtor_upstream.homes = [raw_home_factory(str(i)) for i in range(3)]
+    properties = iter_properties("Test City, TX", fields="pins")
+
+    assert realtor_upstream.requests == []
+    assert [prop.property_id for prop in properties] == ["0", "1", "2"]
@@ -0,0 +1,99 @@
+import io
+import json
+import requests
+import json_stream
+from dreamery_property_scraper import DreameryPropertyScraper
+from json_stream import SearchResultStream
+from location_cache import LocationCache
+
+
+class CountingReader(io.BytesIO):
+    """BytesIO recording how much of the body has been read"""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def make_response(payload):
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = CountingReader(json.dumps(payload).encode("utf-8"))
+    return response
+
+
+def search_payload(homes, total=None):
+    return {"data": {"home_search": {"total": len(homes) if total is None else total, "results": homes}}}
+
+
+def test_stream_yields_homes_and_total(raw_home_factory):
+    homes = [raw_home_factory(str(i)) for i in range(3)]
+    stream = SearchResultStream.from_response(make_response(search_payload(homes, total=40)), "home_search")
+
+    assert stream.read_total() == 40
+    decoded = list(stream)
+
+    assert decoded == homes
+    assert isinstance(decoded[0]["location"]["address"]["coordinate"]["lat"], float)
+
+
+def test_stream_decodes_lazily(raw_home_factory):
+    photos = [{"href": f"https://ap.rdcpix.com/{'x' * 200}/{i}.jpg"} for i in range(200)]
+    homes = [raw_home_factory(str(i), photos=photos) for i in range(200)]
+    response = make_response(search_payload(homes))
+    body_size = len(response.raw.getvalue())
+    stream = SearchResultStream.from_response(response, "home_search")
+
+    first = next(iter(stream))
+
+    assert first["property_id"] == "0"
+    assert response.raw.bytes_read < body_size / 10
+    stream.close()
+
+
+def test_stream_tolerates_empty_payloads():
+    for payload in ({"data": None}, {"errors": [{"message": "boom"}]}, search_payload([])):
+        stream = SearchResultStream.from_response(make_response(payload), "home_search")
+        assert stream.read_total() == 0 and list(stream) == []
+
+
+def test_stream_falls_back_to_whole_body_without_ijson(monkeypatch, raw_home_factory):
+    monkeypatch.setattr(json_stream, "ijson", None)
+    homes = [raw_home_factory(str(i)) for i in range(2)]
+
+    stream = SearchResultStream.from_response(make_response(search_payload(homes)), "home_search")
+
+    assert stream.read_total() == 2 and list(stream) == homes
+
+
+def test_pages_are_consumed_as_they_stream(raw_home_factory, fake_realtor_session):
+    scraper = DreameryPropertyScraper()
+    scraper.session = fake_realtor_session([raw_home_factory(str(i)) for i in range(450)])
+    page_sizes = []
+
+    def consume(homes):
+        assert not isinstance(homes, list)
+        ids = [home["property_id"] for home in homes]
+        page_sizes.append(len(ids))
+        return ids
+
+    results = scraper._fetch_search_results({"offset": 0}, "area", limit=250, consume=consume)
+
+    assert results == [str(i) for i in range(250)]
+    assert sorted(page_sizes) == [50, 200]
+
+
+def test_advanced_search_fetches_details_per_streamed_batch(raw_home_factory, fake_realtor_session):
+    scraper = DreameryPropertyScraper(location_cache=LocationCache())
+    scraper.session = fake_realtor_session([raw_home_factory(str(i)) for i in range(5)])
+
+    properties = scraper.search_properties_advanced("Test City, TX", limit=5, extra_property_data=True,
+                                                    detail_batch_size=2)
+
+    assert [prop.property_id for prop in properties] == [str(i) for i in range(5)]
+    assert scraper.session.requests_of("detail_batch") == [["0", "1"], ["2", "3"], ["4"]]
@@ -0,0 +1,66 @@
+import sys
+from datetime import datetime, timezone
+import numpy as np
+from listing_record import ListingBatch, ListingRecord
+from model_builder import ModelBuilder
+from models import Address, Property
+from processors import process_property
+
+
+def advertised_home(raw_home_factory, property_id: str, **overrides):
+    advertisers = [{"type": "seller", "name": "Agent A", "email": "a@example.com", "office": {"name": "Office A"}}]
+    return raw_home_factory(property_id, advertisers=advertisers, **overrides)
+
+
+def test_records_convert_back_to_equal_properties(raw_home_factory):
+    prop = process_property(advertised_home(raw_home_factory, "1", status="sold", last_sold_date="2024-03-01"))
+
+    record = ListingRecord.from_property(prop)
+
+    assert (record.city, record.list_price, record.full_baths, record.agent_name) == ("Test City", 500000, 2, "Agent A")
+    assert record.to_property() == prop
+    assert record.to_property(ModelBuilder(trusted=True)).model_dump(mode="json") == prop.model_dump(mode="json")
+
+
+def test_records_keep_nested_models_that_hold_no_columns():
+    prop = Property(property_url="https://www.realtor.com/x", property_id="1", address=Address())
+
+    assert ListingRecord.from_property(prop).to_property() == prop
+
+
+def test_lean_records_intern_strings_and_drop_the_rest(raw_home_factory):
+    prop = process_property(advertised_home(raw_home_factory, "1"))
+
+    record = ListingRecord.from_property(prop, keep_extra=False)
+    rebuilt = record.to_property()
+
+    assert record.extra is None and not hasattr(record, "__dict__")
+    assert record.city is sys.intern("Test City")
+    assert rebuilt.advertisers.agent.name == "Agent A" and rebuilt.advertisers.agent.email is None
+    assert rebuilt.description.alt_photos is None and rebuilt.list_price == prop.list_price
+
+
+def test_batches_hold_numeric_columns_in_typed_arrays(raw_home_factory):
+    properties = [process_property(advertised_home(raw_home_factory, str(i), hoa=None if i % 2 else {"fee": 100}))
+                  for i in range(4)]
+
+    batch = ListingBatch.from_properties(properties)
+    hoa_fee = batch.column("hoa_fee")
+
+    assert len(batch) == 4 and batch.column("list_price").dtype == np.int64
+    assert hoa_fee.tolist() == [100, None, 100, None]
+    assert batch.column("list_date").dtype == np.dtype("datetime64[us]")
+    assert list(batch) == [ListingRecord.from_property(prop) for prop in properties]
+    assert batch[1] == ListingRecord.from_property(properties[1])
+    assert batch.to_properties() == properties
+
+
+def test_batches_keep_columns_that_do_not_fit_an_array_as_lists():
+    records = [ListingRecord("https://www.realtor.com/x", "1", list_date=datetime(2024, 1, 15, tzinfo=timezone.utc),
+                             list_price=2 ** 70)]
+
+    batch = ListingBatch.from_records(records)
+
+    assert batch.column("list_date") == [records[0].list_date]
+    assert batch.column("list_price") == [2 ** 70]
+    assert list(batch) == records
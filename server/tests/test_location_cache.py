@@ -0,0 +1,65 @@
+import time
+from location_cache import LocationCache, normalize_location
+from dreamery_property_scraper import DreameryPropertyScraper
+
+
+SF_INFO = {"area_type": "city", "city": "San Francisco", "state_code": "CA"}
+
+
+def test_normalize_location():
+    assert normalize_location("  San Francisco, CA ") == "san francisco ca"
+    assert normalize_location("san  francisco,CA") == "san francisco ca"
+
+
+def test_cache_hit_and_miss_counters():
+    cache = LocationCache()
+
+    assert cache.get("San Francisco, CA") is None
+    cache.set("San Francisco, CA", SF_INFO)
+
+    assert cache.get("san francisco ca") == SF_INFO
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = LocationCache(maxsize=2)
+    cache.set("a", {"area_type": "city"})
+    cache.set("b", {"area_type": "city"})
+    cache.get("a")
+    cache.set("c", {"area_type": "city"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_cache_expires_entries():
+    cache = LocationCache(ttl=0.01)
+    cache.set("San Francisco, CA", SF_INFO)
+    time.sleep(0.02)
+
+    assert cache.get("San Francisco, CA") is None
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    db_path = str(tmp_path / "locations.db")
+    LocationCache(db_path=db_path).set("San Francisco, CA", SF_INFO)
+
+    restarted = LocationCache(db_path=db_path)
+    assert restarted.get("San Francisco, CA") == SF_INFO
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_scraper_skips_autocomplete_on_cache_hit():
+    class FailingSession:
+        def get(self, *args, **kwargs):
+            raise AssertionError("autocomplete should not be called on a cache hit")
+
+    cache = LocationCache()
+    cache.set("San Francisco, CA", SF_INFO)
+    scraper = DreameryPropertyScraper(location_cache=cache)
+    scraper.session = FailingSession()
+
+    assert scraper._handle_location("San Francisco, CA") == SF_INFO
@@ -0,0 +1,74 @@
+import warnings
+import pytest
+from pydantic import HttpUrl, ValidationError
+import model_builder
+from dreamery_property_scraper import DreameryPropertyScraper
+from location_cache import LocationCache
+from model_builder import ModelBuilder, get_model_builder
+from models import Agent, HomeFlags, Property
+from processors import process_property
+
+
+def test_trusted_build_matches_validated_build(raw_home_factory):
+    home = raw_home_factory("1", advertisers=[{"type": "seller", "name": "Agent A", "office": {"name": "Office A"}}])
+
+    validated = process_property(home, builder=ModelBuilder())
+    trusted = process_property(home, builder=ModelBuilder(trusted=True))
+
+    assert isinstance(validated.property_url, HttpUrl) and isinstance(trusted.property_url, str)
+    assert isinstance(trusted.flags, HomeFlags) and isinstance(trusted.advertisers.agent, Agent)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert trusted.model_dump(mode="json") == validated.model_dump(mode="json")
+    assert trusted.address.formatted_address == validated.address.formatted_address
+
+
+def test_trusted_build_falls_back_to_validation_for_bad_shapes(raw_home_factory):
+    builder = ModelBuilder(trusted=True)
+    home = raw_home_factory("1")
+    del home["href"]
+
+    with pytest.raises(KeyError):
+        process_property(home, builder=builder)
+    with pytest.raises(ValidationError):
+        builder.build(Property, {"property_url": "https://www.realtor.com/x", "property_id": "1", "address": "a street"})
+
+
+def test_sampled_validation_reports_schema_drift(raw_home_factory, caplog):
+    builder = ModelBuilder(trusted=True, validate_every=2)
+    homes = [raw_home_factory(str(i), list_price="call for price") for i in range(4)]
+
+    properties = [process_property(home, builder=builder) for home in homes]
+
+    assert [prop.property_id for prop in properties] == ["0", "1", "2", "3"]
+    assert builder.drift == 2
+    # Sampled records are validated with the rejected field dropped; the rest are trusted as-is
+    assert [prop.list_price for prop in properties] == ["call for price", None, "call for price", None]
+    assert isinstance(properties[1].property_url, HttpUrl) and isinstance(properties[0].property_url, str)
+    assert "schema drift" in caplog.text
+
+
+def test_model_builder_is_configured_from_the_environment(monkeypatch):
+    monkeypatch.setattr(model_builder, "_shared_builder", None)
+    monkeypatch.setenv("PROPERTY_VALIDATION", "trusted")
+    monkeypatch.setenv("PROPERTY_VALIDATION_SAMPLE_EVERY", "50")
+
+    builder = get_model_builder()
+
+    assert (builder.trusted, builder.validate_every) == (True, 50)
+    assert DreameryPropertyScraper(location_cache=LocationCache()).model_builder is builder
+
+    monkeypatch.setattr(model_builder, "_shared_builder", None)
+    monkeypatch.setenv("PROPERTY_VALIDATION", "sometimes")
+    with pytest.raises(ValueError):
+        get_model_builder()
+
+
+def test_search_builds_trusted_properties(raw_home_factory, fake_realtor_session):
+    scraper = DreameryPropertyScraper(location_cache=LocationCache(), model_builder=ModelBuilder(trusted=True))
+    scraper.session = fake_realtor_session([raw_home_factory(str(i)) for i in range(3)])
+
+    properties = scraper.search_properties_advanced("Test City, TX", limit=3)
+
+    assert [prop.property_id for prop in properties] == ["0", "1", "2"]
+    assert all(isinstance(prop.property_url, str) for prop in properties)
@@ -0,0 +1,49 @@
+from datetime import datetime
+from dreamery_property_scraper import DreameryPropertyScraper
+from location_cache import LocationCache
+from parsers import calculate_days_on_mls, normalize_dates, parse_date
+from processors import process_property
+
+
+def test_normalize_dates_matches_per_home_parsing(raw_home_factory):
+    homes = [
+        raw_home_factory("1"),
+        raw_home_factory("2", status="sold", last_sold_date="2024-03-01T00:00:00Z"),
+        raw_home_factory("3", status="sold", last_sold_date=None),
+        raw_home_factory("4", status="off_market", pending_date="2024-02-01"),
+        raw_home_factory("5", list_date=None),
+        raw_home_factory("6", status="sold", last_sold_date="2023-12-01"),
+    ]
+    expected = [(parse_date(home["list_date"]), parse_date(home["last_sold_date"]),
+                 parse_date(home["pending_date"]), calculate_days_on_mls(home)) for home in homes]
+
+    normalize_dates(homes)
+
+    assert [(home["list_date"], home["last_sold_date"], home["pending_date"], home["days_on_mls"])
+            for home in homes] == expected
+
+
+def test_normalize_dates_uses_one_reference_time(raw_home_factory):
+    homes = normalize_dates([raw_home_factory(str(i)) for i in range(3)], now=datetime(2024, 2, 14, 23, 59))
+
+    assert [home["days_on_mls"] for home in homes] == [30, 30, 30]
+    assert process_property(homes[0]).days_on_mls == 30
+
+
+def test_unparseable_dates_fall_back_to_per_home_parsing(raw_home_factory):
+    homes = [raw_home_factory("1"), raw_home_factory("2", list_date="not a date")]
+
+    assert normalize_dates(homes) is homes
+    assert homes[0]["list_date"] == "2024-01-15T00:00:00Z" and "days_on_mls" not in homes[0]
+    assert process_property(homes[0]).list_date == datetime(2024, 1, 15)
+
+
+def test_search_returns_normalized_dates(raw_home_factory, fake_realtor_session):
+    scraper = DreameryPropertyScraper(location_cache=LocationCache())
+    scraper.session = fake_realtor_session(
+        [raw_home_factory(str(i), status="sold", last_sold_date="2024-03-01T00:00:00Z") for i in range(3)])
+
+    properties = scraper.search_properties_advanced("Test City, TX", limit=3)
+
+    assert [(prop.list_date, prop.last_sold_date, prop.days_on_mls) for prop in properties] == \
+        [(datetime(2024, 1, 15), datetime(2024, 3, 1), 46)] * 3
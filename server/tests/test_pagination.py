@@ -0,0 +1,46 @@
+import pytest
+from dreamery_property_scraper import DreameryPropertyScraper
+
+
+@pytest.fixture
+def paged_scraper(raw_home_factory, fake_realtor_session):
+    def make(total_homes):
+        scraper = DreameryPropertyScraper()
+        homes = [raw_home_factory(str(i)) for i in range(total_homes)]
+        scraper.session = fake_realtor_session(homes, scraper.DEFAULT_PAGE_SIZE)
+        return scraper
+
+    return make
+
+
+def test_single_page_search(paged_scraper):
+    scraper = paged_scraper(50)
+    results = scraper._fetch_search_results({"offset": 0}, "area", limit=20)
+
+    assert [home["property_id"] for home in results] == [str(i) for i in range(20)]
+    assert scraper.session.requests_of("search_page") == [0]
+
+
+def test_pagination_fetches_remaining_offsets_in_order(paged_scraper):
+    scraper = paged_scraper(1050)
+    results = scraper._fetch_search_results({"offset": 0}, "area", limit=10000)
+
+    assert len(results) == 1050
+    assert [home["property_id"] for home in results] == [str(i) for i in range(1050)]
+    assert sorted(scraper.session.requests_of("search_page")) == [0, 200, 400, 600, 800, 1000]
+
+
+def test_pagination_respects_limit(paged_scraper):
+    scraper = paged_scraper(1050)
+    results = scraper._fetch_search_results({"offset": 0}, "area", limit=450)
+
+    assert len(results) == 450
+    assert sorted(scraper.session.requests_of("search_page")) == [0, 200, 400]
+
+
+def test_general_search_formats_all_pages(paged_scraper):
+    scraper = paged_scraper(300)
+    results = scraper._perform_general_search({"offset": 0}, "area", limit=300)
+
+    assert len(results) == 300
+    assert results[-1].property_id == "299"
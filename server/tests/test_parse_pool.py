@@ -0,0 +1,121 @@
+import asyncio
+import pickle
+import time
+from concurrent.futures import Future
+import pytest
+from async_property_scraper import AsyncDreameryPropertyScraper
+from dreamery_property_scraper import DreameryPropertyScraper
+from location_cache import LocationCache
+from models import Property
+from parse_pool import ParsePool, PropertyParser
+from scraper_api import _to_dataframe
+from utils import ordered_properties, property_row
+
+
+@pytest.fixture(scope="module")
+def worker_pool():
+    pool = ParsePool(max_workers=2, chunk_size=10, min_batch=20)
+    yield pool
+    pool.close()
+
+
+def test_property_parser_is_picklable_and_returns_rows(raw_home_factory):
+    parser = pickle.loads(pickle.dumps(PropertyParser(rows=True)))
+
+    row = parser(raw_home_factory("1"))
+
+    assert list(row) == ordered_properties
+    assert row["property_id"] == "1" and row["latitude"] == 32.7 and row["list_date"] == "2024-01-15"
+    assert parser({"property_id": "2"}) is None
+
+
+def test_small_batches_and_unpicklable_parsers_stay_in_process(raw_home_factory):
+    pool = ParsePool(max_workers=2, min_batch=10)
+    homes = [raw_home_factory(str(i)) for i in range(20)]
+
+    assert [prop.property_id for prop in pool.map(PropertyParser(), homes[:5])] == ["0", "1", "2", "3", "4"]
+    assert len(pool.map(lambda home: home["property_id"], homes)) == 20
+    assert pool._executor is None
+
+
+def test_worker_processes_parse_chunks_in_order(raw_home_factory, worker_pool):
+    homes = [raw_home_factory(str(i)) for i in range(45)]
+    homes[7]["href"] = None
+
+    rows = worker_pool.map(PropertyParser(rows=True), homes)
+
+    assert worker_pool._executor is not None
+    assert [row["property_id"] for row in rows] == [str(i) for i in range(45) if i != 7]
+
+
+def test_search_parses_pages_in_the_pool(raw_home_factory, fake_realtor_session, worker_pool):
+    scraper = DreameryPropertyScraper(location_cache=LocationCache(), parse_pool=worker_pool)
+    scraper.session = fake_realtor_session([raw_home_factory(str(i)) for i in range(250)])
+
+    rows = scraper.search_properties_comprehensive("Test City, TX", limit=250, extra_property_data=False, rows=True)
+    properties = scraper.search_properties_advanced("Test City, TX", limit=30)
+
+    assert sorted(int(row["property_id"]) for row in rows) == list(range(250))
+    assert all(isinstance(prop, Property) for prop in properties) and len(properties) == 30
+
+
+def test_rows_build_the_same_dataframe_as_properties(raw_home_factory):
+    homes = [raw_home_factory(str(i), hoa=None if i % 2 else {"fee": 100}) for i in range(6)]
+    properties = [PropertyParser()(home) for home in homes]
+
+    expected = _to_dataframe(properties)
+    built = _to_dataframe([property_row(prop) for prop in properties])
+
+    assert built.equals(expected) and (built.dtypes == expected.dtypes).all()
+
+
+def test_async_search_waits_for_the_pool_off_the_event_loop(raw_home_factory):
+    class SlowPool:
+        def map(self, parse, homes):
+            time.sleep(0.2)
+            return [parse(home) for home in homes]
+
+    ticks = []
+
+    async def tick():
+        for _ in range(10):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def run():
+        scraper = AsyncDreameryPropertyScraper(location_cache=LocationCache(), parse_pool=SlowPool())
+        started = time.perf_counter()
+        properties, _ = await asyncio.gather(
+            scraper._process_properties([raw_home_factory("1")], "for_sale", False, False, False), tick()
+        )
+        return properties, started
+
+    properties, started = asyncio.run(run())
+
+    assert [prop.property_id for prop in properties] == ["1"]
+    assert len(ticks) == 10 and ticks[-1] - started < 0.2
+
+
+def test_chunks_are_submitted_while_homes_are_still_arriving(raw_home_factory):
+    produced = []
+    submitted = []
+
+    class RecordingExecutor:
+        def submit(self, fn, parse, chunk):
+            submitted.append((len(produced), len(chunk)))
+            future = Future()
+            future.set_result(fn(parse, chunk))
+            return future
+
+    def arriving():
+        for i in range(100):
+            produced.append(i)
+            yield raw_home_factory(str(i))
+
+    pool = ParsePool(max_workers=1, chunk_size=10, min_batch=20)
+    pool._executor = RecordingExecutor()
+
+    properties = pool.map(PropertyParser(), arriving())
+
+    assert [prop.property_id for prop in properties] == [str(i) for i in range(100)]
+    assert submitted[:3] == [(20, 10), (20, 10), (30, 10)] and len(submitted) == 10
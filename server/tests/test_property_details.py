@@ -0,0 +1,88 @@
+import threading
+import time
+from dreamery_property_scraper import DreameryPropertyScraper
+from location_cache import LocationCache
+
+
+DETAIL = {
+    "nearbySchools": {"schools": [{"district": {"name": "Test ISD"}}]},
+    "taxHistory": [
+        {"year": 2022, "tax": 9000, "assessment": {"building": 1, "land": 2, "total": 3}},
+        {"year": 2023, "tax": 9500, "assessment": {"building": 4, "land": 5, "total": 6}},
+    ],
+    "location": {"parcel": {"parcel_id": "P-1"}},
+}
+
+
+def make_scraper(homes, fake_realtor_session, details=None):
+    scraper = DreameryPropertyScraper(location_cache=LocationCache())
+    scraper.session = fake_realtor_session(homes, details=details)
+    return scraper
+
+
+def test_batch_payload_aliases_every_property():
+    payload = DreameryPropertyScraper._build_property_details_batch_payload(["11", "22"])
+
+    assert 'home_0: home(property_id: "11") { ...HomeData }' in payload["query"]
+    assert 'home_1: home(property_id: "22") { ...HomeData }' in payload["query"]
+    assert "fragment HomeData on Home" in payload["query"]
+
+
+def test_details_are_fetched_in_batches(raw_home_factory, fake_realtor_session):
+    homes = [raw_home_factory(str(i)) for i in range(120)]
+    scraper = make_scraper(homes, fake_realtor_session)
+
+    details = scraper._fetch_extra_property_details([home["property_id"] for home in homes], batch_size=50)
+
+    batches = scraper.session.requests_of("detail_batch")
+    assert sorted(len(batch) for batch in batches) == [20, 50, 50]
+    assert set(details) == {str(i) for i in range(120)}
+
+
+def test_merge_keeps_search_location_fields(raw_home_factory):
+    home = raw_home_factory("1")
+    DreameryPropertyScraper._merge_property_details(home, DETAIL)
+
+    assert home["location"]["parcel"] == {"parcel_id": "P-1"}
+    assert home["location"]["address"]["city"] == "Test City"
+    assert home["taxHistory"] == DETAIL["taxHistory"]
+
+
+def test_advanced_search_populates_extra_property_data(raw_home_factory, fake_realtor_session):
+    homes = [raw_home_factory(str(i)) for i in range(3)]
+    scraper = make_scraper(homes, fake_realtor_session, details={"1": DETAIL})
+
+    results = scraper.search_properties_advanced("Test City, TX", limit=10, extra_property_data=True)
+
+    assert [result.property_id for result in results] == ["0", "1", "2"]
+    enriched = results[1]
+    assert enriched.nearby_schools == ["Test ISD"]
+    assert enriched.tax == 9500
+    assert enriched.assessed_value == 3
+    assert len(scraper.session.requests_of("detail_batch")) == 1
+
+
+def test_page_detail_batches_run_concurrently(raw_home_factory, fake_realtor_session):
+    homes = [raw_home_factory(str(i)) for i in range(200)]
+    scraper = make_scraper(homes, fake_realtor_session, details={str(i): DETAIL for i in range(200)})
+    post = scraper.session.post
+    in_flight, peak, lock = [0], [0], threading.Lock()
+
+    def slow_post(url, json=None, **kwargs):
+        if "GetHomes" not in json["query"]:
+            return post(url, json=json, **kwargs)
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.05)
+        with lock:
+            in_flight[0] -= 1
+        return post(url, json=json, **kwargs)
+
+    scraper.session.post = slow_post
+    results = scraper.search_properties_advanced("Test City, TX", limit=200, extra_property_data=True)
+
+    assert [result.property_id for result in results] == [str(i) for i in range(200)]
+    assert all(result.nearby_schools == ["Test ISD"] for result in results)
+    assert len(scraper.session.requests_of("detail_batch")) == 4
+    assert peak[0] == 4
@@ -0,0 +1,86 @@
+import pandas as pd
+import pytest
+from models import Property
+from processors import process_property
+from scraper_api import _changes_to_dataframe, _to_dataframe
+from incremental import PropertyChanges
+from utils import PROPERTY_DTYPES, apply_property_dtypes, ordered_properties, property_frame
+
+
+def sample_properties(raw_home_factory):
+    homes = [raw_home_factory(str(i), hoa=None if i % 2 else {"fee": 100}) for i in range(4)]
+    return [process_property(home) for home in homes]
+
+
+def test_every_column_has_a_dtype():
+    assert set(ordered_properties) <= set(PROPERTY_DTYPES)
+
+
+def test_typed_frame_follows_the_schema(raw_home_factory):
+    frame = property_frame(sample_properties(raw_home_factory), dtype_backend="numpy_nullable")
+
+    assert {column: str(dtype) for column, dtype in frame.dtypes.items()} == {
+        column: PROPERTY_DTYPES[column] for column in ordered_properties
+    }
+    assert frame["list_date"].tolist() == [pd.Timestamp("2024-01-15")] * 4
+    assert frame["hoa_fee"].isna().tolist() == [False, True, False, True]
+    assert frame["city"].cat.categories.tolist() == ["Test City"]
+    assert frame["list_price"].sum() == 2000000
+
+
+def test_typed_frame_keeps_the_untyped_values(raw_home_factory):
+    properties = sample_properties(raw_home_factory)
+    untyped = property_frame(properties)
+    typed = property_frame(properties, dtype_backend="numpy_nullable")
+
+    for column in ordered_properties:
+        if column in ("list_date", "pending_date", "last_sold_date"):
+            expected = pd.to_datetime(untyped[column], format="%Y-%m-%d")
+        else:
+            expected = untyped[column]
+        assert typed[column].isna().tolist() == expected.isna().tolist(), column
+        assert typed[column].dropna().tolist() == expected.dropna().tolist(), column
+
+
+def test_pyarrow_backend(raw_home_factory):
+    pytest.importorskip("pyarrow")
+    frame = property_frame(sample_properties(raw_home_factory), dtype_backend="pyarrow")
+
+    assert str(frame["beds"].dtype) == "int32[pyarrow]"
+    assert str(frame["list_price"].dtype) == "int64[pyarrow]"
+    assert str(frame["list_date"].dtype) == "timestamp[s][pyarrow]"
+    assert frame["property_id"].dtype == pd.StringDtype("pyarrow")
+    assert str(frame["city"].dtype) == "category"
+    assert frame.groupby("city", observed=True)["list_price"].mean().tolist() == [500000]
+
+
+def test_values_that_do_not_fit_are_widened_or_dropped():
+    frame = pd.DataFrame({
+        "sqft": pd.Series([3_000_000_000, pd.NA], dtype=object),
+        "beds": pd.Series(["3", "studio"], dtype=object),
+        "list_date": pd.Series(["2024-01-15", "soon"], dtype=object),
+        "unknown": pd.Series([{"a": 1}, None], dtype=object),
+    })
+
+    typed = apply_property_dtypes(frame)
+
+    assert str(typed["sqft"].dtype) == "Int64" and typed["sqft"][0] == 3_000_000_000
+    assert str(typed["beds"].dtype) == "Int32" and typed["beds"].isna().tolist() == [False, True]
+    assert typed["list_date"].isna().tolist() == [False, True]
+    assert typed["unknown"].dtype == object
+
+
+def test_changes_frame_is_typed_after_removals(raw_home_factory):
+    properties = sample_properties(raw_home_factory)
+    changes = PropertyChanges(inserts=properties[:2], updates=properties[2:], removals=["gone"])
+
+    frame = _changes_to_dataframe(changes, dtype_backend="numpy_nullable")
+
+    assert str(frame["change_type"].dtype) == "category"
+    assert frame["change_type"].tolist() == ["insert", "insert", "update", "update", "removed"]
+    assert str(frame["list_price"].dtype) == "Int64" and pd.isna(frame["list_price"].iloc[-1])
+
+
+def test_rejects_unknown_backend(raw_home_factory):
+    with pytest.raises(ValueError):
+        _to_dataframe(sample_properties(raw_home_factory), dtype_backend="arrow")
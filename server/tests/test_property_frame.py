@@ -0,0 +1,55 @@
+import warnings
+import pandas as pd
+from model_builder import ModelBuilder
+from models import Advertisers, Agent, AgentPhone, Assessment, Property, TaxHistory
+from processors import process_property
+from scraper_api import _to_dataframe
+from utils import ordered_properties, process_result, property_frame, property_row
+
+
+def concatenated_rows(properties):
+    """The frame one-row process_result frames used to be concatenated into"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=FutureWarning)
+        frame = pd.concat([process_result(prop) for prop in properties], ignore_index=True)
+    return frame.replace({"None": pd.NA, None: pd.NA, "": pd.NA})
+
+
+def sample_properties(raw_home_factory):
+    homes = [raw_home_factory(str(i), hoa=None if i % 2 else {"fee": 100}) for i in range(4)]
+    return [process_property(home) for home in homes] + [
+        process_property(homes[0], builder=ModelBuilder(trusted=True)),
+        Property(property_url="https://www.realtor.com/x", property_id="9", mls="", nearby_schools=["A", "B", "A"],
+                 tax_history=[TaxHistory(tax=5, assessment=Assessment(total=3))],
+                 advertisers=Advertisers(agent=Agent(name="Agent A", phones=AgentPhone(number="1")))),
+    ]
+
+
+def test_property_frame_matches_concatenated_rows(raw_home_factory):
+    properties = sample_properties(raw_home_factory)
+
+    for subset in (properties, properties[:3], properties[-1:]):
+        expected = concatenated_rows(subset)
+        built = property_frame(subset)
+        assert built.equals(expected) and (built.dtypes == expected.dtypes).all()
+
+
+def test_property_row_reads_nested_values_without_dumping(raw_home_factory):
+    prop = sample_properties(raw_home_factory)[-1]
+
+    row = property_row(prop)
+
+    assert list(row) == ordered_properties
+    assert row["tax_history"] == [prop.tax_history[0].model_dump()]
+    assert row["agent_phones"] == {"number": "1", "type": None, "primary": None, "ext": None}
+    assert sorted(row["nearby_schools"].split(", ")) == ["A", "B"]
+
+
+def test_dataframe_keeps_requested_fields(raw_home_factory):
+    properties = sample_properties(raw_home_factory)[:2]
+
+    frame = _to_dataframe(properties, ["list_price", "city"])
+
+    assert list(frame.columns) == ["property_id", "city", "list_price"]
+    assert frame["list_price"].tolist() == [500000, 500000]
+    assert _to_dataframe([]).empty
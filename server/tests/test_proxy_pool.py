@@ -0,0 +1,159 @@
+import io
+import pytest
+import requests
+from dreamery_property_scraper import DreameryPropertyScraper
+from enhanced_scraper import EnhancedScraper, ScraperInput
+from models import ListingType
+from proxy_pool import ProxyPool, parse_proxies
+from rate_limiter import RateLimitedAdapter
+from sessions import DEFAULT_HEADERS
+from token_manager import RealtorTokenAuth
+
+
+PROXIES = ["http://p1:8080", "http://p2:8080", "http://p3:8080"]
+
+
+class BrokenSession:
+    """Session whose proxy refuses every connection"""
+
+    def __init__(self):
+        self.proxies = {}
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        raise requests.ConnectionError("proxy refused connection")
+
+
+class ThrottledSession(BrokenSession):
+    def __init__(self):
+        super().__init__()
+        self.responses = []
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        response = requests.Response()
+        response.status_code = 429
+        response.raw = io.BytesIO(b"")
+        self.responses.append(response)
+        return response
+
+
+def test_parse_proxies():
+    assert parse_proxies(None) == []
+    assert parse_proxies("http://p1:8080") == ["http://p1:8080"]
+    assert parse_proxies(" http://p1:8080, http://p2:8080 ,") == ["http://p1:8080", "http://p2:8080"]
+    assert parse_proxies(["http://p1:8080", ""]) == ["http://p1:8080"]
+
+
+def test_each_proxy_gets_its_own_session_and_rate_limiters(fake_realtor_session):
+    pool = ProxyPool(PROXIES, session_factory=lambda registry: fake_realtor_session([]))
+
+    assert len({id(endpoint.session) for endpoint in pool.endpoints}) == 3
+    assert len({id(endpoint.registry) for endpoint in pool.endpoints}) == 3
+    assert [endpoint.session.proxies["https"] for endpoint in pool.endpoints] == PROXIES
+
+
+def test_concurrent_requests_spread_across_proxies(fake_realtor_session):
+    pool = ProxyPool(PROXIES, session_factory=lambda registry: fake_realtor_session([]))
+
+    acquired = [pool._acquire() for _ in range(3)]
+
+    assert sorted(endpoint.url for endpoint in acquired) == PROXIES
+
+
+def test_paginated_search_through_pool(raw_home_factory, fake_realtor_session):
+    homes = [raw_home_factory(str(i)) for i in range(1050)]
+    scraper = DreameryPropertyScraper()
+    scraper.session = ProxyPool(PROXIES, session_factory=lambda registry: fake_realtor_session(homes))
+
+    results = scraper._fetch_search_results({"offset": 0}, "area", limit=10000)
+
+    assert [home["property_id"] for home in results] == [str(i) for i in range(1050)]
+    offsets = [offset for e in scraper.session.endpoints for offset in e.session.requests_of("search_page")]
+    assert sorted(offsets) == [0, 200, 400, 600, 800, 1000]
+
+
+def test_failing_proxy_is_retired_and_requests_reroute(fake_realtor_session):
+    sessions = iter([BrokenSession(), fake_realtor_session([])])
+    pool = ProxyPool(PROXIES[:2], session_factory=lambda registry: next(sessions), max_consecutive_failures=2)
+    broken, healthy = pool.endpoints
+    healthy.latency = 1.0
+
+    for _ in range(4):
+        # Hold the healthy proxy busy so the broken one keeps being picked first
+        healthy.in_flight += 1
+        response = pool.post("https://www.realtor.com/api", json={"query": "", "variables": {"offset": 0}})
+        healthy.in_flight -= 1
+        assert response.status_code == 200
+
+    assert broken.retired
+    assert broken.session.calls == 2
+    assert pool.healthy() == [healthy]
+    assert pool.stats()[PROXIES[0]]["error_rate"] == 1.0
+
+
+def test_throttled_response_is_retried_on_another_proxy(fake_realtor_session):
+    sessions = iter([ThrottledSession(), fake_realtor_session([])])
+    pool = ProxyPool(PROXIES[:2], session_factory=lambda registry: next(sessions))
+    # Make the throttled proxy look fastest so it is tried first
+    pool.endpoints[0].latency = 0.001
+    pool.endpoints[1].latency = 1.0
+
+    response = pool.post("https://www.realtor.com/api", json={"query": "", "variables": {"offset": 0}})
+
+    assert response.status_code == 200
+    assert pool.endpoints[0].failures == 1
+    assert pool.endpoints[0].session.responses[0].raw.closed
+
+
+def test_only_the_last_throttle_response_stays_open():
+    sessions = [ThrottledSession(), ThrottledSession()]
+    pool = ProxyPool(PROXIES[:2], session_factory=lambda registry: sessions.pop(0))
+
+    response = pool.get("https://www.realtor.com/api")
+
+    throttled = [r for endpoint in pool.endpoints for r in endpoint.session.responses]
+    assert response.status_code == 429 and len(throttled) == pool.max_attempts
+    assert all(r.raw.closed for r in throttled if r is not response)
+    assert not response.raw.closed
+
+
+def test_all_proxies_failing_raises_last_error():
+    pool = ProxyPool(PROXIES[:1], session_factory=lambda registry: BrokenSession(), max_attempts=2)
+
+    with pytest.raises(requests.ConnectionError):
+        pool.get("https://www.realtor.com/api")
+
+
+def test_from_scraper_input_builds_pool_for_multiple_proxies():
+    scraper_input = ScraperInput(location="Dallas, TX", listing_type=ListingType.FOR_SALE, proxy=",".join(PROXIES))
+    scraper = DreameryPropertyScraper.from_scraper_input(scraper_input)
+
+    assert isinstance(scraper.session, ProxyPool)
+    assert [endpoint.url for endpoint in scraper.session.endpoints] == PROXIES
+
+
+def test_enhanced_scraper_proxy_does_not_leak_into_shared_session():
+    plain = EnhancedScraper(ScraperInput(location="Dallas, TX", listing_type=ListingType.FOR_SALE))
+    proxied = EnhancedScraper(ScraperInput(location="Dallas, TX", listing_type=ListingType.FOR_SALE,
+                                           proxy="http://p1:8080"))
+
+    assert isinstance(proxied.session, ProxyPool)
+    assert EnhancedScraper.session is plain.session
+    assert not EnhancedScraper.session.proxies
+
+
+def test_enhanced_scraper_sessions_match_the_scraper_sessions():
+    plain = EnhancedScraper(ScraperInput(location="Dallas, TX", listing_type=ListingType.FOR_SALE))
+    proxied = EnhancedScraper(ScraperInput(location="Dallas, TX", listing_type=ListingType.FOR_SALE,
+                                           proxy="http://p1:8080,http://p2:8080"))
+
+    sessions = [plain.session] + [endpoint.session for endpoint in proxied.session.endpoints]
+    for session in sessions:
+        assert DEFAULT_HEADERS.items() <= session.headers.items()
+        assert isinstance(session.auth, RealtorTokenAuth)
+        assert isinstance(session.get_adapter("https://www.realtor.com"), RateLimitedAdapter)
+    # The pool rotates proxies on throttles, so its sessions do not retry them as well
+    assert [session.get_adapter("https://www.realtor.com").max_throttle_retries for session in sessions] == [3, 0, 0]
+    assert [session.proxies["https"] for session in sessions[1:]] == ["http://p1:8080", "http://p2:8080"]
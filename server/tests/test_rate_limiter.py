@@ -0,0 +1,79 @@
+import asyncio
+import io
+import time
+import requests
+from rate_limiter import AdaptiveRateLimiter, RateLimiterRegistry, RateLimitedAdapter
+
+
+def test_bucket_allows_burst_then_waits():
+    limiter = AdaptiveRateLimiter(rate=20, burst=2)
+
+    assert limiter.try_acquire() == 0
+    assert limiter.try_acquire() == 0
+    assert limiter.try_acquire() > 0
+
+
+def test_acquire_times_out():
+    limiter = AdaptiveRateLimiter(rate=1, burst=1)
+    limiter.acquire()
+
+    assert limiter.acquire(timeout=0.01) is False
+
+
+def test_throttle_halves_rate_once_per_cooldown():
+    limiter = AdaptiveRateLimiter(rate=8, cooldown=60)
+
+    limiter.on_throttle()
+    limiter.on_throttle()
+
+    assert limiter.stats()["rate"] == 4
+
+
+def test_success_grows_rate_back_to_max():
+    limiter = AdaptiveRateLimiter(rate=1, max_rate=2, increase=1)
+
+    for _ in range(10):
+        limiter.on_success()
+
+    assert limiter.stats()["rate"] == 2
+
+
+def test_async_acquire_waits_for_refill():
+    limiter = AdaptiveRateLimiter(rate=50, burst=1)
+    limiter.acquire()
+
+    start = time.monotonic()
+    asyncio.run(limiter.acquire_async())
+
+    assert time.monotonic() - start >= 0.015
+
+
+def test_registry_shares_limiters_per_host():
+    registry = RateLimiterRegistry(rates={"example.com": 3})
+
+    limiter = registry.for_url("https://example.com/a")
+
+    assert registry.for_url("https://example.com/b?x=1") is limiter
+    assert registry.for_url("https://other.example.com/") is not limiter
+    assert limiter.rate == 3
+    assert set(registry.stats()) == {"example.com", "other.example.com"}
+
+
+def test_adapter_retries_throttled_responses(monkeypatch):
+    statuses = iter([429, 429, 200])
+
+    def fake_send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = next(statuses)
+        response.raw = io.BytesIO(b"{}")
+        return response
+
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", fake_send)
+    registry = RateLimiterRegistry(rates={"example.com": 1000})
+    session = requests.Session()
+    session.mount("https://", RateLimitedAdapter(registry=registry))
+
+    response = session.get("https://example.com/")
+
+    assert response.status_code == 200
+    assert registry.for_host("example.com").rate < 1000
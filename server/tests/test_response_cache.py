@@ -0,0 +1,104 @@
+import time
+import pytest
+from response_cache import ResponseCache
+from location_cache import LocationCache
+from dreamery_property_scraper import DreameryPropertyScraper
+from models import ListingType
+
+
+QUERY = "query Home_search($city: String) { home_search(query: {city: $city}) { total } }"
+PAYLOAD = {"data": {"home_search": {"total": 1, "results": []}}}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / "responses.db"))
+
+
+def test_key_ignores_whitespace_and_variable_order():
+    key = ResponseCache.make_key(QUERY, {"city": "Dallas", "offset": 0})
+    reformatted = QUERY.replace(" { ", "\n    {\n ")
+
+    assert ResponseCache.make_key(reformatted, {"offset": 0, "city": "Dallas"}) == key
+    assert ResponseCache.make_key(QUERY, {"city": "Austin", "offset": 0}) != key
+
+
+def test_ttl_depends_on_listing_type(cache):
+    assert cache.ttl_for("sold") > cache.ttl_for("for_sale")
+    assert cache.ttl_for(ListingType.SOLD) == cache.ttl_for("sold")
+    assert cache.ttl_for(None) == ResponseCache.DEFAULT_TTL
+
+
+def test_fetch_caches_successful_payloads(cache):
+    calls = []
+
+    def fetcher():
+        calls.append(1)
+        return PAYLOAD
+
+    assert cache.fetch(QUERY, {"city": "Dallas"}, "for_sale", fetcher) == PAYLOAD
+    assert cache.fetch(QUERY, {"city": "Dallas"}, "for_sale", fetcher) == PAYLOAD
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_error_payloads_are_not_cached(cache):
+    cache.store(QUERY, {}, "for_sale", {"errors": [{"message": "boom"}], "data": None})
+
+    assert cache.lookup(QUERY, {}) == (None, False)
+
+
+def test_cache_persists_across_instances(tmp_path):
+    db_path = str(tmp_path / "responses.db")
+    ResponseCache(db_path).store(QUERY, {}, "sold", PAYLOAD)
+
+    assert ResponseCache(db_path).lookup(QUERY, {}) == (PAYLOAD, False)
+
+
+def test_stale_while_revalidate_serves_stale_and_refreshes(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.db"), ttls={"for_sale": 0.01},
+                          stale_while_revalidate=True)
+    cache.store(QUERY, {}, "for_sale", PAYLOAD)
+    time.sleep(0.02)
+
+    fresh = {"data": {"home_search": {"total": 2, "results": []}}}
+    assert cache.fetch(QUERY, {}, "for_sale", lambda: fresh) == PAYLOAD
+
+    for _ in range(100):
+        if cache.lookup(QUERY, {})[0] == fresh:
+            break
+        time.sleep(0.01)
+    assert cache.lookup(QUERY, {})[0] == fresh
+
+
+def test_repeat_search_is_served_from_cache(cache, raw_home_factory, fake_realtor_session):
+    scraper = DreameryPropertyScraper(location_cache=LocationCache(), response_cache=cache)
+    scraper.session = fake_realtor_session([raw_home_factory(str(i)) for i in range(5)])
+
+    first = scraper.search_properties("Test City, TX", limit=10)
+    second = scraper.search_properties("Test City, TX", limit=10)
+
+    assert [p.property_id for p in first] == [p.property_id for p in second]
+    assert scraper.session.requests_of("search_page") == [0]
+
+
+def test_cache_misses_stream_and_store_the_raw_body(cache, raw_home_factory, fake_realtor_session):
+    scraper = DreameryPropertyScraper(location_cache=LocationCache(), response_cache=cache)
+    scraper.session = fake_realtor_session([raw_home_factory(str(i)) for i in range(5)])
+    variables = {"city": "Test City"}
+
+    page = scraper._open_search_page(QUERY, variables, "home_search", 0, "for_sale")
+    assert page._decoder is not None
+    assert cache.lookup(QUERY, {**variables, "offset": 0})[0] is None
+    assert [home["property_id"] for home in page] == ["0", "1", "2", "3", "4"]
+
+    stored, _ = cache.lookup(QUERY, {**variables, "offset": 0})
+    assert stored["data"]["home_search"]["total"] == 5
+    hit = scraper._open_search_page(QUERY, variables, "home_search", 0, "for_sale")
+    assert [home["property_id"] for home in hit] == ["0", "1", "2", "3", "4"]
+    assert scraper.session.requests_of("search_page") == [0]
+
+    partial = scraper._open_search_page(QUERY, variables, "home_search", 1, "for_sale")
+    next(iter(partial))
+    partial.close()
+    assert cache.lookup(QUERY, {**variables, "offset": 1})[0] is None
@@ -0,0 +1,183 @@
+import asyncio
+from datetime import date
+import pytest
+import async_property_scraper
+import dreamery_property_scraper
+from async_property_scraper import AsyncDreameryPropertyScraper
+from dreamery_property_scraper import DreameryPropertyScraper
+from location_cache import LocationCache
+from models import ListingType
+from search_shards import SearchShard, date_field_for, price_field_for
+
+
+@pytest.fixture
+def small_result_window(monkeypatch):
+    monkeypatch.setattr(dreamery_property_scraper, "MAX_RESULT_WINDOW", 500)
+    monkeypatch.setattr(async_property_scraper, "MAX_RESULT_WINDOW", 500)
+    return 500
+
+
+def test_date_field_follows_listing_type():
+    assert date_field_for("sold") == "sold_date"
+    assert date_field_for(ListingType.PENDING) == "pending_date"
+    assert date_field_for("for_sale") == "list_date"
+    assert date_field_for(None) == "list_date"
+
+
+def test_shard_splits_price_before_dates():
+    low, high = SearchShard().split()
+    assert (low.price_min, low.price_max) == (0, 500000)
+    assert (high.price_min, high.price_max) == (500001, None)
+
+    low, high = SearchShard(price_min=0, price_max=1000).split()
+    assert (low.price_max, high.price_min) == (500, 501)
+
+    narrow = SearchShard(price_min=100, price_max=200, date_min=date(2024, 1, 1), date_max=date(2024, 1, 31))
+    early, late = narrow.split()
+    assert (early.date_min, early.date_max) == (date(2024, 1, 1), date(2024, 1, 16))
+    assert (late.date_min, late.date_max) == (date(2024, 1, 17), date(2024, 1, 31))
+
+    single_day = SearchShard(price_min=100, price_max=200, date_min=date(2024, 1, 1), date_max=date(2024, 1, 1))
+    assert single_day.split() == []
+
+
+def test_sold_searches_shard_on_sold_price():
+    assert price_field_for("sold") == "sold_price" and price_field_for(ListingType.FOR_SALE) == "list_price"
+
+    low, _ = SearchShard.for_listing_type("sold").split()
+    assert low.query_filters() == "sold_price: {min: 0, max: 500000}"
+
+
+def test_shard_query_filters():
+    shard = SearchShard(date_field="sold_date", price_min=1000, price_max=2000,
+                        date_min=date(2024, 1, 1), date_max=date(2024, 6, 30))
+
+    assert shard.query_filters() == (
+        'list_price: {min: 1000, max: 2000}\n'
+        'sold_date: {min: "2024-01-01", max: "2024-06-30"}'
+    )
+    assert SearchShard().query_filters() == ""
+    assert "list_price: {min: 1000, max: 2000}" in DreameryPropertyScraper()._build_search_query("area", shard)
+
+
+def test_oversized_search_is_sharded_by_price(raw_home_factory, fake_realtor_session, small_result_window):
+    homes = [raw_home_factory(str(i), list_price=1000 * (i + 1)) for i in range(1200)]
+    scraper = DreameryPropertyScraper()
+    scraper.session = fake_realtor_session(homes, result_window=small_result_window)
+
+    results = scraper._fetch_search_results({"offset": 0}, "area", limit=10000)
+
+    assert sorted(int(home["property_id"]) for home in results) == list(range(1200))
+
+
+def test_sharded_search_falls_back_to_date_windows(raw_home_factory, fake_realtor_session, small_result_window):
+    homes = [
+        raw_home_factory(str(i), list_date=f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}T00:00:00Z")
+        for i in range(900)
+    ]
+    scraper = DreameryPropertyScraper()
+    scraper.session = fake_realtor_session(homes, result_window=small_result_window)
+
+    results = scraper._fetch_search_results({"offset": 0}, "area", limit=10000)
+
+    assert sorted(int(home["property_id"]) for home in results) == list(range(900))
+
+
+def test_sharded_search_respects_limit(raw_home_factory, fake_realtor_session, small_result_window):
+    homes = [raw_home_factory(str(i), list_price=1000 * (i + 1)) for i in range(1200)]
+    scraper = DreameryPropertyScraper()
+    scraper.session = fake_realtor_session(homes, result_window=small_result_window)
+
+    results = scraper._fetch_search_results({"offset": 0}, "area", limit=700)
+
+    assert len(results) == 700
+    assert len({home["property_id"] for home in results}) == 700
+
+
+def test_dedupe_keeps_first_occurrence():
+    results = DreameryPropertyScraper._dedupe_homes(
+        [[{"property_id": "1"}, {"property_id": "2"}], [{"property_id": "2"}, {"property_id": "3"}]], limit=10
+    )
+
+    assert [home["property_id"] for home in results] == ["1", "2", "3"]
+
+
+def test_async_oversized_search_is_sharded(raw_home_factory, fake_realtor_session, small_result_window):
+    upstream = fake_realtor_session(
+        [raw_home_factory(str(i), list_price=1000 * (i + 1)) for i in range(1200)],
+        result_window=small_result_window,
+    )
+
+    class ShardedAsyncScraper(AsyncDreameryPropertyScraper):
+        async def _post_json(self, url, payload):
+            return upstream.post(url, json=payload).json()
+
+    scraper = ShardedAsyncScraper(location_cache=LocationCache())
+    results = asyncio.run(scraper._fetch_search_results({"offset": 0}, "area", limit=10000))
+
+    assert sorted(int(home["property_id"]) for home in results) == list(range(1200))
+
+
+def test_scrape_property_shards_limits_past_the_result_window(raw_home_factory, realtor_upstream):
+    from scraper_api import scrape_property
+
+    realtor_upstream.homes = [raw_home_factory(str(i), list_price=100 * (i + 1)) for i in range(10500)]
+
+    results = scrape_property("Test City, TX", return_type="raw", limit=10500, extra_property_data=False)
+
+    assert len(results) == 10500 and len({prop.property_id for prop in results}) == 10500
+    assert any("list_price: {" in query for query in realtor_upstream.requests_of("search_query"))
+    with pytest.raises(ValueError):
+        scrape_property("Test City, TX", limit=100001)
+
+
+def dated_homes(raw_home_factory, count, **fields):
+    """Homes spread over 2024, every third one without a list price"""
+    return [
+        raw_home_factory(str(i), list_date=f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}T00:00:00Z",
+                         list_price=None if i % 3 == 0 else 1000 * (i + 1), **fields)
+        for i in range(count)
+    ]
+
+
+def test_shard_totals_add_up_with_unpriced_homes(raw_home_factory, fake_realtor_session, small_result_window):
+    scraper = DreameryPropertyScraper()
+    scraper.session = fake_realtor_session(dated_homes(raw_home_factory, 1200), result_window=small_result_window)
+
+    leaves = scraper._plan_shards({"offset": 0}, "area", SearchShard())
+    results = scraper._fetch_search_results({"offset": 0}, "area", limit=10000)
+
+    assert sum(total for _, _, total in leaves) == 1200
+    assert sorted(int(home["property_id"]) for home in results) == list(range(1200))
+
+
+def test_async_shard_totals_add_up_with_unpriced_homes(raw_home_factory, fake_realtor_session, small_result_window):
+    upstream = fake_realtor_session(dated_homes(raw_home_factory, 1200), result_window=small_result_window)
+
+    class ShardedAsyncScraper(AsyncDreameryPropertyScraper):
+        async def _post_json(self, url, payload):
+            return upstream.post(url, json=payload).json()
+
+    scraper = ShardedAsyncScraper(location_cache=LocationCache())
+    leaves = asyncio.run(scraper._plan_shards({"offset": 0}, "area", SearchShard()))
+    results = asyncio.run(scraper._fetch_search_results({"offset": 0}, "area", limit=10000))
+
+    assert sum(total for _, _, total in leaves) == 1200
+    assert sorted(int(home["property_id"]) for home in results) == list(range(1200))
+
+
+def test_sold_search_is_sharded_on_sold_price(raw_home_factory, fake_realtor_session, small_result_window):
+    homes = [
+        raw_home_factory(str(i), status="sold", list_price=None, last_sold_price=1000 * (i + 1),
+                         last_sold_date=f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}T00:00:00Z")
+        for i in range(1200)
+    ]
+    scraper = DreameryPropertyScraper()
+    scraper.session = fake_realtor_session(homes, result_window=small_result_window)
+
+    results = scraper._fetch_search_results({"offset": 0}, "area", limit=10000, listing_type="sold")
+
+    assert sorted(int(home["property_id"]) for home in results) == list(range(1200))
+    queries = scraper.session.requests_of("search_query")
+    assert any("sold_price: {" in query for query in queries)
+    assert not any("list_price: {" in query for query in queries)
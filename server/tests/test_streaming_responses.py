@@ -0,0 +1,113 @@
+import json
+import pytest
+import realtor_api
+from dreamery_property_scraper import DreameryPropertyScraper
+from processors import process_property
+from realtor_api import NDJSON_MIMETYPE, app
+
+
+def ndjson_lines(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+@pytest.fixture
+def three_homes(raw_home_factory, realtor_upstream):
+    realtor_upstream.homes = [raw_home_factory(str(i), hoa=None) for i in range(3)]
+    return realtor_upstream
+
+
+def test_scrape_streams_ndjson_for_accept_header(three_homes):
+    response = app.test_client().post("/api/realtor/scrape", json={"location": "Test City, TX"},
+                                      headers={"Accept": NDJSON_MIMETYPE})
+
+    assert response.status_code == 200 and response.mimetype == NDJSON_MIMETYPE and response.is_streamed
+    *records, last = ndjson_lines(response)
+    assert [record["property_id"] for record in records] == ["0", "1", "2"]
+    assert records[0]["list_price"] == 500000 and records[0]["hoa_fee"] is None
+    assert last["summary"]["success"] and last["summary"]["count"] == 3
+
+
+def test_scrape_streams_json_array_in_the_usual_shape(three_homes):
+    response = app.test_client().post("/api/realtor/scrape?stream=json",
+                                      json={"location": "Test City, TX", "return_type": "pydantic"})
+
+    body = response.get_json()
+    assert response.status_code == 200
+    assert (body["success"], body["count"], body["return_type"]) == (True, 3, "pydantic")
+    assert [record["property_id"] for record in body["data"]] == ["0", "1", "2"]
+
+
+def test_search_endpoints_stream(three_homes, monkeypatch):
+    monkeypatch.setattr(realtor_api, "scraper", DreameryPropertyScraper())
+    client = app.test_client()
+
+    for endpoint in ("", "/advanced", "/comprehensive"):
+        response = client.post(f"/api/realtor/search{endpoint}",
+                               json={"location": "Test City, TX", "limit": 10, "stream": True})
+        *records, last = ndjson_lines(response)
+        assert [record["property_id"] for record in records] == ["0", "1", "2"]
+        assert last["summary"]["total"] == 3
+
+    body = client.post("/api/realtor/search/advanced", json={"location": "Test City, TX", "stream": "json"}).get_json()
+    assert body["total"] == 3 and len(body["properties"]) == 3
+
+
+def test_comprehensive_streams_flat_rows(three_homes, monkeypatch):
+    monkeypatch.setattr(realtor_api, "scraper", DreameryPropertyScraper())
+
+    response = app.test_client().post("/api/realtor/search/comprehensive",
+                                      json={"location": "Test City, TX", "rows": True, "stream": True})
+
+    *records, last = ndjson_lines(response)
+    assert response.status_code == 200 and last["summary"]["total"] == 3
+    assert records[0]["full_baths"] == 2 and "description" not in records[0]
+
+
+def test_errors_after_the_first_property_end_up_in_the_summary(raw_home_factory, monkeypatch):
+    def failing(**kwargs):
+        yield process_property(raw_home_factory("1"))
+        raise RuntimeError("upstream went away")
+
+    monkeypatch.setattr(realtor_api, "iter_properties", failing)
+
+    response = app.test_client().post("/api/realtor/scrape?stream=ndjson", json={"location": "Test City, TX"})
+
+    *records, last = ndjson_lines(response)
+    assert [record["property_id"] for record in records] == ["1"]
+    assert last["summary"]["success"] is False and last["summary"]["error"] == "upstream went away"
+
+
+def test_errors_before_the_first_property_get_an_error_response(monkeypatch):
+    def failing(**kwargs):
+        raise RuntimeError("no session")
+        yield
+
+    monkeypatch.setattr(realtor_api, "iter_properties", failing)
+    client = app.test_client()
+
+    response = client.post("/api/realtor/scrape?stream=ndjson", json={"location": "Test City, TX"})
+    assert response.status_code == 500 and response.get_json()["error"] == "no session"
+
+
+def test_streamed_and_buffered_responses_match(raw_home_factory, realtor_upstream):
+    realtor_upstream.homes = [raw_home_factory(str(i), list_date=f"2024-0{i + 1}-15T00:00:00Z") for i in range(4)]
+    client = app.test_client()
+
+    scrape = {"location": "Test City, TX", "fields": ["list_price"], "foreclosure": True}
+    buffered = client.post("/api/realtor/scrape", json=scrape).get_json()["data"]
+    streamed = client.post("/api/realtor/scrape?stream=json", json=scrape).get_json()["data"]
+    assert streamed == buffered and list(streamed[0]) == ["property_id", "list_price"]
+
+    enhanced = {"location": "Test City, TX", "listing_type": "FOR_SALE", "date_from": "2024-02-01",
+                "date_to": "2024-03-31", "extra_property_data": False}
+    buffered = client.post("/api/realtor/search/enhanced", json=enhanced).get_json()["properties"]
+    streamed = client.post("/api/realtor/search/enhanced?stream=json", json=enhanced).get_json()["properties"]
+    assert [prop["property_id"] for prop in streamed] == [prop["property_id"] for prop in buffered] == ["1", "2"]
+
+
+def test_invalid_stream_value_is_a_bad_request():
+    client = app.test_client()
+
+    for endpoint in ("search", "search/advanced", "search/comprehensive", "search/enhanced", "scrape"):
+        response = client.post(f"/api/realtor/{endpoint}?stream=xml", json={"location": "Test City, TX"})
+        assert response.status_code == 400 and "stream" in response.get_json()["error"], endpoint
@@ -0,0 +1,142 @@
+import threading
+import time
+import requests
+from requests.adapters import BaseAdapter
+from token_manager import AccessToken, RealtorTokenAuth, TokenManager
+
+
+class CountingFetcher:
+    """Token fetcher that records how many refreshes were issued"""
+
+    def __init__(self, ttl=1800, delay=0.0):
+        self.ttl = ttl
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        return AccessToken(value=f"token-{call}", device_id=f"device-{call}", expires_at=time.time() + self.ttl)
+
+
+def test_token_is_reused_until_expiry():
+    fetcher = CountingFetcher()
+    manager = TokenManager(fetch_token=fetcher)
+
+    assert manager.get_token() == manager.get_token() == "token-1"
+    assert fetcher.calls == 1
+
+
+def test_token_refreshes_before_expiry():
+    fetcher = CountingFetcher(ttl=60)
+    manager = TokenManager(refresh_margin=120, fetch_token=fetcher)
+
+    assert manager.get_token() == "token-1"
+    assert manager.get_token() == "token-2"
+
+
+def test_concurrent_callers_share_one_refresh():
+    fetcher = CountingFetcher(delay=0.05)
+    manager = TokenManager(fetch_token=fetcher)
+
+    tokens = []
+    threads = [threading.Thread(target=lambda: tokens.append(manager.get_token())) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fetcher.calls == 1
+    assert set(tokens) == {"token-1"}
+
+
+def test_pool_rotates_tokens():
+    fetcher = CountingFetcher()
+    manager = TokenManager(pool_size=3, fetch_token=fetcher)
+
+    tokens = [manager.get_token() for _ in range(6)]
+
+    assert fetcher.calls == 3
+    assert tokens[:3] == tokens[3:]
+    assert len(set(tokens)) == 3
+
+
+def test_invalidate_forces_refresh():
+    fetcher = CountingFetcher()
+    manager = TokenManager(fetch_token=fetcher)
+
+    manager.invalidate(manager.get_token())
+
+    assert manager.get_token() == "token-2"
+
+
+def test_file_cache_shares_tokens_across_managers(tmp_path):
+    cache_path = str(tmp_path / "tokens.json")
+    fetcher = CountingFetcher()
+
+    first = TokenManager(cache_path=cache_path, fetch_token=fetcher)
+    second = TokenManager(cache_path=cache_path, fetch_token=fetcher)
+
+    assert first.get_token() == second.get_token() == "token-1"
+    assert fetcher.calls == 1
+
+
+class TokenCheckingAdapter(BaseAdapter):
+    """Adapter that rejects every bearer token except the accepted one"""
+
+    def __init__(self, accepted):
+        super().__init__()
+        self.accepted = accepted
+        self.seen = []
+
+    def send(self, request, **kwargs):
+        self.seen.append(request.headers.get("Authorization"))
+        response = requests.Response()
+        response.status_code = 200 if request.headers.get("Authorization") == f"Bearer {self.accepted}" else 401
+        response._content = b"{}"
+        response.request = request
+        response.url = request.url
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+def test_rejected_token_is_invalidated_and_retried_once():
+    fetcher = CountingFetcher()
+    manager = TokenManager(fetch_token=fetcher)
+    adapter = TokenCheckingAdapter(accepted="token-2")
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.auth = RealtorTokenAuth(manager)
+
+    response = session.post("https://graph.realtor.com/graphql", json={})
+
+    assert response.status_code == 200
+    assert [r.status_code for r in response.history] == [401]
+    assert adapter.seen == ["Bearer token-1", "Bearer token-2"]
+    assert fetcher.calls == 2
+    assert manager.get_token() == "token-2"
+
+    adapter.accepted = "never"
+    response = session.post("https://graph.realtor.com/graphql", json={})
+
+    assert response.status_code == 401
+    assert adapter.seen[2:] == ["Bearer token-2", "Bearer token-3"]
+
+
+def test_token_auth_skips_other_hosts():
+    fetcher = CountingFetcher()
+    adapter = TokenCheckingAdapter(accepted="token-1")
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.auth = RealtorTokenAuth(TokenManager(fetch_token=fetcher))
+
+    session.post("https://www.realtor.com/frontdoor/graphql", json={})
+
+    assert adapter.seen == [None]
+    assert fetcher.calls == 0
@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import pytest
+import requests
+import async_property_scraper
+from async_property_scraper import AsyncDreameryPropertyScraper
+from dreamery_property_scraper import DreameryPropertyScraper, create_session
+from location_cache import LocationCache
+from exceptions import RateLimitError
+from rate_limiter import RateLimiterRegistry
+from realtor_standin import RealtorStandIn, StandInConfig
+from token_manager import request_access_token
+from transport import FixtureStore, ReplayAdapter, exchange_key, redirect_url
+
+
+@pytest.fixture
+def standin():
+    servers = []
+
+    def start(**config):
+        server = RealtorStandIn(("127.0.0.1", 0), StandInConfig(**config))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def make_scraper():
+    scraper = DreameryPropertyScraper(location_cache=LocationCache())
+    scraper.session = create_session(registry=RateLimiterRegistry())
+    return scraper
+
+
+def test_exchange_key_ignores_host_and_query_order():
+    assert exchange_key("GET", "https://a.example/suggest?input=x&limit=1") == \
+        exchange_key("get", "http://127.0.0.1:1/suggest?limit=1&input=x")
+    assert exchange_key("POST", "https://a/q", b'{"b": 1, "a": 2}') == exchange_key("POST", "https://a/q", {"a": 2, "b": 1})
+    assert exchange_key("POST", "https://a/q", {"a": 1}) != exchange_key("POST", "https://a/q", {"a": 2})
+    assert redirect_url("https://www.realtor.com/api/v1/x?y=1", "http://127.0.0.1:8765") == "http://127.0.0.1:8765/api/v1/x?y=1"
+
+
+def test_standin_serves_synthesized_search(standin, monkeypatch):
+    server = standin(total=450, photos=30)
+    monkeypatch.setenv("REALTOR_TRANSPORT", "standin")
+    monkeypatch.setenv("REALTOR_STANDIN_URL", server.url)
+
+    properties = make_scraper().search_properties_advanced("Dallas, TX", limit=1000, extra_property_data=True)
+
+    assert len({prop.property_id for prop in properties}) == 450
+    assert all(len(prop.photos) == 30 for prop in properties[:5])
+    assert properties[0].nearby_schools == ["Dallas ISD"]
+
+
+def test_token_requests_use_the_scraper_transport(standin, monkeypatch):
+    server = standin()
+    monkeypatch.setenv("REALTOR_TRANSPORT", "standin")
+    monkeypatch.setenv("REALTOR_STANDIN_URL", server.url)
+
+    assert request_access_token().value == "standin-token"
+
+
+def test_record_then_replay(standin, monkeypatch, tmp_path):
+    server = standin(total=250)
+    monkeypatch.setenv("REALTOR_TRANSPORT", "record")
+    monkeypatch.setenv("REALTOR_FIXTURE_DIR", str(tmp_path))
+    monkeypatch.setenv("REALTOR_STANDIN_URL", server.url)
+    recorded = make_scraper().search_properties_advanced("Austin, TX", limit=1000)
+    server.shutdown()
+
+    monkeypatch.setenv("REALTOR_TRANSPORT", "replay")
+    replayed = make_scraper().search_properties_advanced("Austin, TX", limit=1000)
+
+    assert len(recorded) == 250
+    assert [prop.property_id for prop in replayed] == [prop.property_id for prop in recorded]
+    assert len(FixtureStore(str(tmp_path))) == 3
+
+
+def test_replay_miss_is_a_connection_error(tmp_path):
+    session = requests.Session()
+    session.mount("https://", ReplayAdapter(FixtureStore(str(tmp_path))))
+
+    with pytest.raises(requests.ConnectionError):
+        session.get("https://parser-external.geo.moveaws.com/suggest", params={"input": "Nowhere"})
+
+
+def test_standin_replays_fixtures_and_injects_throttles(standin, monkeypatch, tmp_path):
+    store = FixtureStore(str(tmp_path))
+    store.save("GET", "https://parser-external.geo.moveaws.com/suggest?input=Plano", None, 200,
+               b'{"autocomplete": [{"area_type": "city", "city": "Plano", "state_code": "TX"}]}')
+    server = standin(fixture_dir=str(tmp_path))
+
+    response = requests.get(f"{server.url}/suggest", params={"input": "Plano"})
+    assert response.json()["autocomplete"][0]["city"] == "Plano"
+    assert requests.get(f"{server.url}/suggest", params={"input": "Frisco"}).status_code == 404
+
+    throttling = standin(throttle_rate=1.0)
+    assert requests.get(f"{throttling.url}/suggest", params={"input": "Plano"}).status_code == 429
+    assert throttling.throttled == 1
+
+
+def test_async_scraper_uses_standin(standin, monkeypatch):
+    server = standin(total=300)
+    monkeypatch.setenv("REALTOR_TRANSPORT", "standin")
+    monkeypatch.setenv("REALTOR_STANDIN_URL", server.url)
+
+    async def search():
+        async with AsyncDreameryPropertyScraper(location_cache=LocationCache()) as scraper:
+            return await scraper.search_properties_advanced("Dallas, TX", limit=1000)
+
+    assert len(asyncio.run(search())) == 300
+
+
+def test_async_scraper_raises_once_throttle_retries_run_out(standin, monkeypatch):
+    server = standin(throttle_rate=1.0)
+    monkeypatch.setenv("REALTOR_TRANSPORT", "standin")
+    monkeypatch.setenv("REALTOR_STANDIN_URL", server.url)
+    monkeypatch.setattr(async_property_scraper, "rate_limiters", RateLimiterRegistry())
+
+    async def request():
+        async with AsyncDreameryPropertyScraper(location_cache=LocationCache()) as scraper:
+            scraper.MAX_THROTTLE_RETRIES = 1
+            return await scraper._get_json("https://parser-external.geo.moveaws.com/suggest", {"input": "Plano"})
+
+    with pytest.raises(RateLimitError) as error:
+        asyncio.run(request())
+
+    assert "(429) after 2 attempts" in str(error.value) and "Too Many Requests" in str(error.value)
+    assert error.value.retry_after == "1"
+    assert server.throttled == 2
@@ -0,0 +1,233 @@
+"""
+Process-wide access token manager for graph.realtor.com
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+import requests
+from requests.auth import AuthBase
+from exceptions import AuthenticationError
+from transport import mount_transport
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms skip cross-process locking
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+AUTH_TOKEN_URL = "https://graph.realtor.com/auth/token"
+# Requests to this host carry the access token; these statuses mean it was rejected
+TOKEN_HOST = "graph.realtor.com"
+REJECTED_TOKEN_STATUS_CODES = frozenset([401, 403])
+
+@dataclass
+class AccessToken:
+    value: str
+    device_id: str
+    expires_at: float
+
+    def is_fresh(self, margin: float) -> bool:
+        return time.time() + margin < self.expires_at
+
+
+def _auth_session() -> requests.Session:
+    """Session for token requests, on the same transport as the scraper sessions"""
+    return mount_transport(requests.Session())
+
+
+def request_access_token() -> AccessToken:
+    """Request a new device token from graph.realtor.com"""
+    device_id = str(uuid.uuid4()).upper()
+
+    with _auth_session() as session:
+        response = session.post(
+            AUTH_TOKEN_URL,
+            headers={
+                "Host": "graph.realtor.com",
+                "Accept": "*/*",
+                "Content-Type": "Application/json",
+                "X-Client-ID": "rdc_mobile_native,iphone",
+                "X-Visitor-ID": device_id,
+                "X-Client-Version": "24.21.23.679885",
+                "Accept-Language": "en-US,en;q=0.9",
+                "User-Agent": "Realtor.com/24.21.23.679885 CFNetwork/1494.0.7 Darwin/23.4.0",
+            },
+            data=json.dumps({
+                "grant_type": "device_mobile",
+                "device_id": device_id,
+                "client_app_id": "rdc_mobile_native,24.21.23.679885,iphone",
+            }),
+        )
+
+    data = response.json()
+
+    if not (access_token := data.get("access_token")):
+        raise AuthenticationError(
+            "Failed to get access token, use a proxy/vpn or wait a moment and try again.",
+            response=response
+        )
+
+    expires_in = data.get("expires_in") or TokenManager.DEFAULT_TOKEN_TTL
+    return AccessToken(value=access_token, device_id=device_id, expires_at=time.time() + float(expires_in))
+
+
+class TokenManager:
+    """Shares a small pool of auto-refreshing tokens between all scrapers.
+
+    Each pool slot has its own lock, so concurrent callers that find a slot
+    expiring wait on the single in-flight refresh instead of each requesting a
+    token. Callers rotate round-robin across slots to spread load. When
+    ``cache_path`` is set the pool is also shared across processes through a
+    JSON file guarded by an ``flock``.
+    """
+
+    DEFAULT_TOKEN_TTL = 1800
+    REFRESH_MARGIN = 120
+
+    def __init__(self, pool_size: int = 1, refresh_margin: float = REFRESH_MARGIN,
+                 cache_path: Optional[str] = None,
+                 fetch_token: Callable[[], AccessToken] = request_access_token):
+        self.pool_size = max(1, pool_size)
+        self.refresh_margin = refresh_margin
+        self.cache_path = cache_path
+        self.fetch_token = fetch_token
+
+        self._tokens: List[Optional[AccessToken]] = [None] * self.pool_size
+        self._slot_locks = [threading.Lock() for _ in range(self.pool_size)]
+        self._cursor = 0
+        self._cursor_lock = threading.Lock()
+        self.refresh_count = 0
+
+    def get_token(self) -> str:
+        """Return a fresh token, refreshing the selected slot if it is about to expire"""
+        with self._cursor_lock:
+            slot = self._cursor
+            self._cursor = (self._cursor + 1) % self.pool_size
+
+        token = self._tokens[slot]
+        if token is not None and token.is_fresh(self.refresh_margin):
+            return token.value
+
+        with self._slot_locks[slot]:
+            token = self._tokens[slot]
+            if token is None or not token.is_fresh(self.refresh_margin):
+                token = self._refresh(slot)
+                self._tokens[slot] = token
+            return token.value
+
+    def invalidate(self, token_value: str) -> None:
+        """Drop a token the upstream rejected so the next caller refreshes it"""
+        for slot, token in enumerate(self._tokens):
+            if token is not None and token.value == token_value:
+                with self._slot_locks[slot]:
+                    if self._tokens[slot] is token:
+                        self._tokens[slot] = None
+                if self.cache_path:
+                    self._with_file_lock(lambda tokens: tokens.pop(str(slot), None))
+
+    def _refresh(self, slot: int) -> AccessToken:
+        if not self.cache_path:
+            return self._fetch()
+
+        def refresh_shared(tokens: Dict[str, dict]) -> AccessToken:
+            shared = tokens.get(str(slot))
+            if shared:
+                token = AccessToken(**shared)
+                if token.is_fresh(self.refresh_margin):
+                    return token
+            token = self._fetch()
+            tokens[str(slot)] = asdict(token)
+            return token
+
+        return self._with_file_lock(refresh_shared)
+
+    def _fetch(self) -> AccessToken:
+        token = self.fetch_token()
+        self.refresh_count += 1
+        logger.info("Refreshed realtor.com access token")
+        return token
+
+    def _with_file_lock(self, update: Callable[[Dict[str, dict]], object]):
+        """Run update(tokens) against the shared token file under an exclusive lock"""
+        with open(self.cache_path, "a+") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                contents = handle.read()
+                try:
+                    tokens = json.loads(contents) if contents else {}
+                except json.JSONDecodeError:
+                    tokens = {}
+
+                result = update(tokens)
+
+                handle.seek(0)
+                handle.truncate()
+                json.dump(tokens, handle)
+                handle.flush()
+                return result
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+_shared_manager: Optional[TokenManager] = None
+_shared_manager_lock = threading.Lock()
+
+
+def get_token_manager() -> TokenManager:
+    """Process-wide token manager configured from the environment"""
+    global _shared_manager
+    with _shared_manager_lock:
+        if _shared_manager is None:
+            _shared_manager = TokenManager(
+                pool_size=int(os.getenv('REALTOR_TOKEN_POOL_SIZE', '1')),
+                cache_path=os.getenv('REALTOR_TOKEN_CACHE') or None,
+            )
+        return _shared_manager
+
+
+class RealtorTokenAuth(AuthBase):
+    """Bearer auth for graph.realtor.com requests from the shared TokenManager.
+
+    When the API rejects the token (401/403) it is invalidated and the request
+    is sent once more with a fresh one. Requests to other hosts are untouched.
+    """
+
+    def __init__(self, manager: Optional[TokenManager] = None):
+        self.manager = manager
+
+    def __call__(self, request: requests.PreparedRequest) -> requests.PreparedRequest:
+        if urlsplit(request.url).hostname != TOKEN_HOST or request.url == AUTH_TOKEN_URL:
+            return request
+        manager = self.manager or get_token_manager()
+        token = manager.get_token()
+        request.headers["Authorization"] = f"Bearer {token}"
+
+        def retry_rejected(response: requests.Response, **kwargs) -> requests.Response:
+            if response.status_code not in REJECTED_TOKEN_STATUS_CODES or getattr(response.request, "token_retried", False):
+                return response
+            logger.warning(f"{TOKEN_HOST} rejected the access token ({response.status_code}), refreshing it")
+            manager.invalidate(token)
+            response.content  # read so the connection can be reused
+            response.close()
+
+            retry = response.request.copy()
+            retry.headers["Authorization"] = f"Bearer {manager.get_token()}"
+            retry.token_retried = True
+            retried = response.connection.send(retry, **kwargs)
+            retried.history.append(response)
+            retried.request = retry
+            return retried
+
+        request.register_hook("response", retry_rejected)
+        return request
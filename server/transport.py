@@ -0,0 +1,196 @@
+"""
+Record / replay / stand-in transports for realtor.com traffic
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import requests
+from requests.adapters import BaseAdapter
+from urllib3.util.retry import Retry
+from rate_limiter import RateLimitedAdapter, RateLimiterRegistry, rate_limiters
+
+logger = logging.getLogger(__name__)
+
+TRANSPORT_MODES = ("live", "record", "replay", "standin")
+
+
+def exchange_key(method: str, url: str, body: Any = None) -> str:
+    """Identify a request by method, path, sorted query and canonical JSON body; the host is ignored
+    so exchanges recorded against realtor.com replay against a stand-in and vice versa"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+    if isinstance(body, str):
+        try:
+            body = json.loads(body)
+        except ValueError:
+            pass
+    canonical = json.dumps([method.upper(), parts.path, query, body], sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def redirect_url(url: str, base_url: str) -> str:
+    """Point a realtor.com URL at ``base_url``, keeping its path and query"""
+    base = urlsplit(base_url)
+    parts = urlsplit(url)
+    return urlunsplit((base.scheme, base.netloc, parts.path, parts.query, parts.fragment))
+
+
+class FixtureStore:
+    """Directory of recorded exchanges, one JSON file per request"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def save(self, method: str, url: str, body: Any, status: int, content: bytes,
+             content_type: Optional[str] = None) -> str:
+        key = exchange_key(method, url, body)
+        try:
+            response_body = json.loads(content)
+        except ValueError:
+            response_body = content.decode("utf-8", errors="replace")
+        if isinstance(body, bytes):
+            body = body.decode("utf-8")
+        exchange = {
+            "request": {"method": method.upper(), "url": url, "body": body},
+            "response": {"status": status, "content_type": content_type, "body": response_body},
+        }
+        with self._lock:
+            with open(self.path_for(key), "w") as f:
+                json.dump(exchange, f)
+        return key
+
+    def load(self, method: str, url: str, body: Any = None) -> Optional[Dict[str, Any]]:
+        """The recorded response ({status, content_type, body}) for a request, or None"""
+        try:
+            with open(self.path_for(exchange_key(method, url, body))) as f:
+                return json.load(f)["response"]
+        except FileNotFoundError:
+            return None
+
+    def __len__(self) -> int:
+        return sum(1 for name in os.listdir(self.directory) if name.endswith(".json"))
+
+
+def encode_body(body: Any) -> bytes:
+    return body.encode("utf-8") if isinstance(body, str) else json.dumps(body).encode("utf-8")
+
+
+class RedirectAdapter(RateLimitedAdapter):
+    """Sends requests to ``base_url`` (e.g. a local stand-in server) instead of realtor.com.
+
+    Rate limiting still keys on the original host, so a stand-in run exercises
+    the same limiter behaviour as live traffic.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, **kwargs):
+        self.base_url = base_url
+        super().__init__(**kwargs)
+
+    def _send_once(self, request, **kwargs):
+        if self.base_url:
+            request.url = redirect_url(request.url, self.base_url)
+        return super()._send_once(request, **kwargs)
+
+
+class RecordingAdapter(RedirectAdapter):
+    """Live (or redirected) transport that saves every final response to a FixtureStore"""
+
+    def __init__(self, store: FixtureStore, base_url: Optional[str] = None, **kwargs):
+        self.store = store
+        super().__init__(base_url=base_url, **kwargs)
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        content = response.content
+        # Reading the body for the fixture exhausts raw; give streaming consumers a fresh copy
+        response.raw = io.BytesIO(content)
+        self.store.save(request.method, request.url, request.body, response.status_code, content,
+                        response.headers.get("Content-Type"))
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Answers requests from a FixtureStore without touching the network"""
+
+    def __init__(self, store: FixtureStore):
+        self.store = store
+        super().__init__()
+
+    def send(self, request, **kwargs):
+        recorded = self.store.load(request.method, request.url, request.body)
+        if recorded is None:
+            raise requests.ConnectionError(f"No recorded exchange for {request.method} {request.url}")
+
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.headers["Content-Type"] = recorded.get("content_type") or "application/json"
+        response.raw = io.BytesIO(encode_body(recorded["body"]))
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+        return response
+
+    def close(self):
+        pass
+
+
+def transport_mode() -> str:
+    mode = os.getenv("REALTOR_TRANSPORT", "live").lower()
+    if mode not in TRANSPORT_MODES:
+        raise ValueError(f"REALTOR_TRANSPORT must be one of {', '.join(TRANSPORT_MODES)}, not {mode!r}")
+    return mode
+
+
+def transport_adapter(registry: RateLimiterRegistry = rate_limiters, **kwargs) -> BaseAdapter:
+    """Adapter chosen by REALTOR_TRANSPORT.
+
+    - live (default): realtor.com under the per-host rate limiter
+    - record: live (or REALTOR_STANDIN_URL) traffic saved to REALTOR_FIXTURE_DIR
+    - replay: responses served from REALTOR_FIXTURE_DIR, no network
+    - standin: every request sent to REALTOR_STANDIN_URL (see realtor_standin.py)
+    """
+    mode = transport_mode()
+    if mode == "replay":
+        return ReplayAdapter(FixtureStore(os.environ["REALTOR_FIXTURE_DIR"]))
+    if mode == "record":
+        return RecordingAdapter(FixtureStore(os.environ["REALTOR_FIXTURE_DIR"]),
+                                base_url=os.getenv("REALTOR_STANDIN_URL"), registry=registry, **kwargs)
+    if mode == "standin":
+        return RedirectAdapter(base_url=os.environ["REALTOR_STANDIN_URL"], registry=registry, **kwargs)
+    return RateLimitedAdapter(registry=registry, **kwargs)
+
+
+def mount_transport(session: requests.Session, registry: RateLimiterRegistry = rate_limiters,
+                    **kwargs) -> requests.Session:
+    """Mount the REALTOR_TRANSPORT adapter on ``session`` for http and https; ``kwargs`` go to the adapter"""
+    # Throttle responses (429/403) are retried by the adapter under the shared
+    # per-host rate limiter; urllib3 only retries connection failures
+    retries = Retry(
+        total=3,
+        backoff_factor=1,
+        allowed_methods=frozenset(["GET", "POST"])
+    )
+    adapter = transport_adapter(registry=registry, max_retries=retries, **kwargs)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def standin_url(url: str) -> str:
+    """``url`` redirected to REALTOR_STANDIN_URL in standin mode; used by the aiohttp scraper"""
+    if transport_mode() == "standin":
+        return redirect_url(url, os.environ["REALTOR_STANDIN_URL"])
+    return url
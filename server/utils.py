@@ -1,9 +1,14 @@
 from __future__ import annotations
-from typing import Union, List, Dict
+import logging
+from typing import Union, List, Dict, Optional
 import pandas as pd
 from datetime import datetime
+from pydantic import BaseModel
 from models import Property, ListingType, Advertisers
 from exceptions import InvalidListingType, InvalidDate
+from search_shards import MAX_SEARCH_LIMIT
+
+logger = logging.getLogger(__name__)
 
 ordered_properties = [
     "property_url",
@@ -72,62 +77,141 @@ ordered_properties = [
     "alt_photos"
 ]
 
+#: Typed DataFrame schema of the ordered_properties columns (and the change_type of incremental results).
+#: Repetitive strings are categoricals; free text and ids are strings; nested values stay objects.
+PROPERTY_DTYPES: Dict[str, str] = {
+    **{column: "string" for column in ordered_properties},
+    **{column: "category" for column in (
+        "mls", "status", "mls_status", "style", "city", "state", "zip_code", "neighborhoods", "county",
+        "fips_code", "agent_name", "agent_mls_set", "broker_name", "builder_name", "office_name",
+        "office_mls_set")},
+    **{column: "Int32" for column in (
+        "beds", "full_baths", "half_baths", "sqft", "year_built", "days_on_mls", "price_per_sqft", "stories",
+        "hoa_fee")},
+    **{column: "Int64" for column in (
+        "list_price", "list_price_min", "list_price_max", "sold_price", "last_sold_price", "assessed_value",
+        "estimated_value", "tax", "lot_sqft")},
+    # Float32 would move coordinates by up to a metre
+    "latitude": "Float64",
+    "longitude": "Float64",
+    "parking_garage": "Float32",
+    "new_construction": "boolean",
+    **{column: "datetime64[s]" for column in ("list_date", "pending_date", "last_sold_date")},
+    **{column: "object" for column in ("tax_history", "agent_phones", "office_phones")},
+    "change_type": "category",
+}
+
+#: dtype_backend values: nullable numpy-backed dtypes, or the same types backed by pyarrow
+DTYPE_BACKENDS = ("numpy_nullable", "pyarrow")
+
+_ARROW_DTYPES = {
+    "Int32": "int32[pyarrow]",
+    "Int64": "int64[pyarrow]",
+    "Float32": "float[pyarrow]",
+    "Float64": "double[pyarrow]",
+    "boolean": "bool[pyarrow]",
+    "datetime64[s]": "timestamp[s][pyarrow]",
+    "string": "string[pyarrow]",
+}
+
 
 def process_result(result: Property) -> pd.DataFrame:
-    prop_data = {prop: None for prop in ordered_properties}
-    prop_data.update(result.model_dump())
-
-    if "address" in prop_data and prop_data["address"]:
-        address_data = prop_data["address"]
-        prop_data["full_street_line"] = address_data.get("full_line")
-        prop_data["street"] = address_data.get("street")
-        prop_data["unit"] = address_data.get("unit")
-        prop_data["city"] = address_data.get("city")
-        prop_data["state"] = address_data.get("state")
-        prop_data["zip_code"] = address_data.get("zip")
-        prop_data["formatted_address"] = address_data.get("formatted_address")
-
-    if "advertisers" in prop_data and prop_data.get("advertisers"):
-        advertiser_data = prop_data["advertisers"]
-        if advertiser_data.get("agent"):
-            agent_data = advertiser_data["agent"]
-            prop_data["agent_id"] = agent_data.get("uuid")
-            prop_data["agent_name"] = agent_data.get("name")
-            prop_data["agent_email"] = agent_data.get("email")
-            prop_data["agent_phones"] = agent_data.get("phones")
-            prop_data["agent_mls_set"] = agent_data.get("mls_set")
-            prop_data["agent_nrds_id"] = agent_data.get("nrds_id")
-
-        if advertiser_data.get("broker"):
-            broker_data = advertiser_data["broker"]
-            prop_data["broker_id"] = broker_data.get("uuid")
-            prop_data["broker_name"] = broker_data.get("name")
-
-        if advertiser_data.get("builder"):
-            builder_data = advertiser_data["builder"]
-            prop_data["builder_id"] = builder_data.get("uuid")
-            prop_data["builder_name"] = builder_data.get("name")
-
-        if advertiser_data.get("office"):
-            office_data = advertiser_data["office"]
-            prop_data["office_id"] = office_data.get("uuid")
-            prop_data["office_name"] = office_data.get("name")
-            prop_data["office_email"] = office_data.get("email")
-            prop_data["office_phones"] = office_data.get("phones")
-            prop_data["office_mls_set"] = office_data.get("mls_set")
-
-    prop_data["price_per_sqft"] = prop_data["prc_sqft"]
-    prop_data["nearby_schools"] = filter(None, prop_data["nearby_schools"]) if prop_data["nearby_schools"] else None
-    prop_data["nearby_schools"] = ", ".join(set(prop_data["nearby_schools"])) if prop_data["nearby_schools"] else None
-    
-    # Convert datetime objects to strings for CSV
-    for date_field in ["list_date", "pending_date", "last_sold_date"]:
-        if prop_data.get(date_field):
-            prop_data[date_field] = prop_data[date_field].strftime("%Y-%m-%d") if hasattr(prop_data[date_field], 'strftime') else prop_data[date_field]
-    
-    # Convert HttpUrl objects to strings for CSV
-    if prop_data.get("property_url"):
-        prop_data["property_url"] = str(prop_data["property_url"])
+    """One-row DataFrame for a Property; use property_frame for more than one"""
+    properties_df = pd.DataFrame([property_row(result)])
+    properties_df = properties_df.reindex(columns=ordered_properties)
+
+    return properties_df[ordered_properties]
+
+
+def _plain(value):
+    """A nested model as model_dump() would give it, other values as they are"""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, list):
+        return [item.model_dump() if isinstance(item, BaseModel) else item for item in value]
+    return value
+
+
+def _date_text(value):
+    return value.strftime("%Y-%m-%d") if value and hasattr(value, "strftime") else value
+
+
+def property_row(result: Property) -> Dict[str, object]:
+    """Flat output row for a Property: the ordered_properties columns as plain values.
+
+    Reads the model's attributes directly; only the nested values that end up
+    in a cell (tax history, phones) are dumped.
+    """
+    prop_data = dict.fromkeys(ordered_properties)
+    prop_data.update(
+        property_url=str(result.property_url) if result.property_url else result.property_url,
+        property_id=result.property_id,
+        listing_id=result.listing_id,
+        permalink=result.permalink,
+        mls=result.mls,
+        mls_id=result.mls_id,
+        status=result.status,
+        mls_status=result.mls_status,
+        days_on_mls=result.days_on_mls,
+        list_price=result.list_price,
+        list_price_min=result.list_price_min,
+        list_price_max=result.list_price_max,
+        # Convert datetime objects to strings for CSV
+        list_date=_date_text(result.list_date),
+        pending_date=_date_text(result.pending_date),
+        last_sold_date=_date_text(result.last_sold_date),
+        last_sold_price=result.last_sold_price,
+        assessed_value=result.assessed_value,
+        estimated_value=result.estimated_value,
+        tax=result.tax,
+        tax_history=_plain(result.tax_history),
+        new_construction=result.new_construction,
+        price_per_sqft=result.prc_sqft,
+        latitude=result.latitude,
+        longitude=result.longitude,
+        neighborhoods=result.neighborhoods,
+        county=result.county,
+        fips_code=result.fips_code,
+        hoa_fee=result.hoa_fee,
+    )
+
+    nearby_schools = filter(None, result.nearby_schools) if result.nearby_schools else None
+    prop_data["nearby_schools"] = ", ".join(set(nearby_schools)) if nearby_schools else None
+
+    address = result.address
+    if address:
+        prop_data["full_street_line"] = address.full_line
+        prop_data["street"] = address.street
+        prop_data["unit"] = address.unit
+        prop_data["city"] = address.city
+        prop_data["state"] = address.state
+        prop_data["zip_code"] = address.zip
+        prop_data["formatted_address"] = address.formatted_address
+
+    advertisers = result.advertisers
+    if advertisers:
+        if agent := advertisers.agent:
+            prop_data["agent_id"] = agent.uuid
+            prop_data["agent_name"] = agent.name
+            prop_data["agent_email"] = agent.email
+            prop_data["agent_phones"] = _plain(agent.phones)
+            prop_data["agent_mls_set"] = agent.mls_set
+            prop_data["agent_nrds_id"] = agent.nrds_id
+
+        if broker := advertisers.broker:
+            prop_data["broker_id"] = broker.uuid
+            prop_data["broker_name"] = broker.name
+
+        if builder := advertisers.builder:
+            prop_data["builder_id"] = builder.uuid
+            prop_data["builder_name"] = builder.name
+
+        if office := advertisers.office:
+            prop_data["office_id"] = office.uuid
+            prop_data["office_name"] = office.name
+            prop_data["office_email"] = office.email
+            prop_data["office_phones"] = _plain(office.phones)
+            prop_data["office_mls_set"] = office.mls_set
 
     description = result.description
     if description:
@@ -149,10 +233,80 @@ def process_result(result: Property) -> pd.DataFrame:
         prop_data["stories"] = description.stories
         prop_data["text"] = description.text
 
-    properties_df = pd.DataFrame([prop_data])
-    properties_df = properties_df.reindex(columns=ordered_properties)
+    return prop_data
 
-    return properties_df[ordered_properties]
+
+_EMPTY_TEXT = ("", "None")
+
+
+def _cell(value):
+    return pd.NA if value is None or (type(value) is str and value in _EMPTY_TEXT) else value
+
+
+def property_frame(results: List[Union[Property, Dict[str, object]]],
+                   columns: List[str] = ordered_properties,
+                   dtype_backend: Optional[str] = None) -> pd.DataFrame:
+    """DataFrame of Properties (or their property_row rows), built a column at a time.
+
+    Missing values ("", "None", None) become pd.NA. Columns with no None get
+    their inferred dtype and the rest stay object, as when concatenating
+    one-row frames, unless a ``dtype_backend`` applies PROPERTY_DTYPES.
+    """
+    if not results:
+        return pd.DataFrame()
+    rows = [result if isinstance(result, dict) else property_row(result) for result in results]
+    data = {}
+    for column in columns:
+        values = [row[column] for row in rows]
+        if any(value is None for value in values):
+            data[column] = pd.Series([_cell(value) for value in values], dtype=object)
+            continue
+        series = pd.Series(values, dtype=object).infer_objects()
+        if any(type(value) is str and value in _EMPTY_TEXT for value in values):
+            series = series.replace({text: pd.NA for text in _EMPTY_TEXT})
+        data[column] = series
+    frame = pd.DataFrame(data)
+    return apply_property_dtypes(frame, dtype_backend) if dtype_backend else frame
+
+
+def _convert(column: str, series: pd.Series, dtype: str) -> pd.Series:
+    if dtype.startswith("datetime64"):
+        return pd.to_datetime(series, format="%Y-%m-%d", errors="coerce").astype(dtype)
+    try:
+        return series.astype(dtype)
+    except OverflowError:
+        if dtype == "Int32":
+            return _convert(column, series, "Int64")
+        logger.warning(f"Leaving {column} as object: its values overflow {dtype}")
+        return series
+    except (TypeError, ValueError):
+        if dtype not in ("Int32", "Int64", "Float32", "Float64"):
+            logger.warning(f"Leaving {column} as object: its values are not {dtype}")
+            return series
+    numbers = pd.to_numeric(series, errors="coerce")
+    logger.warning(f"Dropped {int(numbers.isna().sum() - series.isna().sum())} {column} values that are not numbers")
+    try:
+        return numbers.astype(dtype)
+    except (TypeError, ValueError):
+        return numbers.astype("Float64")
+
+
+def apply_property_dtypes(frame: pd.DataFrame, dtype_backend: str = "numpy_nullable") -> pd.DataFrame:
+    """``frame`` (as property_frame builds it) with its columns converted to PROPERTY_DTYPES.
+
+    Integers that overflow Int32 are widened to Int64 and values that are not
+    numbers become NA. With ``dtype_backend="pyarrow"`` every column but the
+    categoricals and nested values is pyarrow-backed (requires pyarrow).
+    """
+    validate_dtype_backend(dtype_backend)
+    converted = {}
+    for column in frame.columns:
+        dtype = PROPERTY_DTYPES.get(column, "object")
+        series = frame[column] if dtype == "object" else _convert(column, frame[column], dtype)
+        if dtype_backend == "pyarrow" and str(series.dtype) in _ARROW_DTYPES:
+            series = series.astype(_ARROW_DTYPES[str(series.dtype)])
+        converted[column] = series
+    return pd.DataFrame(converted, index=frame.index)
 
 
 def validate_input(listing_type: str) -> None:
@@ -175,8 +329,13 @@ def validate_dates(date_from: Union[str, None], date_to: Union[str, None]) -> No
             raise InvalidDate(f"Invalid date format or range")
 
 
+def validate_dtype_backend(dtype_backend: Optional[str]) -> None:
+    if dtype_backend is not None and dtype_backend not in DTYPE_BACKENDS:
+        raise ValueError(f"dtype_backend must be one of {', '.join(DTYPE_BACKENDS)} or None, not {dtype_backend!r}.")
+
+
 def validate_limit(limit: int) -> None:
-    #: 1 -> 10000 limit
+    #: 1 -> MAX_SEARCH_LIMIT; area searches matching more than MAX_RESULT_WINDOW homes are sharded to reach it
 
-    if limit is not None and (limit < 1 or limit > 10000):
-        raise ValueError("Property limit must be between 1 and 10,000.")
\ No newline at end of file
+    if limit is not None and (limit < 1 or limit > MAX_SEARCH_LIMIT):
+        raise ValueError(f"Property limit must be between 1 and {MAX_SEARCH_LIMIT:,}.")
\ No newline at end of file